@@ -0,0 +1,98 @@
+"""Content-stable writes for generated artifacts.
+
+Generators render each output to bytes and hand it to `GeneratedFiles`:
+
+- Output bytes must be deterministic: no dates or timestamps inside them.
+  Volatile metadata (when the content last changed, its hash and size) lives
+  in a `generated.json` sidecar next to the outputs.
+- A file is only rewritten when its SHA-256 differs from what is on disk, and
+  then atomically (temp file + rename). Unchanged files keep their mtime, so
+  docs staging, caches and CI uploads can trust mtimes and hashes.
+- The sidecar's `generated` date only moves when the content changes, so the
+  sidecar itself is stable across repeated runs.
+
+Scope: local files only.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from datetime import date
+from pathlib import Path
+
+SIDECAR_NAME = "generated.json"
+
+
+def sha256_bytes(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def sha256_file(path: Path, chunk_size: int = 1 << 20) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        while chunk := handle.read(chunk_size):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def write_if_changed(path: Path, data: bytes) -> bool:
+    """Atomically write ``data`` unless ``path`` already holds the same bytes."""
+
+    if path.exists() and path.stat().st_size == len(data) and sha256_file(path) == sha256_bytes(data):
+        return False
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+    return True
+
+
+class GeneratedFiles:
+    """Skip-if-unchanged writer for one output directory, with a metadata sidecar."""
+
+    def __init__(self, out_dir: Path, generator: str, today: str | None = None):
+        self.out_dir = Path(out_dir)
+        self.generator = generator
+        self.today = today or date.today().isoformat()
+        self.sidecar = self.out_dir / SIDECAR_NAME
+        existing = json.loads(self.sidecar.read_text(encoding="utf-8")) if self.sidecar.exists() else {}
+        self.files: dict[str, dict] = dict(existing.get("files", {}))
+
+    def generated(self, name: str, content_key: bytes) -> str:
+        """Date the content identified by ``content_key`` was first generated.
+
+        For outputs that must embed a date (e.g. Markdown front matter
+        `updated:`), render once without it and pass those bytes as the key;
+        the returned date then only changes when the real content does.
+        """
+
+        entry = self.files.get(name, {})
+        previous = entry.get("content_sha256", entry.get("sha256"))
+        if previous == sha256_bytes(content_key) and entry.get("generated"):
+            return entry["generated"]
+        return self.today
+
+    def write(self, name: str, data: bytes, content_key: bytes | None = None, generated: str | None = None) -> bool:
+        """Write ``out_dir/name`` if its bytes changed; returns True when written.
+
+        ``generated`` overrides the recorded date (use the date embedded in
+        ``data`` when there is one).
+        """
+
+        entry = {
+            "bytes": len(data),
+            "generated": generated or self.generated(name, data if content_key is None else content_key),
+            "sha256": sha256_bytes(data),
+        }
+        if content_key is not None:
+            entry["content_sha256"] = sha256_bytes(content_key)
+        changed = write_if_changed(self.out_dir / name, data)
+        self.files[name] = entry
+        return changed
+
+    def save(self) -> bool:
+        manifest = {"generator": self.generator, "files": dict(sorted(self.files.items()))}
+        data = (json.dumps(manifest, indent=2, sort_keys=True) + "\n").encode("utf-8")
+        return write_if_changed(self.sidecar, data)
@@ -0,0 +1,213 @@
+"""Assign comment templates across a class while limiting repeated phrasing.
+
+Usage:
+  python scripts/assign_comments.py                          # one synthetic class of 30
+  python scripts/assign_comments.py --children 24 --budget 0.2
+  python scripts/assign_comments.py --classes 200 --workers 8  # board-wide, one class per worker
+
+For every child, frame and CoL section (see taxonomy/col-sections.yaml) one
+template is chosen. The objective is:
+
+  sum(indicator overlap between child and template)
+  - reuse_penalty * sum over templates of uses * (uses - 1) / 2
+
+so a second use of a template costs `reuse_penalty`, a third costs twice that,
+and so on. A greedy pass builds a first assignment; local search then
+re-picks individual slots until no slot improves or the time budget expires.
+
+Inputs are synthetic (pseudonymous child IDs and sampled indicators). This
+repository never stores real student data.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from scripts.catalog import WORKSPACE_ROOT, Catalog, load_catalog
+from scripts.recommend import TemplateRecommender
+
+DEFAULT_REUSE_PENALTY = 0.75
+DEFAULT_TIME_BUDGET = 0.5
+
+
+@dataclass(frozen=True)
+class ChildObservations:
+    child_id: str
+    indicators: frozenset[str]
+
+
+@dataclass
+class ClassAssignment:
+    class_id: str
+    # child_id -> (frame_id, section) -> template_id
+    assignments: dict[str, dict[tuple[str, str], str]] = field(default_factory=dict)
+    fit: int = 0
+    reuse_penalty: float = 0.0
+    max_reuse: int = 0
+    passes: int = 0
+    elapsed: float = 0.0
+    timed_out: bool = False
+
+    @property
+    def score(self) -> float:
+        return self.fit - self.reuse_penalty
+
+
+def synthetic_class(catalog: Catalog, class_id: str, children: int = 30, seed: int = 0) -> list[ChildObservations]:
+    """Generate a pseudonymous class with 1-3 observed indicators per frame per child."""
+
+    rng = random.Random(f"{class_id}:{seed}")
+    by_frame: dict[str, list[str]] = {}
+    for ind_id, ind in catalog.indicators.items():
+        by_frame.setdefault(ind.get("frame"), []).append(ind_id)
+
+    roster: list[ChildObservations] = []
+    for n in range(1, children + 1):
+        observed: set[str] = set()
+        for ind_ids in by_frame.values():
+            observed.update(rng.sample(ind_ids, rng.randint(1, min(3, len(ind_ids)))))
+        roster.append(ChildObservations(child_id=f"{class_id}.child.{n:03d}", indicators=frozenset(observed)))
+    return roster
+
+
+def assign_class(
+    recommender: TemplateRecommender,
+    roster: list[ChildObservations],
+    class_id: str = "class",
+    reuse_penalty: float = DEFAULT_REUSE_PENALTY,
+    time_budget: float = DEFAULT_TIME_BUDGET,
+) -> ClassAssignment:
+    """Pick one template per child, frame and section for a whole class."""
+
+    started = time.perf_counter()
+    deadline = started + time_budget
+    catalog = recommender.catalog
+
+    slots = [(frame_id, section) for frame_id in catalog.frames for section in catalog.section_keys]
+    pools: dict[tuple[str, str], list[tuple[str, int]]] = {
+        slot: [(tid, mask) for tid, mask, _size in recommender.candidates(slot[0], slot[1], None)] for slot in slots
+    }
+    slots = [slot for slot in slots if pools[slot]]
+
+    child_masks = [(child.child_id, recommender.mask_for(child.indicators)) for child in roster]
+    uses: Counter[str] = Counter()
+    chosen: dict[tuple[int, tuple[str, str]], tuple[str, int]] = {}
+
+    def best_for(child_mask: int, slot: tuple[str, str]) -> tuple[str, int]:
+        best_tid, best_fit, best_value = "", 0, None
+        for tid, mask in pools[slot]:
+            fit = (mask & child_mask).bit_count()
+            value = fit - reuse_penalty * uses[tid]
+            if best_value is None or value > best_value:
+                best_tid, best_fit, best_value = tid, fit, value
+        return best_tid, best_fit
+
+    # Greedy construction
+    for idx, (_child_id, child_mask) in enumerate(child_masks):
+        for slot in slots:
+            tid, fit = best_for(child_mask, slot)
+            chosen[(idx, slot)] = (tid, fit)
+            uses[tid] += 1
+
+    # Local search: re-pick one slot at a time against the rest of the class
+    passes = 0
+    timed_out = False
+    improved = True
+    while improved:
+        if time.perf_counter() >= deadline:
+            timed_out = True
+            break
+        improved = False
+        passes += 1
+        for (idx, slot), (current_tid, current_fit) in list(chosen.items()):
+            uses[current_tid] -= 1
+            tid, fit = best_for(child_masks[idx][1], slot)
+            current_value = current_fit - reuse_penalty * uses[current_tid]
+            if tid != current_tid and fit - reuse_penalty * uses[tid] > current_value + 1e-9:
+                chosen[(idx, slot)] = (tid, fit)
+                improved = True
+            else:
+                tid = current_tid
+            uses[tid] += 1
+
+    result = ClassAssignment(class_id=class_id, passes=passes, timed_out=timed_out)
+    for (idx, slot), (tid, fit) in chosen.items():
+        result.assignments.setdefault(child_masks[idx][0], {})[slot] = tid
+        result.fit += fit
+    result.reuse_penalty = reuse_penalty * sum(n * (n - 1) / 2 for n in uses.values())
+    result.max_reuse = max(uses.values(), default=0)
+    result.elapsed = time.perf_counter() - started
+    return result
+
+
+_WORKER_RECOMMENDER: TemplateRecommender | None = None
+
+
+def _init_worker(root: Path) -> None:
+    global _WORKER_RECOMMENDER
+    _WORKER_RECOMMENDER = TemplateRecommender(load_catalog(root))
+
+
+def _assign_synthetic(args: tuple[str, int, int, float, float]) -> ClassAssignment:
+    class_id, children, seed, reuse_penalty, time_budget = args
+    assert _WORKER_RECOMMENDER is not None
+    roster = synthetic_class(_WORKER_RECOMMENDER.catalog, class_id, children, seed)
+    return assign_class(_WORKER_RECOMMENDER, roster, class_id, reuse_penalty, time_budget)
+
+
+def assign_board(
+    root: Path,
+    class_ids: list[str],
+    children: int = 30,
+    seed: int = 0,
+    reuse_penalty: float = DEFAULT_REUSE_PENALTY,
+    time_budget: float = DEFAULT_TIME_BUDGET,
+    workers: int | None = None,
+) -> list[ClassAssignment]:
+    """Assign every synthetic class in a board, one class per worker process."""
+
+    jobs = [(class_id, children, seed, reuse_penalty, time_budget) for class_id in class_ids]
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(root,)) as pool:
+        return list(pool.map(_assign_synthetic, jobs))
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Assign CoL templates across a class with minimal repetition.")
+    parser.add_argument("--children", type=int, default=30, help="Children per class")
+    parser.add_argument("--classes", type=int, default=1, help="Number of synthetic classes")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes for multi-class runs")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--penalty", type=float, default=DEFAULT_REUSE_PENALTY, help="Cost of each repeated use")
+    parser.add_argument("--budget", type=float, default=DEFAULT_TIME_BUDGET, help="Time budget per class (seconds)")
+    args = parser.parse_args(argv)
+
+    class_ids = [f"class.{n:04d}" for n in range(1, args.classes + 1)]
+    if args.classes == 1:
+        recommender = TemplateRecommender(load_catalog(WORKSPACE_ROOT))
+        roster = synthetic_class(recommender.catalog, class_ids[0], args.children, args.seed)
+        results = [assign_class(recommender, roster, class_ids[0], args.penalty, args.budget)]
+    else:
+        results = assign_board(
+            WORKSPACE_ROOT, class_ids, args.children, args.seed, args.penalty, args.budget, args.workers
+        )
+
+    for res in results:
+        status = "TIMEOUT" if res.timed_out else "OK"
+        print(
+            f"{status} {res.class_id}: score {res.score:.2f} (fit {res.fit}, reuse penalty {res.reuse_penalty:.2f}), "
+            f"max reuse {res.max_reuse}, {res.passes} pass(es), {res.elapsed * 1000:.1f} ms"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,331 @@
+"""Hot-reload the catalog for long-running processes.
+
+Usage:
+  python scripts/catalog_reload.py                 # check once, print metrics
+  python scripts/catalog_reload.py --watch 1.0     # poll every second, log swaps
+
+    live = LiveCatalog(root)
+    live.start(interval=1.0)
+    snapshot = live.snapshot    # read once per request; never changes under you
+    snapshot.catalog.templates[...]
+
+A `CatalogSnapshot` is immutable: the catalog plus the parsed form of every
+file it came from, keyed by path with its stat and SHA-256. A reload:
+
+1. stats the watched files (taxonomy, bibliography, template manifest and
+   shards, evidence patterns) and re-parses only those whose content hash
+   changed; everything else is reused from the current snapshot by
+   reference (copy-on-write), so unchanged templates, patterns and so on are
+   the same objects in both snapshots;
+2. assembles a new Catalog from the parsed files and checks it (template
+   shard schema errors and duplicate IDs, unknown frames and indicators);
+3. swaps `LiveCatalog.snapshot` with one reference assignment, which is
+   atomic, so readers see either the old or the new snapshot, never a
+   partial one. A snapshot that fails the checks is discarded and the old
+   one stays live.
+
+Readers that took the old snapshot keep using it until they drop it.
+`LiveCatalog.metrics` records reload times, changed files, failures and the
+share of catalog items reused from the previous snapshot (`overlap`).
+
+Scope: local files only. No network calls.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import asdict, dataclass, field, replace
+from pathlib import Path
+from typing import Any
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from scripts.artifacts import sha256_file
+from scripts.catalog import WORKSPACE_ROOT, Catalog, assemble_catalog, ensure_list, read_evidence
+from scripts.template_library import MANIFEST, Shard, load_shard, merge_shards, shard_paths
+from scripts.validate import load_yaml
+
+# Whole-file YAML documents, by their assemble_catalog argument
+YAML_SOURCES = {
+    "frames_doc": "taxonomy/frames.yaml",
+    "indicators_doc": "taxonomy/indicators.yaml",
+    "refs_doc": "references/bibliography.yaml",
+    "col_sections_doc": "taxonomy/col-sections.yaml",
+}
+# Catalog fields compared for the overlap metric
+ITEM_FIELDS = ("frames", "indicators", "templates", "evidence_patterns", "refs", "col_sections")
+
+
+@dataclass(frozen=True)
+class Source:
+    """One parsed file: [size, mtime_ns], content hash and the parsed value."""
+
+    stamp: tuple[int, int]
+    sha256: str
+    value: Any
+
+
+@dataclass(frozen=True)
+class CatalogSnapshot:
+    generation: int
+    catalog: Catalog
+    # rel path -> parsed file
+    sources: dict[str, Source]
+    created: float
+
+
+@dataclass
+class ReloadResult:
+    swapped: bool
+    changed: list[str] = field(default_factory=list)
+    errors: list[str] = field(default_factory=list)
+    seconds: float = 0.0
+    # Share of catalog items reused by reference from the previous snapshot
+    overlap: float | None = None
+
+
+@dataclass
+class ReloadMetrics:
+    checks: int = 0
+    swaps: int = 0
+    failures: int = 0
+    generation: int = 0
+    last_reload_ms: float | None = None
+    max_reload_ms: float = 0.0
+    last_overlap: float | None = None
+    last_changed: list[str] = field(default_factory=list)
+    last_errors: list[str] = field(default_factory=list)
+
+    def record(self, result: ReloadResult, generation: int) -> None:
+        self.checks += 1
+        if not result.changed:
+            return
+        elapsed = result.seconds * 1000
+        self.last_reload_ms = elapsed
+        self.max_reload_ms = max(self.max_reload_ms, elapsed)
+        self.last_changed = result.changed
+        self.last_errors = result.errors
+        if result.swapped:
+            self.swaps += 1
+            self.generation = generation
+            self.last_overlap = result.overlap
+        else:
+            self.failures += 1
+
+    def as_dict(self) -> dict:
+        return asdict(self)
+
+
+def watched_files(root: Path) -> dict[str, str]:
+    """rel path -> kind for every file the catalog is built from."""
+
+    files = {rel: "yaml" for rel in YAML_SOURCES.values()}
+    manifest = root / "templates" / MANIFEST
+    if manifest.exists():
+        files[manifest.relative_to(root).as_posix()] = "manifest"
+    for path in shard_paths(root):
+        files[path.relative_to(root).as_posix()] = "shard"
+    for path in sorted((root / "evidence").glob("evidence.pattern.*.md")):
+        files[path.relative_to(root).as_posix()] = "evidence"
+    return files
+
+
+def _parse(root: Path, rel: str, kind: str) -> Any:
+    path = root / rel
+    if kind == "yaml":
+        return load_yaml(path)
+    if kind == "shard":
+        if not path.exists():
+            return Shard(rel, [], ["listed in the manifest but missing"])
+        return Shard(rel, *load_shard(path))
+    if kind == "evidence":
+        return read_evidence(path)
+    return None
+
+
+def check_catalog(catalog: Catalog, shards: list[Shard]) -> list[str]:
+    """Problems that make a snapshot unsafe to serve."""
+
+    errors = list(merge_shards(shards).errors)
+    for tid, tmpl in catalog.templates.items():
+        if tmpl.get("frame") not in catalog.frames:
+            errors.append(f"{tid}: unknown frame {tmpl.get('frame')}")
+        errors += [
+            f"{tid}: unknown indicator {i}" for i in ensure_list(tmpl.get("indicators")) if i not in catalog.indicators
+        ]
+    for iid, ind in catalog.indicators.items():
+        if ind.get("frame") not in catalog.frames:
+            errors.append(f"{iid}: unknown frame {ind.get('frame')}")
+    for pid, pattern in catalog.evidence_patterns.items():
+        errors += [f"{pid}: unknown indicator {i}" for i in pattern["indicators"] if i not in catalog.indicators]
+    return errors
+
+
+def overlap(old: Catalog, new: Catalog) -> float:
+    """Fraction of items in ``new`` that are the very same objects as in ``old``."""
+
+    shared = total = 0
+    for name in ITEM_FIELDS:
+        before, after = getattr(old, name), getattr(new, name)
+        total += len(after)
+        shared += sum(1 for key, value in after.items() if before.get(key) is value)
+    return shared / total if total else 1.0
+
+
+def build_snapshot(
+    root: Path, previous: CatalogSnapshot | None = None
+) -> tuple[CatalogSnapshot | None, list[str], list[str]]:
+    """Build the next snapshot, reusing unchanged parsed files from ``previous``.
+
+    Returns (snapshot, changed paths, errors). The snapshot is None when
+    nothing changed or the new catalog failed its checks; when only file
+    stats changed it is ``previous`` with refreshed stamps.
+    """
+
+    old_sources = previous.sources if previous is not None else {}
+    sources: dict[str, Source] = {}
+    changed: list[str] = []
+    errors: list[str] = []
+    files = watched_files(root)
+    for rel, kind in files.items():
+        path = root / rel
+        try:
+            st = path.stat()
+        except FileNotFoundError:
+            stamp, digest = (-1, -1), ""
+        else:
+            stamp = (st.st_size, st.st_mtime_ns)
+            old = old_sources.get(rel)
+            if old is not None and old.stamp == stamp:
+                sources[rel] = old
+                continue
+            digest = sha256_file(path)
+        old = old_sources.get(rel)
+        if old is not None and old.sha256 == digest:
+            sources[rel] = Source(stamp, digest, old.value)
+            continue
+        changed.append(rel)
+        try:
+            sources[rel] = Source(stamp, digest, _parse(root, rel, kind))
+        except Exception as exc:
+            errors.append(f"{rel}: {exc}")
+    changed += [rel for rel in old_sources if rel not in files]
+    if previous is not None and not changed:
+        # Only stats moved (touch, checkout): same catalog and generation, new stamps so files are not rehashed
+        refreshed = any(source is not old_sources[rel] for rel, source in sources.items())
+        return (replace(previous, sources=sources) if refreshed else None), [], []
+    if errors:
+        return None, changed, errors
+
+    shards = [sources[rel].value for rel, kind in files.items() if kind == "shard"]
+    catalog = assemble_catalog(
+        **{arg: sources[rel].value for arg, rel in YAML_SOURCES.items()},
+        library=merge_shards(shards),
+        evidence=(sources[rel].value for rel, kind in files.items() if kind == "evidence" and sources[rel].value),
+    )
+    errors = check_catalog(catalog, shards)
+    if errors:
+        return None, changed, errors
+    generation = previous.generation + 1 if previous is not None else 1
+    return CatalogSnapshot(generation, catalog, sources, time.time()), changed, []
+
+
+class LiveCatalog:
+    """The current catalog snapshot, swapped atomically by ``reload``."""
+
+    def __init__(self, root: Path = WORKSPACE_ROOT, on_swap: Callable[[CatalogSnapshot], None] | None = None):
+        self.root = root
+        self.on_swap = on_swap
+        self.metrics = ReloadMetrics()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        snapshot, _, errors = build_snapshot(root)
+        if snapshot is None:
+            raise ValueError("Catalog failed its checks: " + "; ".join(errors))
+        self._snapshot = snapshot
+        self.metrics.generation = snapshot.generation
+
+    @property
+    def snapshot(self) -> CatalogSnapshot:
+        return self._snapshot
+
+    def reload(self) -> ReloadResult:
+        """Rebuild from changed files and swap if the result passes its checks (one reload at a time)."""
+
+        with self._lock:
+            start = time.perf_counter()
+            old = self._snapshot
+            snapshot, changed, errors = build_snapshot(self.root, old)
+            result = ReloadResult(swapped=snapshot is not None and bool(changed), changed=changed, errors=errors)
+            if result.swapped:
+                result.overlap = overlap(old.catalog, snapshot.catalog)
+                if self.on_swap is not None:
+                    # Derived state (e.g. API responses) is rebuilt from the new snapshot first;
+                    # if that raises, the old snapshot stays live
+                    self.on_swap(snapshot)
+            if snapshot is not None:
+                self._snapshot = snapshot
+            result.seconds = time.perf_counter() - start
+            self.metrics.record(result, self._snapshot.generation)
+            return result
+
+    def start(self, interval: float = 1.0) -> None:
+        """Poll for changes every ``interval`` seconds in a daemon thread."""
+
+        if self._thread is not None:
+            return
+        self._stop.clear()
+
+        def run() -> None:
+            while not self._stop.wait(interval):
+                try:
+                    self.reload()
+                except Exception as exc:  # keep serving the last good snapshot
+                    self.metrics.failures += 1
+                    self.metrics.last_errors = [repr(exc)]
+
+        self._thread = threading.Thread(target=run, name="catalog-reload", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Check for catalog changes and hot-reload them.")
+    parser.add_argument("--watch", type=float, metavar="SECONDS", help="Keep polling at this interval")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    live = LiveCatalog(WORKSPACE_ROOT)
+    print(f"generation 1: {len(live.snapshot.sources)} files loaded in {(time.perf_counter() - start) * 1000:.0f} ms")
+    result = live.reload()
+    print(f"no-op reload check in {result.seconds * 1000:.1f} ms")
+    if args.watch is None:
+        return 0
+    try:
+        while True:
+            time.sleep(args.watch)
+            result = live.reload()
+            if result.changed:
+                state = f"swapped to generation {live.snapshot.generation}" if result.swapped else "kept old snapshot"
+                print(f"{', '.join(result.changed)}: {state} ({result.seconds * 1000:.0f} ms)")
+                for error in result.errors:
+                    print(f"  - {error}")
+                print(f"  metrics: {json.dumps(live.metrics.as_dict())}")
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,156 @@
+"""Precompute the data bundle used by the docs site macros.
+
+Usage:
+  python scripts/docs_bundle.py
+  python scripts/docs_bundle.py --out build/docs_bundle.json
+
+Pages rendered through mkdocs-macros (see scripts/docs_macros.py) read
+frames, indicators, templates, coverage and backlinks from one compact
+bundle instead of re-parsing YAML per page. The bundle is written as JSON and,
+when `msgpack` is installed, also as MessagePack next to it. Both are only
+rewritten when their content changes.
+
+Bundle layout:
+  frames               {frame_id: {name, description, indicators: [...]}}
+  indicators           {indicator_id: {name, frame, ...}}
+  templates_by_frame   {frame_id: {section: [template, ...]}}
+  evidence_patterns    {pattern_id: {title, frame, indicators, refs}}
+  coverage             {frames: {frame_id: {covered, total}}, indicators:
+                        {indicator_id: {templates, evidence, sections}},
+                        gaps: {section: [indicator_id, ...]}}
+  backlinks            {id: [{id, type}, ...]} for indicators, frames and refs
+
+Scope: local files only. No network calls.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from scripts.artifacts import write_if_changed
+from scripts.catalog import WORKSPACE_ROOT, Catalog, ensure_list, load_catalog
+from scripts.coverage import CoverageMatrices, compute_coverage
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - optional dependency
+    msgpack = None
+
+DEFAULT_BUNDLE = WORKSPACE_ROOT / "build" / "docs_bundle.json"
+BUNDLE_VERSION = 1
+TEMPLATE_FIELDS = ("id", "section", "tone", "text", "slots", "indicators", "refs", "status")
+
+
+def build_bundle(catalog: Catalog) -> dict:
+    frames: dict[str, dict] = {
+        fid: {"name": f.get("name"), "description": f.get("description"), "indicators": []}
+        for fid, f in catalog.frames.items()
+    }
+    indicators: dict[str, dict] = {}
+    for ind_id, ind in catalog.indicators.items():
+        indicators[ind_id] = {k: v for k, v in ind.items() if k != "id"}
+        frames.setdefault(ind.get("frame", "unknown"), {"name": None, "indicators": []})["indicators"].append(ind_id)
+
+    templates_by_frame: dict[str, dict[str, list[dict]]] = {}
+    backlinks: dict[str, list[dict]] = {}
+
+    def link(target: str, source: str, kind: str) -> None:
+        backlinks.setdefault(target, []).append({"id": source, "type": kind})
+
+    for tid, tmpl in catalog.templates.items():
+        compact = {k: tmpl[k] for k in TEMPLATE_FIELDS if k in tmpl}
+        frame = tmpl.get("frame") or "unknown"
+        templates_by_frame.setdefault(frame, {}).setdefault(tmpl.get("section") or "unknown", []).append(compact)
+        for ind_id in ensure_list(tmpl.get("indicators")):
+            link(ind_id, tid, "template")
+        for ref_id in ensure_list(tmpl.get("refs")):
+            link(ref_id, tid, "template")
+
+    evidence_patterns: dict[str, dict] = {}
+    for pid, pattern in catalog.evidence_patterns.items():
+        evidence_patterns[pid] = {
+            "title": pattern.get("title"),
+            "frame": pattern.get("frame"),
+            "indicators": pattern["indicators"],
+            "refs": pattern["refs"],
+        }
+        for ind_id in pattern["indicators"]:
+            link(ind_id, pid, "evidence_pattern")
+        for ref_id in pattern["refs"]:
+            link(ref_id, pid, "evidence_pattern")
+    for ind_id, ind in catalog.indicators.items():
+        link(ind.get("frame", "unknown"), ind_id, "indicator")
+
+    report = compute_coverage(CoverageMatrices.from_catalog(catalog))
+    m = report.matrices
+    coverage = {
+        "frames": {f: {"covered": c, "total": t} for f, (c, t) in sorted(report.by_frame.items())},
+        "indicators": {
+            ind_id: {
+                "templates": int(report.templates_per_indicator[i]),
+                "evidence": int(report.patterns_per_indicator[i]),
+                "sections": dict(zip(m.section_keys, (int(c) for c in report.section_counts[i]), strict=True)),
+            }
+            for i, ind_id in enumerate(m.indicator_ids)
+        },
+        "gaps": {section: report.section_gaps(section) for section in m.section_keys},
+    }
+
+    return {
+        "version": BUNDLE_VERSION,
+        "sections": catalog.section_keys,
+        "frames": frames,
+        "indicators": indicators,
+        "templates_by_frame": templates_by_frame,
+        "evidence_patterns": evidence_patterns,
+        "coverage": coverage,
+        "backlinks": backlinks,
+    }
+
+
+def encode_json(bundle: dict) -> bytes:
+    return json.dumps(bundle, ensure_ascii=False, sort_keys=True, separators=(",", ":"), default=str).encode("utf-8")
+
+
+def write_bundle(bundle: dict, out: Path = DEFAULT_BUNDLE) -> list[Path]:
+    """Write JSON (and MessagePack when available); returns the files that changed."""
+
+    changed = []
+    if write_if_changed(out, encode_json(bundle)):
+        changed.append(out)
+    if msgpack is not None:
+        # Round-trip through JSON so dates etc. are encoded the same way in both formats
+        packed = msgpack.packb(json.loads(encode_json(bundle)))
+        if write_if_changed(out.with_suffix(".msgpack"), packed):
+            changed.append(out.with_suffix(".msgpack"))
+    return changed
+
+
+def load_bundle(path: Path = DEFAULT_BUNDLE) -> dict:
+    """Load a bundle, preferring an up-to-date MessagePack copy when `msgpack` is installed."""
+
+    packed = path.with_suffix(".msgpack")
+    if msgpack is not None and packed.exists() and packed.stat().st_mtime_ns >= path.stat().st_mtime_ns:
+        return msgpack.unpackb(packed.read_bytes())
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Write the precomputed docs data bundle.")
+    parser.add_argument("--out", type=Path, default=DEFAULT_BUNDLE, help="JSON output path")
+    args = parser.parse_args()
+
+    changed = write_bundle(build_bundle(load_catalog()), args.out)
+    out = args.out.resolve()
+    label = out.relative_to(WORKSPACE_ROOT) if out.is_relative_to(WORKSPACE_ROOT) else out
+    print(f"{'Generated' if changed else 'Unchanged'} {label}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,93 @@
+"""mkdocs-macros module backed by the precomputed docs bundle.
+
+Configured in mkdocs.yml (`macros: module_name: scripts/docs_macros`). The
+bundle from scripts/docs_bundle.py is loaded once per build and exposed to
+pages as the `catalog` variable, plus table macros:
+
+  {{ frame_table() }}
+  {{ template_table("frame.belonging", "next_steps") }}
+  {{ coverage_table() }}
+  {{ backlinks("indicator.belonging.relationships") }}
+
+If the bundle has not been generated yet it is built in memory from the
+canonical files (once), so `mkdocs serve` works without a separate step.
+"""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from scripts.docs_bundle import DEFAULT_BUNDLE, build_bundle, load_bundle
+
+_BUNDLE: dict | None = None
+# mtime of the bundle file _BUNDLE was loaded from, so `mkdocs serve` picks up regenerations
+_BUNDLE_MTIME: int | None = None
+
+
+def get_bundle(path: Path = DEFAULT_BUNDLE) -> dict:
+    global _BUNDLE, _BUNDLE_MTIME
+    mtime = path.stat().st_mtime_ns if path.exists() else None
+    if _BUNDLE is None or (mtime is not None and mtime != _BUNDLE_MTIME):
+        if mtime is not None:
+            _BUNDLE = load_bundle(path)
+        else:
+            from scripts.catalog import load_catalog
+
+            _BUNDLE = build_bundle(load_catalog())
+        _BUNDLE_MTIME = mtime
+    return _BUNDLE
+
+
+def _table(header: list[str], rows: list[list]) -> str:
+    lines = ["| " + " | ".join(header) + " |", "|" + "---|" * len(header)]
+    lines += ["| " + " | ".join(str(c).replace("|", "\\|").replace("\n", " ") for c in row) + " |" for row in rows]
+    return "\n".join(lines)
+
+
+def frame_table() -> str:
+    bundle = get_bundle()
+    rows = []
+    for fid, frame in sorted(bundle["frames"].items()):
+        cov = bundle["coverage"]["frames"].get(fid, {"covered": 0, "total": 0})
+        rows.append([f"`{fid}`", frame.get("name") or "", len(frame["indicators"]), f"{cov['covered']}/{cov['total']}"])
+    return _table(["Frame", "Name", "Indicators", "Covered"], rows)
+
+
+def template_table(frame_id: str, section: str | None = None) -> str:
+    bundle = get_bundle()
+    by_section = bundle["templates_by_frame"].get(frame_id, {})
+    sections = [section] if section else [s for s in bundle["sections"] if s in by_section]
+    rows = [
+        [f"`{t['id']}`", sec, t.get("text", "").strip(), ", ".join(t.get("indicators", []))]
+        for sec in sections
+        for t in by_section.get(sec, [])
+    ]
+    return _table(["Template", "Section", "Text", "Indicators"], rows)
+
+
+def coverage_table() -> str:
+    bundle = get_bundle()
+    sections = bundle["sections"]
+    rows = [
+        [f"`{ind_id}`", c["templates"], c["evidence"], *(c["sections"].get(s, 0) for s in sections)]
+        for ind_id, c in sorted(bundle["coverage"]["indicators"].items())
+    ]
+    return _table(["Indicator", "Templates", "Evidence", *sections], rows)
+
+
+def backlinks(item_id: str) -> str:
+    links = get_bundle()["backlinks"].get(item_id, [])
+    if not links:
+        return "*No references.*"
+    return "\n".join(f"- `{link['id']}` ({link['type'].replace('_', ' ')})" for link in links)
+
+
+def define_env(env) -> None:
+    """mkdocs-macros entry point."""
+
+    env.variables["catalog"] = get_bundle()
+    for func in (frame_table, template_table, coverage_table, backlinks):
+        env.macro(func)
@@ -3,30 +3,28 @@
 Usage: python scripts/generate_links.py
 
 Produces a human-readable quick links file from the canonical bibliography.
+
+The front matter `updated:` date only changes when the rendered links change;
+the file is left untouched otherwise (see scripts/artifacts.py).
 """
 
 from __future__ import annotations
 
-from datetime import date
+import re
+import sys
 from pathlib import Path
 
-from ruamel.yaml import YAML
-
-WORKSPACE_ROOT = Path(__file__).resolve().parents[1]
-YAML_LOADER = YAML(typ="safe")
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 
+from scripts.artifacts import GeneratedFiles
+from scripts.yaml_backend import load_file
 
-def main() -> int:
-    bib_path = WORKSPACE_ROOT / "references" / "bibliography.yaml"
-    output_path = WORKSPACE_ROOT / "references" / "links.md"
-
-    today = date.today().isoformat()
+WORKSPACE_ROOT = Path(__file__).resolve().parents[1]
 
-    with bib_path.open("r", encoding="utf-8") as f:
-        bib = YAML_LOADER.load(f)
+_UPDATED_RE = re.compile(r"^updated: (\S+)$", re.MULTILINE)
 
-    references = bib.get("references", [])
 
+def render_links(references: list[dict], updated: str) -> str:
     # Group by type
     groups: dict[str, list[dict]] = {}
     for ref in references:
@@ -45,7 +43,7 @@ def main() -> int:
         "status: draft",
         "tags: [references, links]",
         "refs: []",
-        f"updated: {today}",
+        f"updated: {updated}",
         "---",
         "",
         "# Quick Links",
@@ -90,8 +88,32 @@ def main() -> int:
         "Re-run `python scripts/generate_links.py` to regenerate this file.*"
     )
 
-    output_path.write_text("\n".join(lines), encoding="utf-8")
-    print(f"Generated {output_path.relative_to(WORKSPACE_ROOT)}")
+    return "\n".join(lines)
+
+
+def main() -> int:
+    bib_path = WORKSPACE_ROOT / "references" / "bibliography.yaml"
+    output_path = WORKSPACE_ROOT / "references" / "links.md"
+
+    bib = load_file(bib_path)
+
+    references = bib.get("references", [])
+    files = GeneratedFiles(output_path.parent, generator="scripts/generate_links.py")
+
+    content_key = render_links(references, "").encode("utf-8")
+    updated = files.generated(output_path.name, content_key)
+    if output_path.name not in files.files and output_path.exists():
+        # No sidecar yet: keep the existing date if the content is unchanged
+        existing = output_path.read_text(encoding="utf-8")
+        match = _UPDATED_RE.search(existing)
+        if match and render_links(references, match.group(1)) == existing:
+            updated = match.group(1)
+
+    changed = files.write(
+        output_path.name, render_links(references, updated).encode("utf-8"), content_key, generated=updated
+    )
+    files.save()
+    print(f"{'Generated' if changed else 'Unchanged'} {output_path.relative_to(WORKSPACE_ROOT)}")
     return 0
 
 
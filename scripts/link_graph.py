@@ -0,0 +1,410 @@
+"""Global link graph over every artifact-to-artifact relation.
+
+Usage:
+  python scripts/link_graph.py                          # load or refresh build/link_graph.json, print summary
+  python scripts/link_graph.py --rebuild                # rebuild even if the workspace is unchanged
+  python scripts/link_graph.py --orphans                # documents not reachable from index.md
+  python scripts/link_graph.py --backlinks frame.belonging
+  python scripts/link_graph.py --impact ref.ontario.kindergarten.program.2016
+  python scripts/link_graph.py --graphml build/link_graph.graphml
+
+Nodes are artifact IDs (front matter `id`, or IDs defined in taxonomy,
+template and bibliography YAML) and files without an ID (workspace-relative
+paths). Edges are directed, labelled with their kind:
+
+  link          Markdown link from a document to a file or document
+  defines       YAML file -> each ID it defines
+  ref           front matter, template, frame and indicator `refs`
+  indicator     front matter / template `indicators`
+  frame         `frame` of an indicator, template or evidence pattern
+  guidance_ref  CoL section -> its guidance document
+
+The graph is held as compact CSR adjacency arrays (`indptr`, `indices`,
+`kinds`) and persisted as JSON, so backlinks, reachability from index.md
+and impact sets (everything that transitively depends on a node) are answered
+with array slices and scipy's breadth-first search. The saved graph carries
+a fingerprint of the workspace (every path it could read, with size and
+mtime); queries reuse it while the fingerprint matches and rebuild it
+otherwise. `--rebuild` (used by the build target) always rebuilds. `LinkGraph.to_networkx()`
+hands the same arrays to networkx for visualizations.
+
+Scope: local files only. No network calls.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import numpy as np
+from scipy import sparse
+from scipy.sparse.csgraph import breadth_first_order
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from scripts.artifacts import write_if_changed
+from scripts.catalog import WORKSPACE_ROOT, ensure_list, load_catalog
+from scripts.validate import iter_relative_markdown_links, parse_front_matter
+from scripts.workspace_index import WorkspaceIndex
+
+DEFAULT_GRAPH = WORKSPACE_ROOT / "build" / "link_graph.json"
+GRAPH_VERSION = 1
+
+EDGE_KINDS = ("link", "defines", "ref", "indicator", "frame", "guidance_ref")
+# Higher index wins when the same node is seen as several kinds
+NODE_KINDS = ("artifact", "file", "document")
+# Edges followed transitively for impact sets. Links only count when they point
+# straight at the changed node, and a YAML file is not affected by changes to
+# the IDs it defines.
+IMPACT_KINDS = ("ref", "indicator", "frame", "guidance_ref")
+# Generated or staged copies, never part of the canonical graph (dot-folders are skipped too)
+SKIP_TOP_LEVEL = frozenset({"site_docs", "build", "site"})
+
+CATALOG_FILES = {
+    "frames": "taxonomy/frames.yaml",
+    "indicators": "taxonomy/indicators.yaml",
+    "col_sections": "taxonomy/col-sections.yaml",
+    "refs": "references/bibliography.yaml",
+}
+
+
+@dataclass
+class LinkGraph:
+    """Directed, edge-labelled graph in CSR form (edges of node i: indices[indptr[i]:indptr[i+1]])."""
+
+    nodes: list[str]
+    node_kinds: np.ndarray
+    # Workspace-relative file for documents and files, "" for IDs defined in YAML
+    paths: list[str]
+    indptr: np.ndarray
+    indices: np.ndarray
+    kinds: np.ndarray
+    # workspace_fingerprint() of the tree the graph was built from ("" if unknown)
+    fingerprint: str = ""
+    _ids: dict[str, int] = field(init=False, repr=False)
+    _by_path: dict[str, str] = field(init=False, repr=False)
+    _reverse: tuple[np.ndarray, np.ndarray, np.ndarray] | None = field(default=None, init=False, repr=False)
+    _masked: dict[tuple[tuple[str, ...], bool], sparse.csr_matrix] = field(default_factory=dict, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self._ids = {name: i for i, name in enumerate(self.nodes)}
+        self._by_path = {}
+        for name, rel in zip(self.nodes, self.paths, strict=True):
+            if rel:
+                self._by_path.setdefault(rel, name)
+
+    @classmethod
+    def from_edges(cls, nodes: dict[str, tuple[str, str]], edges: set[tuple[str, str, str]]) -> LinkGraph:
+        """Build from {name: (node_kind, path)} and {(source, target, edge_kind)}."""
+
+        names = sorted(nodes)
+        ids = {name: i for i, name in enumerate(names)}
+        ordered = sorted((ids[s], ids[t], EDGE_KINDS.index(k)) for s, t, k in edges)
+        src = np.array([e[0] for e in ordered], dtype=np.int32)
+        indptr = np.zeros(len(names) + 1, dtype=np.int32)
+        np.cumsum(np.bincount(src, minlength=len(names)), out=indptr[1:])
+        return cls(
+            nodes=names,
+            node_kinds=np.array([NODE_KINDS.index(nodes[n][0]) for n in names], dtype=np.uint8),
+            paths=[nodes[n][1] for n in names],
+            indptr=indptr,
+            indices=np.array([e[1] for e in ordered], dtype=np.int32),
+            kinds=np.array([e[2] for e in ordered], dtype=np.uint8),
+        )
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._ids
+
+    @property
+    def edge_count(self) -> int:
+        return len(self.indices)
+
+    def node_kind(self, name: str) -> str:
+        return NODE_KINDS[self.node_kinds[self._ids[name]]]
+
+    def node_for_path(self, rel: str) -> str | None:
+        return self._by_path.get(rel)
+
+    def _reverse_csr(self) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        if self._reverse is None:
+            sources = np.repeat(np.arange(len(self.nodes), dtype=np.int32), np.diff(self.indptr))
+            order = np.lexsort((sources, self.indices))
+            indptr = np.zeros(len(self.nodes) + 1, dtype=np.int32)
+            np.cumsum(np.bincount(self.indices, minlength=len(self.nodes)), out=indptr[1:])
+            self._reverse = (indptr, sources[order], self.kinds[order])
+        return self._reverse
+
+    def edges_from(self, name: str) -> list[tuple[str, str]]:
+        i = self._ids[name]
+        lo, hi = self.indptr[i], self.indptr[i + 1]
+        return [(self.nodes[j], EDGE_KINDS[k]) for j, k in zip(self.indices[lo:hi], self.kinds[lo:hi], strict=True)]
+
+    def backlinks(self, name: str) -> list[tuple[str, str]]:
+        """(source, edge kind) for every edge pointing at ``name``."""
+
+        if name not in self._ids:
+            return []
+        indptr, sources, kinds = self._reverse_csr()
+        i = self._ids[name]
+        lo, hi = indptr[i], indptr[i + 1]
+        return [(self.nodes[j], EDGE_KINDS[k]) for j, k in zip(sources[lo:hi], kinds[lo:hi], strict=True)]
+
+    def _matrix(self, kinds: tuple[str, ...], reverse: bool) -> sparse.csr_matrix:
+        key = (kinds, reverse)
+        if key not in self._masked:
+            indptr, indices, edge_kinds = self._reverse_csr() if reverse else (self.indptr, self.indices, self.kinds)
+            wanted = np.isin(edge_kinds, [EDGE_KINDS.index(k) for k in kinds])
+            n = len(self.nodes)
+            # Copies: eliminate_zeros() compacts the index arrays in place
+            matrix = sparse.csr_matrix((wanted, indices.copy(), indptr.copy()), shape=(n, n))
+            matrix.eliminate_zeros()
+            self._masked[key] = matrix
+        return self._masked[key]
+
+    def reachable(self, starts: list[str], kinds: tuple[str, ...] = EDGE_KINDS, reverse: bool = False) -> set[str]:
+        """Nodes reachable from ``starts`` (inclusive) along edges of ``kinds``."""
+
+        matrix = self._matrix(tuple(kinds), reverse)
+        seen = np.zeros(len(self.nodes), dtype=bool)
+        for name in starts:
+            if name in self._ids and not seen[self._ids[name]]:
+                seen[breadth_first_order(matrix, self._ids[name], directed=True, return_predecessors=False)] = True
+        return {self.nodes[i] for i in np.flatnonzero(seen)}
+
+    def orphans(self, root: str = "index.md") -> list[str]:
+        """Paths of documents not reachable from the document at ``root``."""
+
+        start = self.node_for_path(root)
+        reached = self.reachable([start] if start else [])
+        document = NODE_KINDS.index("document")
+        return sorted(
+            self.paths[i] for i, name in enumerate(self.nodes) if self.node_kinds[i] == document and name not in reached
+        )
+
+    def impact(self, name: str, kinds: tuple[str, ...] = IMPACT_KINDS) -> list[str]:
+        """Every node that transitively depends on ``name``, plus documents linking to it (excluding itself)."""
+
+        closure = self.reachable([name], kinds, reverse=True)
+        closure.update(source for source, kind in self.backlinks(name) if kind == "link")
+        return sorted(closure - {name})
+
+    def to_json(self) -> dict:
+        return {
+            "version": GRAPH_VERSION,
+            "edge_kinds": list(EDGE_KINDS),
+            "node_kinds": list(NODE_KINDS),
+            "nodes": self.nodes,
+            "node_kind": self.node_kinds.tolist(),
+            "paths": self.paths,
+            "indptr": self.indptr.tolist(),
+            "indices": self.indices.tolist(),
+            "kinds": self.kinds.tolist(),
+            "fingerprint": self.fingerprint,
+        }
+
+    @classmethod
+    def from_json(cls, data: dict) -> LinkGraph:
+        if data.get("version") != GRAPH_VERSION:
+            raise ValueError(f"Unsupported link graph version: {data.get('version')}")
+        return cls(
+            nodes=data["nodes"],
+            node_kinds=np.array(data["node_kind"], dtype=np.uint8),
+            paths=data["paths"],
+            indptr=np.array(data["indptr"], dtype=np.int32),
+            indices=np.array(data["indices"], dtype=np.int32),
+            kinds=np.array(data["kinds"], dtype=np.uint8),
+            fingerprint=data.get("fingerprint", ""),
+        )
+
+    def save(self, path: Path = DEFAULT_GRAPH) -> bool:
+        """Write the graph as JSON; returns False when the file was already up to date."""
+
+        return write_if_changed(path, json.dumps(self.to_json(), separators=(",", ":")).encode("utf-8"))
+
+    @classmethod
+    def load(cls, path: Path = DEFAULT_GRAPH) -> LinkGraph:
+        return cls.from_json(json.loads(path.read_text(encoding="utf-8")))
+
+    def to_networkx(self):
+        """The graph as a networkx.DiGraph (node attrs: kind, path; edge attr: kind)."""
+
+        import networkx as nx
+
+        graph = nx.DiGraph()
+        for i, name in enumerate(self.nodes):
+            graph.add_node(name, kind=NODE_KINDS[self.node_kinds[i]], path=self.paths[i])
+        sources = np.repeat(np.arange(len(self.nodes)), np.diff(self.indptr))
+        graph.add_edges_from(
+            (self.nodes[s], self.nodes[t], {"kind": EDGE_KINDS[k]})
+            for s, t, k in zip(sources, self.indices, self.kinds, strict=True)
+        )
+        return graph
+
+
+def _in_graph(rel: str) -> bool:
+    top = rel.split("/", 1)[0]
+    return top not in SKIP_TOP_LEVEL and not (top.startswith(".") and "/" in rel)
+
+
+def workspace_fingerprint(index: WorkspaceIndex) -> str:
+    """SHA-256 over every path the graph can see, with its size and mtime.
+
+    Link targets count by existence, so any file added, removed or touched
+    outside the skipped folders changes the fingerprint.
+    """
+
+    digest = hashlib.sha256()
+    for rel in index.iter_files():
+        if not _in_graph(rel):
+            continue
+        st = index.stats.get(rel) or (index.root / rel).stat()
+        digest.update(f"{rel}\0{st.st_size}\0{st.st_mtime_ns}\n".encode())
+    return digest.hexdigest()
+
+
+def build_graph(root: Path = WORKSPACE_ROOT, index: WorkspaceIndex | None = None) -> LinkGraph:
+    """Collect nodes and edges from Markdown documents and the YAML catalog under ``root``."""
+
+    index = index or WorkspaceIndex.scan(root, with_stat=True)
+    nodes: dict[str, tuple[str, str]] = {}
+    edges: set[tuple[str, str, str]] = set()
+
+    def add_node(name: str, kind: str, path: str = "") -> None:
+        current = nodes.get(name)
+        if current is None or NODE_KINDS.index(kind) > NODE_KINDS.index(current[0]):
+            nodes[name] = (kind, path or (current[1] if current else ""))
+
+    def add_edge(source: str, target, kind: str) -> None:
+        if isinstance(target, str) and target:
+            add_node(target, "artifact")
+            edges.add((source, target, kind))
+
+    # Pass 1: name every Markdown document (front matter ID, else its path)
+    documents: dict[str, tuple[str, dict, str]] = {}
+    for rel in index.iter_files():
+        if not rel.endswith(".md") or not _in_graph(rel):
+            continue
+        text = (root / rel).read_text(encoding="utf-8")
+        try:
+            fm = parse_front_matter(text, root / rel)[0]
+        except Exception:
+            # Plain Markdown (READMEs, notes) has no front matter
+            fm = {}
+        name = fm["id"] if isinstance(fm.get("id"), str) else rel
+        documents[rel] = (name, fm, text)
+        add_node(name, "document", rel)
+
+    # Pass 2: Markdown links and front matter relations
+    for rel, (name, fm, text) in documents.items():
+        for target in iter_relative_markdown_links(text):
+            resolved = index.resolve_link(rel, target)
+            if not resolved.exists or resolved.path == rel or not resolved.path:
+                continue
+            target_name = documents[resolved.path][0] if resolved.path in documents else resolved.path
+            add_node(target_name, "document" if resolved.path in documents else "file", resolved.path)
+            edges.add((name, target_name, "link"))
+        for key, kind in (("refs", "ref"), ("indicators", "indicator"), ("frame", "frame")):
+            for target in ensure_list(fm.get(key)):
+                add_edge(name, target, kind)
+
+    # YAML-defined artifacts
+    catalog = load_catalog(root)
+    for attr, rel in CATALOG_FILES.items():
+        add_node(rel, "file", rel)
+        items = getattr(catalog, attr)
+        for item_id in (item.get("id") for item in items.values()):
+            add_edge(rel, item_id, "defines")
+    for tid, rel in catalog.template_sources.items():
+        add_node(rel, "file", rel)
+        add_edge(rel, tid, "defines")
+    for ind_id, ind in catalog.indicators.items():
+        add_edge(ind_id, ind.get("frame"), "frame")
+    for item_id, item in (catalog.frames | catalog.indicators).items():
+        for target in ensure_list(item.get("refs")):
+            add_edge(item_id, target, "ref")
+    for tid, tmpl in catalog.templates.items():
+        add_edge(tid, tmpl.get("frame"), "frame")
+        for target in ensure_list(tmpl.get("indicators")):
+            add_edge(tid, target, "indicator")
+        for target in ensure_list(tmpl.get("refs")):
+            add_edge(tid, target, "ref")
+    for section in catalog.col_sections.values():
+        if isinstance(section.get("id"), str):
+            add_edge(section["id"], section.get("guidance_ref"), "guidance_ref")
+
+    graph = LinkGraph.from_edges(nodes, edges)
+    graph.fingerprint = workspace_fingerprint(index)
+    return graph
+
+
+def load_or_build(
+    path: Path = DEFAULT_GRAPH, root: Path = WORKSPACE_ROOT, rebuild: bool = False
+) -> tuple[LinkGraph, bool]:
+    """The persisted graph if it was built from the current workspace, else a fresh (saved) one.
+
+    Returns (graph, rebuilt). Checking costs one stat walk of the workspace.
+    """
+
+    index = WorkspaceIndex.scan(root, with_stat=True)
+    if not rebuild and path.exists():
+        try:
+            graph = LinkGraph.load(path)
+        except (OSError, ValueError, KeyError):
+            graph = None
+        if graph is not None and graph.fingerprint == workspace_fingerprint(index):
+            return graph, False
+    graph = build_graph(root, index)
+    graph.save(path)
+    return graph, True
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Build and query the global link graph.")
+    parser.add_argument("--out", type=Path, default=DEFAULT_GRAPH, help="Graph JSON path")
+    parser.add_argument("--rebuild", action="store_true", help="Rebuild even if the workspace is unchanged")
+    parser.add_argument("--orphans", action="store_true", help="List documents not reachable from index.md")
+    parser.add_argument("--backlinks", metavar="ID", help="List nodes linking to ID")
+    parser.add_argument("--impact", metavar="ID", help="List nodes that transitively depend on ID")
+    parser.add_argument("--graphml", type=Path, help="Also export the graph as GraphML (needs networkx)")
+    parser.add_argument("--strict", action="store_true", help="Exit 1 when orphan documents exist")
+    args = parser.parse_args(argv)
+
+    graph, rebuilt = load_or_build(args.out, rebuild=args.rebuild)
+    orphans = graph.orphans()
+    print(
+        f"{'Built' if rebuilt else 'Loaded'} link graph: {len(graph.nodes)} nodes, "
+        f"{graph.edge_count} edges, {len(orphans)} orphan documents"
+    )
+
+    if args.orphans:
+        for path in orphans:
+            print(f"  - {path}")
+    for label, node, results in (
+        ("Backlinks", args.backlinks, graph.backlinks(args.backlinks) if args.backlinks else []),
+        ("Impact", args.impact, [(n, graph.node_kind(n)) for n in graph.impact(args.impact)] if args.impact else []),
+    ):
+        if node is None:
+            continue
+        if node not in graph:
+            print(f"ERROR: unknown node {node}")
+            return 1
+        print(f"{label} of {node}: {len(results)}")
+        for name, kind in results:
+            print(f"  - {name} ({kind})")
+
+    if args.graphml:
+        import networkx as nx
+
+        args.graphml.parent.mkdir(parents=True, exist_ok=True)
+        nx.write_graphml(graph.to_networkx(), args.graphml)
+        print(f"Wrote {args.graphml}")
+
+    return 1 if args.strict and orphans else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
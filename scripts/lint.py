@@ -12,17 +12,19 @@ Scope: local QA only.
 from __future__ import annotations
 
 import re
+import sys
 from pathlib import Path
 
-from ruamel.yaml import YAML
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from scripts.template_library import load_library
+from scripts.yaml_backend import load_file
 
 WORKSPACE_ROOT = Path(__file__).resolve().parents[1]
-YAML_LOADER = YAML(typ="safe")
 
 
 def load_yaml(path: Path) -> dict:
-    with path.open("r", encoding="utf-8") as handle:
-        data = YAML_LOADER.load(handle)
+    data = load_file(path)
     if not isinstance(data, dict):
         raise TypeError(f"Expected mapping at root: {path}")
     return data
@@ -37,8 +39,7 @@ def main() -> int:
     indicators_doc = load_yaml(WORKSPACE_ROOT / "taxonomy" / "indicators.yaml")
     indicator_ids = {i["id"] for i in indicators_doc.get("indicators", []) if isinstance(i, dict) and "id" in i}
 
-    templates_doc = load_yaml(WORKSPACE_ROOT / "templates" / "comment_templates.yaml")
-    templates = templates_doc.get("templates", [])
+    templates = load_library(WORKSPACE_ROOT).all_templates
 
     bracket_placeholder_re = re.compile(r"\[[^\]]+\]")
     slot_placeholder_re = re.compile(r"\{([a-z_]+)\}")
@@ -0,0 +1,265 @@
+"""Infer the source template and slot values of a rendered comment.
+
+Usage:
+  python scripts/match_comment.py "Avery contributes to our learning community in meaningful ways. ..."
+  python scripts/match_comment.py --csv build/report_batch/comments-00001.csv
+
+Every template is compiled into one radix trie. Literal text between
+placeholders becomes compressed edges, and each `{slot}` becomes a capture
+edge. Matching walks the trie once per comment. A capture ends where one of
+the next literal edges occurs, so backtracking is bounded by the few
+positions where the following literal text appears.
+
+When no template matches exactly (hand-edited comments), the closest template
+is reported with a word-level edit distance in which each slot may absorb any
+number of words at no cost. Candidates are pre-filtered by shared literal
+words, so only a handful of templates are scored per comment.
+
+Limitations: two adjacent placeholders with no literal text between them
+cannot be split apart and are not supported.
+
+Scope: local, read-only. No network calls.
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import heapq
+import re
+import sys
+import time
+from collections import defaultdict
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from scripts.catalog import load_catalog
+
+_SLOT_RE = re.compile(r"\{(\w+)\}")
+_WS_RE = re.compile(r"\s+")
+_WORD_STRIP = ".,;:!?\"'()"
+FUZZY_CANDIDATES = 8
+
+
+def normalize_text(text: str) -> str:
+    """Collapse whitespace (template text is stored as multi-line YAML blocks)."""
+    return _WS_RE.sub(" ", text).strip()
+
+
+def tokenize_template(text: str) -> list[tuple[str, str]]:
+    """Split template text into ``("lit", text)`` and ``("slot", name)`` tokens."""
+
+    tokens: list[tuple[str, str]] = []
+    pos = 0
+    flat = normalize_text(text)
+    for match in _SLOT_RE.finditer(flat):
+        if match.start() > pos:
+            tokens.append(("lit", flat[pos : match.start()]))
+        tokens.append(("slot", match.group(1)))
+        pos = match.end()
+    if pos < len(flat):
+        tokens.append(("lit", flat[pos:]))
+    return tokens
+
+
+def _words(text: str) -> list[str]:
+    return [w.strip(_WORD_STRIP).lower() for w in text.split() if w.strip(_WORD_STRIP)]
+
+
+@dataclass(frozen=True)
+class TemplateMatch:
+    template_id: str
+    exact: bool
+    distance: int = 0
+    slots: dict[str, str] = field(default_factory=dict)
+
+
+class _Node:
+    __slots__ = ("edges", "slots", "terminal")
+
+    def __init__(self):
+        # first character -> (label, child)
+        self.edges: dict[str, tuple[str, _Node]] = {}
+        self.slots: dict[str, _Node] = {}
+        self.terminal: str | None = None
+
+
+class TemplateMatcher:
+    """Combined radix-trie matcher over every template text."""
+
+    def __init__(self, templates: dict[str, dict]):
+        self.root = _Node()
+        self.size = 0
+        # template_id -> word tokens (None marks a slot) for the fuzzy fallback
+        self._word_tokens: dict[str, list[str | None]] = {}
+        self._word_index: dict[str, set[str]] = defaultdict(set)
+
+        for tid, tmpl in templates.items():
+            text = tmpl.get("text") if isinstance(tmpl, dict) else None
+            if not isinstance(text, str) or not text.strip():
+                continue
+            tokens = tokenize_template(text)
+            self._insert(tid, tokens)
+            word_tokens: list[str | None] = []
+            for kind, value in tokens:
+                if kind == "slot":
+                    word_tokens.append(None)
+                else:
+                    word_tokens.extend(_words(value))
+            self._word_tokens[tid] = word_tokens
+            for word in word_tokens:
+                if word is not None:
+                    self._word_index[word].add(tid)
+            self.size += 1
+
+    def _insert(self, tid: str, tokens: list[tuple[str, str]]) -> None:
+        node = self.root
+        for kind, value in tokens:
+            if kind == "slot":
+                node = node.slots.setdefault(value, _Node())
+                continue
+            label = value
+            while label:
+                edge = node.edges.get(label[0])
+                if edge is None:
+                    child = _Node()
+                    node.edges[label[0]] = (label, child)
+                    node, label = child, ""
+                    break
+                edge_label, child = edge
+                common = 0
+                limit = min(len(label), len(edge_label))
+                while common < limit and label[common] == edge_label[common]:
+                    common += 1
+                if common < len(edge_label):
+                    # Split the existing edge at the shared prefix
+                    mid = _Node()
+                    mid.edges[edge_label[common]] = (edge_label[common:], child)
+                    node.edges[label[0]] = (edge_label[:common], mid)
+                    child = mid
+                node, label = child, label[common:]
+        if node.terminal is None:
+            node.terminal = tid
+
+    def _walk(self, node: _Node, text: str, pos: int, captures: dict[str, str]) -> Iterator[tuple[str, dict]]:
+        if pos == len(text) and node.terminal is not None:
+            yield node.terminal, captures
+        if pos < len(text):
+            edge = node.edges.get(text[pos])
+            if edge is not None and text.startswith(edge[0], pos):
+                yield from self._walk(edge[1], text, pos + len(edge[0]), captures)
+        for name, child in node.slots.items():
+            ends: set[int] = set()
+            if child.terminal is not None and pos < len(text):
+                ends.add(len(text))
+            for label, _next in child.edges.values():
+                q = text.find(label, pos + 1)
+                while q != -1:
+                    ends.add(q)
+                    q = text.find(label, q + 1)
+            previous = captures.get(name)
+            for end in sorted(ends):
+                value = text[pos:end]
+                # A repeated slot (e.g. {child} twice) must capture the same value
+                if previous is not None and previous.lower() != value.lower():
+                    continue
+                yield from self._walk(child, text, end, {**captures, name: value})
+
+    def match_exact(self, comment: str) -> TemplateMatch | None:
+        text = normalize_text(comment)
+        for tid, captures in self._walk(self.root, text, 0, {}):
+            return TemplateMatch(template_id=tid, exact=True, slots=captures)
+        return None
+
+    def closest(self, comment: str) -> TemplateMatch | None:
+        """Return the template with the smallest slot-aware word edit distance."""
+
+        words = _words(comment)
+        shared: dict[str, int] = defaultdict(int)
+        for word in set(words):
+            for tid in self._word_index.get(word, ()):
+                shared[tid] += 1
+        if not shared:
+            return None
+
+        best: TemplateMatch | None = None
+        for _count, tid in heapq.nlargest(FUZZY_CANDIDATES, ((n, tid) for tid, n in shared.items())):
+            distance = _slot_edit_distance(self._word_tokens[tid], words)
+            if best is None or distance < best.distance:
+                best = TemplateMatch(template_id=tid, exact=False, distance=distance)
+        return best
+
+    def match(self, comment: str, fuzzy: bool = True) -> TemplateMatch | None:
+        found = self.match_exact(comment)
+        if found is None and fuzzy:
+            found = self.closest(comment)
+        return found
+
+
+def _slot_edit_distance(template_words: list[str | None], words: list[str]) -> int:
+    """Word-level Levenshtein distance where ``None`` tokens match any run of words."""
+
+    prev = list(range(len(words) + 1))
+    for token in template_words:
+        cur = [0] * (len(words) + 1)
+        if token is None:
+            cur[0] = prev[0]
+            for j in range(1, len(words) + 1):
+                cur[j] = min(prev[j], cur[j - 1])
+        else:
+            cur[0] = prev[0] + 1
+            for j in range(1, len(words) + 1):
+                cur[j] = min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + (token != words[j - 1]))
+        prev = cur
+    return prev[-1]
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Infer template IDs and slot values from rendered comments.")
+    parser.add_argument("comment", nargs="?", help="A single rendered comment")
+    parser.add_argument("--csv", type=Path, help="CSV with a 'text' column (and optionally 'template_id')")
+    parser.add_argument("--no-fuzzy", action="store_true", help="Skip the closest-template fallback")
+    args = parser.parse_args(argv)
+
+    if not args.comment and not args.csv:
+        parser.error("provide a comment or --csv")
+
+    matcher = TemplateMatcher(load_catalog().templates)
+
+    if args.comment:
+        found = matcher.match(args.comment, fuzzy=not args.no_fuzzy)
+        if found is None:
+            print("No matching template")
+            return 1
+        kind = "EXACT" if found.exact else f"CLOSEST (distance {found.distance})"
+        print(f"{kind} {found.template_id}")
+        for name, value in found.slots.items():
+            print(f"  {name}: {value}")
+        return 0
+
+    counts = {"exact": 0, "closest": 0, "unmatched": 0, "wrong_template": 0}
+    started = time.perf_counter()
+    with args.csv.open("r", encoding="utf-8", newline="") as handle:
+        for row in csv.DictReader(handle):
+            found = matcher.match(row.get("text") or "", fuzzy=not args.no_fuzzy)
+            if found is None:
+                counts["unmatched"] += 1
+                continue
+            counts["exact" if found.exact else "closest"] += 1
+            expected = row.get("template_id")
+            if expected and expected != found.template_id:
+                counts["wrong_template"] += 1
+    elapsed = time.perf_counter() - started
+    total = sum(v for k, v in counts.items() if k != "wrong_template")
+
+    print(f"Matched {total} comment(s) in {elapsed:.2f} s ({total / elapsed if elapsed else 0:,.0f}/s)")
+    for name, value in counts.items():
+        print(f"  {name}: {value}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
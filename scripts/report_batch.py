@@ -0,0 +1,364 @@
+"""Run a synthetic end-to-end reporting batch (roster → export files).
+
+Usage:
+  python scripts/report_batch.py                              # 10 classes of 30
+  python scripts/report_batch.py --classes 2000 --workers 8   # board-sized batch
+  python scripts/report_batch.py --out build/report_batch --max-chars 450
+
+Stages follow knowledge/processes/process.reporting.workflow.md:
+
+  read      synthetic roster + observed indicators, one class at a time
+  select    one template per child, frame and section (scripts/assign_comments.py)
+  render    fill slots from taxonomy/slot_guidance.yaml examples
+  pii_scan  the same patterns as scripts/validate.py (Strict No-PII Policy)
+  length    character and sentence limits (guidance/comment-style.md)
+  write     chunked CSV/XML export + manifest (scripts/sis_export.py) and rejects.csv
+
+select → length run in a process pool, one class per task. At most
+`--in-flight` classes are queued at once; the reader blocks until the writer
+has drained the oldest class, so memory stays flat regardless of batch size.
+Per-stage item counts and timings are reported at the end.
+
+Inputs are synthetic. This repository never stores real student data.
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import random
+import re
+import sys
+import time
+from collections import deque
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from scripts.assign_comments import ChildObservations, assign_class, synthetic_class
+from scripts.catalog import WORKSPACE_ROOT, Catalog, load_catalog
+from scripts.recommend import TemplateRecommender
+from scripts.sis_export import DEFAULT_MAX_BYTES, EXPORT_FIELDS, WRITERS, open_export_writer
+from scripts.validate import _PII_PATTERNS, load_yaml
+
+DEFAULT_OUT_DIR = WORKSPACE_ROOT / "build" / "report_batch"
+DEFAULT_MAX_CHARS = 500
+MIN_SENTENCES = 1
+MAX_SENTENCES = 4
+SELECT_TIME_BUDGET = 0.05
+
+REJECT_FIELDS = EXPORT_FIELDS + ["reason"]
+STAGES = ["read", "select", "render", "pii_scan", "length", "write"]
+
+# Synthetic first names for rendering only (never real students)
+SYNTHETIC_NAMES = ["Avery", "Jordan", "Riley", "Quinn", "Rowan", "Sam", "Casey", "Emerson", "Hayden", "Parker"]
+
+_SLOT_RE = re.compile(r"\{(\w+)\}")
+_SENTENCE_END_RE = re.compile(r"[.!?](\s|$)")
+# Singular "they" takes the plural verb: "They show", "They now use"
+_THEY_VERB_RE = re.compile(r"\b([Tt]hey (?:now |also |still |often )?)([a-z]+)\b")
+_IRREGULAR_PLURALS = {"is": "are", "was": "were", "has": "have", "does": "do", "goes": "go"}
+
+
+@dataclass
+class StageCounter:
+    name: str
+    items: int = 0
+    seconds: float = 0.0
+
+    @property
+    def rate(self) -> float:
+        return self.items / self.seconds if self.seconds > 0 else 0.0
+
+
+@dataclass
+class ClassResult:
+    class_id: str
+    rows: list[dict] = field(default_factory=list)
+    rejects: list[dict] = field(default_factory=list)
+    # stage name -> (items, seconds)
+    stages: dict[str, tuple[int, float]] = field(default_factory=dict)
+
+
+@dataclass
+class BatchReport:
+    classes: int = 0
+    written: int = 0
+    rejected: int = 0
+    max_in_flight: int = 0
+    elapsed: float = 0.0
+    stages: dict[str, StageCounter] = field(default_factory=lambda: {name: StageCounter(name) for name in STAGES})
+
+    def add(self, name: str, items: int, seconds: float) -> None:
+        counter = self.stages[name]
+        counter.items += items
+        counter.seconds += seconds
+
+
+def load_slot_examples(root: Path = WORKSPACE_ROOT) -> dict[str, list[str]]:
+    """Map slot names (``evidence``) to their example values in slot_guidance.yaml."""
+
+    doc = load_yaml(root / "taxonomy" / "slot_guidance.yaml")
+    examples: dict[str, list[str]] = {}
+    for slot in doc.get("slots", []):
+        if not isinstance(slot, dict) or not isinstance(slot.get("id"), str):
+            continue
+        values = [v for v in slot.get("examples") or [] if isinstance(v, str) and not _SLOT_RE.search(v)]
+        if values:
+            examples[slot["id"].removeprefix("slot.")] = values
+    return examples
+
+
+def render_template(text: str, values: dict[str, str]) -> str:
+    """Fill ``{slot}`` placeholders, capitalizing values that start a sentence.
+
+    Unknown slots are left in place so the length stage can reject them.
+    """
+
+    flat = " ".join(line.strip() for line in text.strip().splitlines())
+
+    def fill(match: re.Match) -> str:
+        value = values.get(match.group(1))
+        if value is None:
+            return match.group(0)
+        before = match.string[: match.start()].rstrip()
+        if not before or before[-1] in ".!?":
+            value = value[:1].upper() + value[1:]
+        return value
+
+    rendered = _SLOT_RE.sub(fill, flat)
+    if values.get("pronoun_subject", "").lower() == "they":
+        rendered = _THEY_VERB_RE.sub(lambda m: m.group(1) + plural_verb(m.group(2)), rendered)
+    return rendered
+
+
+def plural_verb(word: str) -> str:
+    """Third-person singular verb -> the form used with "they" (other words are returned unchanged)."""
+
+    if word in _IRREGULAR_PLURALS:
+        return _IRREGULAR_PLURALS[word]
+    if word.endswith("ies") and len(word) > 4:
+        return word[:-3] + "y"
+    if word.endswith(("sses", "shes", "ches", "xes", "zzes", "oes")):
+        return word[:-2]
+    if word.endswith("s") and not word.endswith(("ss", "us", "is")):
+        return word[:-1]
+    return word
+
+
+def synthetic_slot_values(
+    rng: random.Random, child_values: dict[str, str], slots: Iterable[str], examples: dict[str, list[str]]
+) -> dict[str, str]:
+    """Pick example values for ``slots``; per-child values (name, pronouns) win."""
+
+    values = dict(child_values)
+    for slot in slots:
+        if slot in values:
+            continue
+        # school_strategy / home_strategy fall back to the generic strategy examples
+        choices = examples.get(slot) or examples.get(slot.rsplit("_", 1)[-1])
+        if choices:
+            values[slot] = rng.choice(choices)
+    return values
+
+
+def check_pii(text: str) -> str | None:
+    for pattern, msg in _PII_PATTERNS:
+        if pattern.search(text):
+            return msg
+    return None
+
+
+def check_length(text: str, max_chars: int) -> str | None:
+    if _SLOT_RE.search(text):
+        return "Unfilled placeholder"
+    if len(text) > max_chars:
+        return f"Too long ({len(text)} > {max_chars} chars)"
+    sentences = len(_SENTENCE_END_RE.findall(text))
+    if not MIN_SENTENCES <= sentences <= MAX_SENTENCES:
+        return f"Expected {MIN_SENTENCES}-{MAX_SENTENCES} sentences, found {sentences}"
+    return None
+
+
+def iter_synthetic_rosters(
+    catalog: Catalog, classes: int, children: int = 30, seed: int = 0
+) -> Iterator[tuple[str, list[ChildObservations]]]:
+    """Yield ``(class_id, roster)`` one class at a time."""
+
+    for n in range(1, classes + 1):
+        class_id = f"class.{n:05d}"
+        yield class_id, synthetic_class(catalog, class_id, children, seed)
+
+
+_WORKER: dict = {}
+
+
+def _init_worker(root: Path, max_chars: int) -> None:
+    _WORKER["recommender"] = TemplateRecommender(load_catalog(root))
+    _WORKER["examples"] = load_slot_examples(root)
+    _WORKER["max_chars"] = max_chars
+
+
+def _process_class(item: tuple[str, list[ChildObservations]]) -> ClassResult:
+    class_id, roster = item
+    recommender: TemplateRecommender = _WORKER["recommender"]
+    templates = recommender.catalog.templates
+    result = ClassResult(class_id=class_id)
+
+    started = time.perf_counter()
+    assignment = assign_class(recommender, roster, class_id, time_budget=SELECT_TIME_BUDGET)
+    selected = [
+        (child_id, frame_id, section, tid)
+        for child_id, slots in assignment.assignments.items()
+        for (frame_id, section), tid in slots.items()
+    ]
+    result.stages["select"] = (len(selected), time.perf_counter() - started)
+
+    started = time.perf_counter()
+    rng = random.Random(class_id)
+    examples = _WORKER["examples"]
+    per_child: dict[str, dict[str, str]] = {}
+    for i, child in enumerate(roster):
+        # Keep name and pronouns consistent across all of one child's comments
+        pronoun = rng.randrange(len(examples.get("pronoun_subject") or [""]))
+        values = {"child": SYNTHETIC_NAMES[i % len(SYNTHETIC_NAMES)]}
+        for slot in ("pronoun_subject", "pronoun_object", "pronoun_possessive"):
+            if len(examples.get(slot) or []) > pronoun:
+                values[slot] = examples[slot][pronoun]
+        per_child[child.child_id] = values
+    rendered = []
+    for child_id, frame_id, section, tid in selected:
+        tmpl = templates[tid]
+        values = synthetic_slot_values(rng, per_child[child_id], tmpl.get("slots") or [], examples)
+        text = render_template(tmpl.get("text") or "", values)
+        rendered.append(
+            {
+                "class_id": class_id,
+                "child_id": child_id,
+                "frame_id": frame_id,
+                "section": section,
+                "template_id": tid,
+                "text": text,
+            }
+        )
+    result.stages["render"] = (len(rendered), time.perf_counter() - started)
+
+    for stage, check in (("pii_scan", check_pii), ("length", lambda t: check_length(t, _WORKER["max_chars"]))):
+        started = time.perf_counter()
+        checked = len(rendered)
+        passed = []
+        for row in rendered:
+            reason = check(row["text"])
+            if reason:
+                result.rejects.append({**row, "reason": reason})
+            else:
+                passed.append(row)
+        rendered = passed
+        result.stages[stage] = (checked, time.perf_counter() - started)
+
+    result.rows = rendered
+    return result
+
+
+def run_batch(
+    rosters: Iterable[tuple[str, list[ChildObservations]]],
+    out_dir: Path = DEFAULT_OUT_DIR,
+    root: Path = WORKSPACE_ROOT,
+    workers: int | None = None,
+    in_flight: int = 4,
+    max_chars: int = DEFAULT_MAX_CHARS,
+    export_format: str = "csv",
+    max_bytes: int = DEFAULT_MAX_BYTES,
+) -> BatchReport:
+    """Stream rosters through the pool and append results to the export files."""
+
+    report = BatchReport()
+    started = time.perf_counter()
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    with (
+        open_export_writer(export_format, out_dir, max_bytes=max_bytes) as out_writer,
+        (out_dir / "rejects.csv").open("w", encoding="utf-8", newline="") as reject_handle,
+        ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(root, max_chars)) as pool,
+    ):
+        reject_writer = csv.DictWriter(reject_handle, fieldnames=REJECT_FIELDS)
+        reject_writer.writeheader()
+
+        def drain(future) -> None:
+            result: ClassResult = future.result()
+            for name, (items, seconds) in result.stages.items():
+                report.add(name, items, seconds)
+            write_started = time.perf_counter()
+            out_writer.write_many(result.rows)
+            reject_writer.writerows(result.rejects)
+            report.add("write", len(result.rows) + len(result.rejects), time.perf_counter() - write_started)
+            report.written += len(result.rows)
+            report.rejected += len(result.rejects)
+            report.classes += 1
+
+        pending: deque = deque()
+        iterator = iter(rosters)
+        while True:
+            read_started = time.perf_counter()
+            item = next(iterator, None)
+            if item is None:
+                break
+            report.add("read", len(item[1]), time.perf_counter() - read_started)
+
+            pending.append(pool.submit(_process_class, item))
+            report.max_in_flight = max(report.max_in_flight, len(pending))
+            # Backpressure: block the reader until the oldest class is written
+            if len(pending) >= in_flight:
+                drain(pending.popleft())
+
+        while pending:
+            drain(pending.popleft())
+
+    report.elapsed = time.perf_counter() - started
+    return report
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Run a synthetic streaming CoL report batch.")
+    parser.add_argument("--classes", type=int, default=10)
+    parser.add_argument("--children", type=int, default=30, help="Children per class")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--in-flight", type=int, default=4, help="Maximum classes queued at once")
+    parser.add_argument("--max-chars", type=int, default=DEFAULT_MAX_CHARS)
+    parser.add_argument("--format", choices=sorted(WRITERS), default="csv", help="Export chunk format")
+    parser.add_argument("--max-bytes", type=int, default=DEFAULT_MAX_BYTES, help="Maximum export chunk size")
+    parser.add_argument("--out", type=Path, default=DEFAULT_OUT_DIR)
+    args = parser.parse_args(argv)
+
+    catalog = load_catalog()
+    rosters = iter_synthetic_rosters(catalog, args.classes, args.children, args.seed)
+    report = run_batch(
+        rosters,
+        args.out,
+        workers=args.workers,
+        in_flight=args.in_flight,
+        max_chars=args.max_chars,
+        export_format=args.format,
+        max_bytes=args.max_bytes,
+    )
+
+    print("=" * 60)
+    print("REPORT BATCH")
+    print("=" * 60)
+    for counter in report.stages.values():
+        print(f"  {counter.name:<9} {counter.items:>9} items  {counter.seconds:8.3f} s  {counter.rate:>12.0f}/s")
+    print()
+    print(f"  Classes: {report.classes} (max in flight {report.max_in_flight})")
+    print(f"  Written: {report.written}")
+    print(f"  Rejected: {report.rejected}")
+    print(f"  Elapsed: {report.elapsed:.2f} s")
+    print(f"  Output: {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
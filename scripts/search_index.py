@@ -0,0 +1,332 @@
+"""Full-text search over docs, sources, guidance and knowledge.
+
+Usage:
+  python scripts/search_index.py                          # refresh the index
+  python scripts/search_index.py "anecdotal comments"
+  python scripts/search_index.py "play" --type document --tag col --limit 5
+  python scripts/search_index.py "growing success" --facets
+  python scripts/search_index.py --export                 # build/search_index.json
+
+The index is a SQLite FTS5 database in build/search.sqlite (porter-stemmed
+title and body, ranked with BM25, title weighted 5x). Front matter fields in
+FACETS are stored as exact-match facets; `folder` is the top-level folder.
+Results come back with highlighted snippets.
+
+Refreshes are incremental: a file is only re-read when its size or mtime
+changed, and only re-indexed when its SHA-256 changed too. Deleted files are
+dropped.
+
+`--export` writes a static JSON shard for client-side search on the docs
+site: document metadata, lengths and a term -> [doc, tf, doc, tf, ...]
+inverted index over lowercase word tokens (no stemming, so a browser can
+tokenize queries the same way and rank with BM25).
+
+Scope: local files only. No network calls.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import sqlite3
+import sys
+import time
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from scripts.artifacts import sha256_file, write_if_changed
+from scripts.catalog import WORKSPACE_ROOT
+from scripts.front_matter import split_header
+from scripts.workspace_index import WorkspaceIndex
+from scripts.yaml_backend import load, normalize_yaml_scalars
+
+DEFAULT_DB = WORKSPACE_ROOT / "build" / "search.sqlite"
+DEFAULT_EXPORT = WORKSPACE_ROOT / "build" / "search_index.json"
+SCHEMA_VERSION = 1
+EXPORT_VERSION = 1
+
+CORPUS_DIRS = ("docs", "sources", "guidance", "knowledge")
+FACETS = ("type", "status", "tags", "refs", "folder")
+TITLE_WEIGHT = 5.0
+SUMMARY_CHARS = 200
+
+_WORD_RE = re.compile(r"\w+")
+_HEADING_RE = re.compile(r"^#\s+(.+)$", re.MULTILINE)
+
+_SCHEMA = f"""
+CREATE TABLE meta(key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE docs(
+    rowid INTEGER PRIMARY KEY,
+    path TEXT UNIQUE NOT NULL,
+    size INTEGER,
+    mtime_ns INTEGER,
+    sha256 TEXT,
+    id TEXT,
+    title TEXT
+);
+CREATE TABLE facets(doc INTEGER NOT NULL, field TEXT NOT NULL, value TEXT NOT NULL);
+CREATE INDEX facets_by_value ON facets(field, value, doc);
+CREATE INDEX facets_by_doc ON facets(doc);
+CREATE VIRTUAL TABLE fts USING fts5(title, body, tokenize='porter unicode61');
+INSERT INTO meta VALUES ('version', '{SCHEMA_VERSION}');
+"""
+
+
+@dataclass(frozen=True)
+class Document:
+    id: str | None
+    title: str
+    body: str
+    # facet -> values
+    facets: dict[str, list[str]]
+
+
+@dataclass(frozen=True)
+class Hit:
+    path: str
+    id: str | None
+    title: str
+    score: float
+    snippet: str
+
+
+def to_fts_query(text: str) -> str:
+    """Plain words to an FTS5 query: all terms required, the last one as a prefix while typing."""
+
+    words = _WORD_RE.findall(text.lower())
+    if not words:
+        return ""
+    terms = [f'"{w}"' for w in words]
+    if not text[-1:].isspace():
+        terms[-1] += "*"
+    return " ".join(terms)
+
+
+def parse_document(rel: str, text: str) -> Document:
+    """Split a Markdown file into title, body and facets; files without front matter only get `folder`."""
+
+    fm: dict = {}
+    body = text
+    header = split_header(text.encode("utf-8"))
+    if header is not None:
+        try:
+            data = load(header.yaml)
+        except Exception:
+            data = None
+        if isinstance(data, dict):
+            fm = normalize_yaml_scalars(data)
+            body = text.encode("utf-8")[header.offset :].decode("utf-8")
+    facets: dict[str, list[str]] = {"folder": [rel.split("/", 1)[0]]}
+    for key in FACETS:
+        value = fm.get(key)
+        values = value if isinstance(value, list) else [value] if value is not None else []
+        if values:
+            facets[key] = [str(v) for v in values]
+    title = fm.get("title")
+    if not isinstance(title, str):
+        heading = _HEADING_RE.search(body)
+        title = heading.group(1).replace("*", "").strip() if heading else rel.rsplit("/", 1)[-1][:-3]
+    return Document(str(fm["id"]) if fm.get("id") else None, title, body, facets)
+
+
+class SearchIndex:
+    """FTS5 index over the corpus folders, refreshed incrementally."""
+
+    def __init__(self, root: Path = WORKSPACE_ROOT, db_path: Path | None = DEFAULT_DB):
+        self.root = root
+        if db_path is None:
+            self.db = sqlite3.connect(":memory:")
+        else:
+            db_path.parent.mkdir(parents=True, exist_ok=True)
+            self.db = sqlite3.connect(db_path)
+        try:
+            version = self.db.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+        except sqlite3.OperationalError:
+            version = None
+        if version != (str(SCHEMA_VERSION),):
+            for table in ("meta", "docs", "facets", "fts"):
+                self.db.execute(f"DROP TABLE IF EXISTS {table}")
+            self.db.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self.db.close()
+
+    def __len__(self) -> int:
+        return self.db.execute("SELECT count(*) FROM docs").fetchone()[0]
+
+    def refresh(self, workspace: WorkspaceIndex | None = None) -> list[str]:
+        """Re-index added and changed files, drop deleted ones; returns the paths that changed."""
+
+        workspace = workspace or WorkspaceIndex.scan(self.root, include=CORPUS_DIRS, with_stat=True)
+        known = {row[0]: row[1:] for row in self.db.execute("SELECT path, rowid, size, mtime_ns, sha256 FROM docs")}
+        changed = []
+        seen = set()
+        with self.db:
+            for rel in workspace.iter_files(CORPUS_DIRS):
+                if not rel.endswith(".md"):
+                    continue
+                seen.add(rel)
+                st = workspace.stats.get(rel) or (self.root / rel).stat()
+                row = known.get(rel)
+                if row is not None and row[1:3] == (st.st_size, st.st_mtime_ns):
+                    continue
+                digest = sha256_file(self.root / rel)
+                if row is not None and row[3] == digest:
+                    self.db.execute(
+                        "UPDATE docs SET size = ?, mtime_ns = ? WHERE rowid = ?", (st.st_size, st.st_mtime_ns, row[0])
+                    )
+                    continue
+                if row is not None:
+                    self._delete(row[0])
+                self._insert(rel, (st.st_size, st.st_mtime_ns, digest))
+                changed.append(rel)
+            removed = [rel for rel in known if rel not in seen]
+            for rel in removed:
+                self._delete(known[rel][0])
+        return changed + removed
+
+    def _insert(self, rel: str, stamp: tuple[int, int, str]) -> None:
+        text = (self.root / rel).read_text(encoding="utf-8", errors="replace")
+        doc = parse_document(rel, text)
+        cursor = self.db.execute(
+            "INSERT INTO docs(path, size, mtime_ns, sha256, id, title) VALUES (?, ?, ?, ?, ?, ?)",
+            (rel, *stamp, doc.id, doc.title),
+        )
+        rowid = cursor.lastrowid
+        self.db.execute("INSERT INTO fts(rowid, title, body) VALUES (?, ?, ?)", (rowid, doc.title, doc.body))
+        self.db.executemany(
+            "INSERT INTO facets VALUES (?, ?, ?)",
+            [(rowid, key, value) for key, values in doc.facets.items() for value in values],
+        )
+
+    def _delete(self, rowid: int) -> None:
+        for table, column in (("docs", "rowid"), ("fts", "rowid"), ("facets", "doc")):
+            self.db.execute(f"DELETE FROM {table} WHERE {column} = ?", (rowid,))
+
+    def _filter_sql(self, filters: dict[str, str | list[str]] | None) -> tuple[str, list]:
+        """SQL condition on docs.rowid for facet filters (AND across fields, OR within one field)."""
+
+        clauses, params = [], []
+        for key, wanted in (filters or {}).items():
+            if key not in FACETS:
+                raise ValueError(f"Unknown facet {key!r}; expected one of {', '.join(FACETS)}")
+            values = [wanted] if isinstance(wanted, str) else list(wanted)
+            marks = ", ".join("?" * len(values))
+            clauses.append(f"d.rowid IN (SELECT doc FROM facets WHERE field = ? AND value IN ({marks}))")
+            params += [key, *values]
+        return " AND ".join(clauses), params
+
+    def search(self, query: str, filters: dict[str, str | list[str]] | None = None, limit: int = 10) -> list[Hit]:
+        """Ranked hits for ``query`` (plain words); an empty query lists documents matching the filters."""
+
+        where, params = self._filter_sql(filters)
+        fts_query = to_fts_query(query)
+        if not fts_query:
+            sql = f"SELECT d.path, d.id, d.title, 0.0, '' FROM docs d {'WHERE ' + where if where else ''}"
+            rows = self.db.execute(sql + " ORDER BY d.path LIMIT ?", (*params, limit))
+        else:
+            sql = (
+                f"SELECT d.path, d.id, d.title, -bm25(fts, {TITLE_WEIGHT}, 1.0) AS score,"
+                " snippet(fts, 1, '**', '**', ' … ', 16)"
+                " FROM fts JOIN docs d ON d.rowid = fts.rowid WHERE fts MATCH ?"
+            )
+            sql += f" AND {where}" if where else ""
+            rows = self.db.execute(sql + " ORDER BY score DESC LIMIT ?", (fts_query, *params, limit))
+        return [Hit(*row) for row in rows]
+
+    def facet_counts(self, query: str = "", filters: dict[str, str | list[str]] | None = None) -> dict[str, Counter]:
+        """Per-facet value counts over the documents matching ``query`` and ``filters``."""
+
+        where, params = self._filter_sql(filters)
+        fts_query = to_fts_query(query)
+        conditions = [where] if where else []
+        if fts_query:
+            conditions.append("d.rowid IN (SELECT rowid FROM fts WHERE fts MATCH ?)")
+            params.append(fts_query)
+        sql = "SELECT f.field, f.value, count(*) FROM facets f JOIN docs d ON d.rowid = f.doc"
+        sql += f" WHERE {' AND '.join(conditions)}" if conditions else ""
+        counts: dict[str, Counter] = {key: Counter() for key in FACETS}
+        for key, value, count in self.db.execute(sql + " GROUP BY f.field, f.value", params):
+            counts[key][value] = count
+        return counts
+
+    def export(self) -> dict:
+        """Static index for client-side search (see the module docstring)."""
+
+        docs, lengths = [], []
+        postings: dict[str, list[int]] = {}
+        facets: dict[int, dict[str, list[str]]] = {}
+        for doc, key, value in self.db.execute("SELECT doc, field, value FROM facets ORDER BY doc, field, rowid"):
+            facets.setdefault(doc, {}).setdefault(key, []).append(value)
+        rows = self.db.execute(
+            "SELECT d.rowid, d.path, d.id, d.title, fts.body FROM docs d JOIN fts ON fts.rowid = d.rowid"
+            " ORDER BY d.path"
+        )
+        for number, (rowid, path, doc_id, title, body) in enumerate(rows):
+            entry = {"path": path, "id": doc_id, "title": title, **facets.get(rowid, {})}
+            entry["summary"] = " ".join(body.split())[:SUMMARY_CHARS]
+            docs.append(entry)
+            words = _WORD_RE.findall(f"{title} {body}".lower())
+            lengths.append(len(words))
+            for term, tf in sorted(Counter(words).items()):
+                postings.setdefault(term, []).extend((number, tf))
+        return {
+            "version": EXPORT_VERSION,
+            "docs": docs,
+            "lengths": lengths,
+            "avgdl": round(sum(lengths) / len(lengths), 3) if lengths else 0,
+            "terms": dict(sorted(postings.items())),
+        }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Search docs, sources, guidance and knowledge.")
+    parser.add_argument("query", nargs="*", help="Words to search for (all must match)")
+    for key in FACETS:
+        flag = {"tags": "tag", "refs": "ref"}.get(key, key)
+        parser.add_argument(f"--{flag}", dest=key, action="append", help=f"Filter on the {key} facet (repeatable)")
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--facets", action="store_true", help="Print facet counts for the matching documents")
+    parser.add_argument("--export", nargs="?", const=DEFAULT_EXPORT, type=Path, help="Write the static JSON index")
+    parser.add_argument("--db", type=Path, default=DEFAULT_DB)
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    index = SearchIndex(WORKSPACE_ROOT, args.db)
+    try:
+        changed = index.refresh()
+        refreshed = (time.perf_counter() - start) * 1000
+        if args.export:
+            payload = json.dumps(index.export(), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+            state = "wrote" if write_if_changed(args.export, payload) else "unchanged"
+            print(f"{state} {args.export} ({len(payload) // 1024} KiB)")
+        query = " ".join(args.query)
+        filters = {key: getattr(args, key) for key in FACETS if getattr(args, key)}
+        if not query and not filters and not args.facets:
+            if not args.export:
+                print(f"{len(index)} documents indexed, {len(changed)} changed ({refreshed:.0f} ms)")
+            return 0
+
+        start = time.perf_counter()
+        hits = index.search(query, filters, args.limit)
+        elapsed = (time.perf_counter() - start) * 1000
+        for rank, hit in enumerate(hits, start=1):
+            print(f"{rank:3}. {hit.path}  {hit.title}")
+            if hit.snippet:
+                print(f"     {' '.join(hit.snippet.split())}")
+        print(f"{len(hits)} result(s) in {elapsed:.1f} ms")
+        if args.facets:
+            for key, counts in index.facet_counts(query, filters).items():
+                if counts:
+                    print(f"{key}: " + ", ".join(f"{value} ({n})" for value, n in counts.most_common(10)))
+        return 0
+    finally:
+        index.close()
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
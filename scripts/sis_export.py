@@ -0,0 +1,324 @@
+"""Streaming SIS bulk-export writers for rendered CoL comments.
+
+Usage:
+  python scripts/sis_export.py bench --rows 1000000 --format csv
+  python scripts/sis_export.py bench --rows 1000000 --format xml --max-bytes 8000000
+  python scripts/sis_export.py verify build/report_batch
+
+Records are encoded and appended one at a time, so an export never holds the
+batch in memory. Output is split into numbered chunk files that stay under a
+byte limit (SIS import tools commonly cap upload size). Each chunk is hashed
+while it is written and a `manifest.json` lists every chunk with its row
+count, size and SHA-256.
+
+The CSV and XML layouts are a neutral interchange shape. Actual import
+formats are board-configured and vendor-specific (see
+knowledge/entities/entity.tool.edsembli.md), so map columns at import time.
+
+Scope: local files only. No network calls.
+"""
+
+from __future__ import annotations
+
+import abc
+import argparse
+import csv
+import hashlib
+import io
+import json
+import os
+import time
+from collections.abc import Iterable, Iterator
+from functools import cached_property
+from pathlib import Path
+from xml.sax.saxutils import escape, quoteattr
+
+EXPORT_FIELDS = ["class_id", "child_id", "frame_id", "section", "template_id", "text"]
+DEFAULT_MAX_BYTES = 10 * 1024 * 1024
+MANIFEST_NAME = "manifest.json"
+MANIFEST_VERSION = 1
+
+
+class ChunkedExportWriter(abc.ABC):
+    """Base writer: chunk rollover, incremental hashing and the manifest."""
+
+    format = ""
+    extension = ""
+
+    def __init__(
+        self,
+        out_dir: Path,
+        fields: list[str] | None = None,
+        prefix: str = "comments",
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        max_rows: int | None = None,
+    ):
+        self.out_dir = Path(out_dir)
+        self.fields = list(fields or EXPORT_FIELDS)
+        self.prefix = prefix
+        self.max_bytes = max_bytes
+        self.max_rows = max_rows
+        self.chunks: list[dict] = []
+        self.rows = 0
+
+        self._handle = None
+        self._hash = None
+        self._chunk_bytes = 0
+        self._chunk_rows = 0
+        self._footer = self._encode_footer()
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        # Stale chunks from a previous, larger (or other-format) export would otherwise linger
+        for extension in sorted({writer.extension for writer in WRITERS.values()} | {self.extension}):
+            for stale in self.out_dir.glob(f"{self.prefix}-*.{extension}"):
+                stale.unlink()
+
+    # --- format hooks -------------------------------------------------
+
+    def _encode_header(self) -> bytes:
+        return b""
+
+    def _encode_footer(self) -> bytes:
+        return b""
+
+    @abc.abstractmethod
+    def _encode_row(self, row: dict) -> bytes: ...
+
+    @cached_property
+    def _header(self) -> bytes:
+        return self._encode_header()
+
+    # --- chunk handling -----------------------------------------------
+
+    def _chunk_path(self, number: int) -> Path:
+        return self.out_dir / f"{self.prefix}-{number:05d}.{self.extension}"
+
+    def _emit(self, data: bytes) -> None:
+        self._handle.write(data)
+        self._hash.update(data)
+        self._chunk_bytes += len(data)
+
+    def _open_chunk(self) -> None:
+        self._handle = self._chunk_path(len(self.chunks) + 1).open("wb")
+        self._hash = hashlib.sha256()
+        self._chunk_bytes = 0
+        self._chunk_rows = 0
+        self._emit(self._header)
+
+    def _close_chunk(self) -> None:
+        if self._handle is None:
+            return
+        self._emit(self._footer)
+        path = Path(self._handle.name)
+        self._handle.close()
+        self.chunks.append(
+            {
+                "file": path.name,
+                "rows": self._chunk_rows,
+                "bytes": self._chunk_bytes,
+                "sha256": self._hash.hexdigest(),
+            }
+        )
+        self._handle = None
+
+    def write(self, row: dict) -> None:
+        data = self._encode_row(row)
+        if (
+            self._handle is not None
+            and self._chunk_rows
+            and (
+                self._chunk_bytes + len(data) + len(self._footer) > self.max_bytes
+                or (self.max_rows is not None and self._chunk_rows >= self.max_rows)
+            )
+        ):
+            self._close_chunk()
+        if self._handle is None:
+            # Checked before opening, so a record that can never fit leaves no header-only chunk behind
+            if len(self._header) + len(data) + len(self._footer) > self.max_bytes:
+                raise ValueError(f"Record of {len(data)} bytes does not fit in a {self.max_bytes}-byte chunk")
+            self._open_chunk()
+        self._emit(data)
+        self._chunk_rows += 1
+        self.rows += 1
+
+    def write_many(self, rows: Iterable[dict]) -> None:
+        for row in rows:
+            self.write(row)
+
+    def close(self) -> dict:
+        """Finish the open chunk and write the manifest atomically."""
+
+        self._close_chunk()
+        manifest = {
+            "version": MANIFEST_VERSION,
+            "format": self.format,
+            "fields": self.fields,
+            "rows": self.rows,
+            "max_bytes": self.max_bytes,
+            "chunks": self.chunks,
+        }
+        manifest_path = self.out_dir / MANIFEST_NAME
+        tmp_path = manifest_path.with_suffix(".json.tmp")
+        tmp_path.write_text(json.dumps(manifest, indent=2) + "\n", encoding="utf-8")
+        os.replace(tmp_path, manifest_path)
+        return manifest
+
+    def __enter__(self) -> ChunkedExportWriter:
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+        elif self._handle is not None:
+            self._handle.close()
+
+
+class CsvExportWriter(ChunkedExportWriter):
+    """UTF-8 CSV chunks, each with its own header row."""
+
+    format = "csv"
+    extension = "csv"
+
+    def __init__(self, *args, **kwargs):
+        self._buffer = io.StringIO()
+        super().__init__(*args, **kwargs)
+        self._csv = csv.DictWriter(self._buffer, fieldnames=self.fields, extrasaction="ignore", lineterminator="\n")
+
+    def _take(self) -> bytes:
+        data = self._buffer.getvalue().encode("utf-8")
+        self._buffer.seek(0)
+        self._buffer.truncate()
+        return data
+
+    def _encode_header(self) -> bytes:
+        self._csv.writeheader()
+        return self._take()
+
+    def _encode_row(self, row: dict) -> bytes:
+        self._csv.writerow(row)
+        return self._take()
+
+
+class XmlExportWriter(ChunkedExportWriter):
+    """UTF-8 XML chunks; each chunk is a complete document."""
+
+    format = "xml"
+    extension = "xml"
+    text_field = "text"
+
+    def _encode_header(self) -> bytes:
+        return b'<?xml version="1.0" encoding="UTF-8"?>\n<col_comments>\n'
+
+    def _encode_footer(self) -> bytes:
+        return b"</col_comments>\n"
+
+    def _encode_row(self, row: dict) -> bytes:
+        attrs = " ".join(
+            f"{name}={quoteattr(str(row.get(name, '')))}" for name in self.fields if name != self.text_field
+        )
+        text = escape(str(row.get(self.text_field, "")))
+        return f"  <comment {attrs}>{text}</comment>\n".encode()
+
+
+WRITERS: dict[str, type[ChunkedExportWriter]] = {
+    CsvExportWriter.format: CsvExportWriter,
+    XmlExportWriter.format: XmlExportWriter,
+}
+
+
+def open_export_writer(fmt: str, out_dir: Path, **kwargs) -> ChunkedExportWriter:
+    try:
+        writer_cls = WRITERS[fmt]
+    except KeyError:
+        raise ValueError(f"Unknown export format: {fmt} (expected one of {sorted(WRITERS)})") from None
+    return writer_cls(out_dir, **kwargs)
+
+
+def verify_manifest(out_dir: Path) -> list[str]:
+    """Re-hash every chunk listed in the manifest and report mismatches."""
+
+    manifest = json.loads((Path(out_dir) / MANIFEST_NAME).read_text(encoding="utf-8"))
+    errors: list[str] = []
+    for chunk in manifest.get("chunks", []):
+        path = Path(out_dir) / chunk["file"]
+        if not path.exists():
+            errors.append(f"Missing chunk: {chunk['file']}")
+            continue
+        digest = hashlib.sha256()
+        size = 0
+        with path.open("rb") as handle:
+            for block in iter(lambda: handle.read(1 << 20), b""):
+                digest.update(block)
+                size += len(block)
+        if size != chunk["bytes"]:
+            errors.append(f"{chunk['file']}: size {size} != manifest {chunk['bytes']}")
+        if digest.hexdigest() != chunk["sha256"]:
+            errors.append(f"{chunk['file']}: checksum mismatch")
+    return errors
+
+
+def synthetic_comments(rows: int) -> Iterator[dict]:
+    """Yield ``rows`` synthetic rendered comments (no real data)."""
+
+    sections = ("key_learning", "growth", "next_steps")
+    frames = ("frame.belonging", "frame.self_regulation", "frame.literacy_math", "frame.problem_solving")
+    for n in range(rows):
+        child = n // 12
+        frame = frames[n // 3 % 4]
+        section = sections[n % 3]
+        yield {
+            "class_id": f"class.{child // 30 + 1:05d}",
+            "child_id": f"class.{child // 30 + 1:05d}.child.{child % 30 + 1:03d}",
+            "frame_id": frame,
+            "section": section,
+            "template_id": f"template.comment.{frame[6:]}.{section}.0{n % 3 + 1}",
+            "text": "Avery contributes to our learning community in meaningful ways. "
+            "They do this by helping a classmate find the right crayon for their drawing & sharing tools.",
+        }
+
+
+def _bench(rows: int, fmt: str, out_dir: Path, max_bytes: int) -> int:
+    started = time.perf_counter()
+    with open_export_writer(fmt, out_dir, max_bytes=max_bytes) as writer:
+        writer.write_many(synthetic_comments(rows))
+    elapsed = time.perf_counter() - started
+    total_bytes = sum(c["bytes"] for c in writer.chunks)
+    print(f"Wrote {writer.rows} {fmt.upper()} rows in {len(writer.chunks)} chunk(s) to {out_dir}")
+    print(f"  {elapsed:.2f} s, {writer.rows / elapsed:,.0f} rows/s, {total_bytes / elapsed / 1e6:.1f} MB/s")
+    try:
+        import resource
+
+        print(f"  Peak RSS: {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.0f} MB")
+    except ImportError:  # pragma: no cover - Windows
+        pass
+    return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Chunked SIS export writers for rendered comments.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    bench = sub.add_parser("bench", help="Write a synthetic export and report throughput")
+    bench.add_argument("--rows", type=int, default=1_000_000)
+    bench.add_argument("--format", choices=sorted(WRITERS), default="csv")
+    bench.add_argument("--max-bytes", type=int, default=DEFAULT_MAX_BYTES)
+    bench.add_argument("--out", type=Path, default=Path(__file__).resolve().parents[1] / "build" / "sis_export_bench")
+
+    verify = sub.add_parser("verify", help="Check chunk checksums against manifest.json")
+    verify.add_argument("out_dir", type=Path)
+
+    args = parser.parse_args(argv)
+
+    if args.command == "bench":
+        return _bench(args.rows, args.format, args.out, args.max_bytes)
+
+    errors = verify_manifest(args.out_dir)
+    if errors:
+        print("EXPORT VERIFY FAILED\n")
+        print("\n".join(f"- {e}" for e in errors))
+        return 1
+    print("Export OK")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
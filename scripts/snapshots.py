@@ -0,0 +1,247 @@
+"""Append-only, content-addressed history of matrix and coverage results.
+
+Usage:
+  python scripts/snapshots.py record --label v0.2.0
+  python scripts/snapshots.py list
+  python scripts/snapshots.py trend
+  python scripts/snapshots.py changes --indicator indicator.belonging.relationships
+
+`generate_matrix.py` overwrites the matrix on every run. This store keeps
+every recorded version without duplicating data:
+
+  <store>/segments/<n>.parquet   Matrix rows not seen in any earlier snapshot,
+                                 keyed by `row_hash` (SHA-256 of the row
+                                 without the volatile `generated` column).
+  <store>/snapshots/<id>.json    Snapshot manifest: row hashes grouped by
+                                 segment, plus per-frame coverage. `<id>` is
+                                 the SHA-256 of the manifest content, so an
+                                 unchanged matrix maps to the same snapshot.
+  <store>/index.jsonl            One line per `record` call (label, commit,
+                                 recorded timestamp, snapshot id).
+
+Nothing is rewritten: `record` only adds a segment (when there are new
+rows), a manifest (when the content is new) and an index line. Trend queries
+read manifests for coverage and only the requested columns of the segments
+a snapshot references.
+
+Scope: local files only. No network calls.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import subprocess
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from scripts.catalog import WORKSPACE_ROOT, load_catalog
+from scripts.coverage import CoverageMatrices, compute_coverage
+
+DEFAULT_STORE = WORKSPACE_ROOT / "datasets" / "snapshots"
+MATRIX_CSV = WORKSPACE_ROOT / "datasets" / "traceability" / "matrix.csv"
+VOLATILE_COLUMNS = ("generated",)
+
+
+def row_hash(row: dict) -> str:
+    payload = json.dumps(row, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+def load_matrix_rows(csv_path: Path = MATRIX_CSV) -> list[dict]:
+    """Matrix rows without volatile columns, with `ref_ids` decoded to a list."""
+
+    df = pd.read_csv(csv_path, dtype=str, keep_default_na=False)
+    rows = []
+    for record in df.drop(columns=[c for c in VOLATILE_COLUMNS if c in df.columns]).to_dict("records"):
+        record["ref_ids"] = json.loads(record["ref_ids"]) if record.get("ref_ids") else []
+        rows.append(record)
+    return rows
+
+
+def coverage_by_frame(root: Path = WORKSPACE_ROOT) -> dict[str, dict[str, int]]:
+    report = compute_coverage(CoverageMatrices.from_catalog(load_catalog(root)))
+    return {frame: {"covered": c, "total": t} for frame, (c, t) in sorted(report.by_frame.items())}
+
+
+def git_commit(root: Path = WORKSPACE_ROOT) -> str | None:
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=root, capture_output=True, text=True, check=True, timeout=10
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return result.stdout.strip() or None
+
+
+class SnapshotStore:
+    def __init__(self, root: Path = DEFAULT_STORE):
+        self.root = Path(root)
+        self.segments_dir = self.root / "segments"
+        self.snapshots_dir = self.root / "snapshots"
+        self.index_path = self.root / "index.jsonl"
+
+    # -- writing ---------------------------------------------------------
+
+    def row_locations(self) -> dict[str, str]:
+        """Map every stored row hash to the segment file holding it."""
+
+        locations: dict[str, str] = {}
+        for path in sorted(self.segments_dir.glob("*.parquet")):
+            for h in pq.read_table(path, columns=["row_hash"]).column("row_hash").to_pylist():
+                locations.setdefault(h, path.name)
+        return locations
+
+    def record(
+        self,
+        rows: list[dict],
+        coverage: dict[str, dict[str, int]],
+        label: str,
+        commit: str | None = None,
+    ) -> str:
+        """Store a snapshot and return its ID. Rows already stored are not written again."""
+
+        self.segments_dir.mkdir(parents=True, exist_ok=True)
+        self.snapshots_dir.mkdir(parents=True, exist_ok=True)
+
+        hashed = [(row_hash(r), r) for r in rows]
+        location = self.row_locations()
+        new_rows = {h: r for h, r in hashed if h not in location}
+        if new_rows:
+            name = f"{len(set(location.values())) + 1:06d}.parquet"
+            table = pa.Table.from_pylist([{"row_hash": h, **r} for h, r in new_rows.items()])
+            tmp = self.segments_dir / (name + ".tmp")
+            pq.write_table(table, tmp)
+            os.replace(tmp, self.segments_dir / name)
+            location.update(dict.fromkeys(new_rows, name))
+
+        segments: dict[str, list[str]] = {}
+        for h, _ in hashed:
+            segments.setdefault(location[h], []).append(h)
+        manifest = {"coverage": coverage, "rows": len(hashed), "segments": dict(sorted(segments.items()))}
+        payload = json.dumps(manifest, sort_keys=True, separators=(",", ":")).encode("utf-8")
+        snapshot_id = hashlib.sha256(payload).hexdigest()
+        manifest_path = self.snapshots_dir / f"{snapshot_id}.json"
+        if not manifest_path.exists():
+            _write_atomic(manifest_path, payload)
+
+        entry = {
+            "snapshot": snapshot_id,
+            "label": label,
+            "commit": commit,
+            "recorded": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        }
+        with self.index_path.open("a", encoding="utf-8") as handle:
+            handle.write(json.dumps(entry, sort_keys=True) + "\n")
+        return snapshot_id
+
+    # -- reading ---------------------------------------------------------
+
+    def entries(self) -> list[dict]:
+        if not self.index_path.exists():
+            return []
+        lines = self.index_path.read_text(encoding="utf-8").splitlines()
+        return [json.loads(line) for line in lines if line.strip()]
+
+    def manifest(self, snapshot_id: str) -> dict:
+        return json.loads((self.snapshots_dir / f"{snapshot_id}.json").read_text(encoding="utf-8"))
+
+    def rows(self, snapshot_id: str, columns: list[str]) -> pd.DataFrame:
+        """Read only ``columns`` of the rows in a snapshot."""
+
+        frames = []
+        for segment, hashes in self.manifest(snapshot_id)["segments"].items():
+            table = pq.read_table(self.segments_dir / segment, columns=["row_hash", *columns])
+            df = table.to_pandas()
+            frames.append(df[df["row_hash"].isin(set(hashes))])
+        if not frames:
+            return pd.DataFrame(columns=columns)
+        return pd.concat(frames, ignore_index=True)[columns]
+
+    def coverage_trend(self) -> pd.DataFrame:
+        """Coverage per frame for every recorded snapshot, in record order."""
+
+        records = []
+        for entry in self.entries():
+            for frame, counts in self.manifest(entry["snapshot"])["coverage"].items():
+                total = counts["total"]
+                records.append(
+                    {
+                        "label": entry["label"],
+                        "recorded": entry["recorded"],
+                        "frame_id": frame,
+                        "covered": counts["covered"],
+                        "total": total,
+                        "pct": round(counts["covered"] / total * 100, 1) if total else 0.0,
+                    }
+                )
+        return pd.DataFrame(records, columns=["label", "recorded", "frame_id", "covered", "total", "pct"])
+
+    def template_changes(self, indicator_id: str | None = None) -> pd.DataFrame:
+        """Templates added or removed per indicator between consecutive snapshots."""
+
+        records = []
+        previous: dict[str, set[str]] | None = None
+        prev_label = None
+        for entry in self.entries():
+            df = self.rows(entry["snapshot"], ["indicator_id", "template_id"])
+            if indicator_id is not None:
+                df = df[df["indicator_id"] == indicator_id]
+            current = {ind: set(group["template_id"]) for ind, group in df.groupby("indicator_id")}
+            if previous is not None:
+                for ind in sorted(set(current) | set(previous)):
+                    before, after = previous.get(ind, set()), current.get(ind, set())
+                    for tid in sorted(after - before):
+                        records.append((prev_label, entry["label"], ind, tid, "added"))
+                    for tid in sorted(before - after):
+                        records.append((prev_label, entry["label"], ind, tid, "removed"))
+            previous, prev_label = current, entry["label"]
+        return pd.DataFrame(records, columns=["from_label", "to_label", "indicator_id", "template_id", "change"])
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Record and query matrix/coverage snapshots.")
+    parser.add_argument("--store", type=Path, default=DEFAULT_STORE, help="Snapshot store directory")
+    sub = parser.add_subparsers(dest="command", required=True)
+    rec = sub.add_parser("record", help="Record the current matrix and coverage")
+    rec.add_argument("--label", required=True, help="Release or milestone label")
+    rec.add_argument("--commit", help="Commit hash (defaults to git HEAD)")
+    sub.add_parser("list", help="List recorded snapshots")
+    sub.add_parser("trend", help="Coverage per frame over time")
+    changes = sub.add_parser("changes", help="Templates added/removed per indicator")
+    changes.add_argument("--indicator", help="Limit to one indicator ID")
+    args = parser.parse_args()
+
+    store = SnapshotStore(args.store)
+    if args.command == "record":
+        rows = load_matrix_rows()
+        snapshot_id = store.record(rows, coverage_by_frame(), args.label, args.commit or git_commit())
+        print(f"Recorded {args.label}: snapshot {snapshot_id[:12]} ({len(rows)} rows)")
+    elif args.command == "list":
+        for entry in store.entries():
+            print(f"{entry['recorded']}  {entry['snapshot'][:12]}  {entry['label']}  {entry.get('commit') or '-'}")
+    elif args.command == "trend":
+        print(store.coverage_trend().to_string(index=False))
+    else:
+        df = store.template_changes(args.indicator)
+        print(df.to_string(index=False) if len(df) else "No template changes between snapshots")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
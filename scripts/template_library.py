@@ -0,0 +1,213 @@
+"""Load the comment template library from one file or many shards.
+
+Layouts:
+  templates/comment_templates.yaml   single collection (ADR 0003), used when
+                                     there is no manifest
+  templates/manifest.yaml            sharded library (ADR 0006): lists shard
+                                     files or globs relative to templates/
+
+Manifest format:
+  shards:
+    - comment_templates.yaml
+    - boards/**/*.yaml
+    - frames/*.yaml
+
+Every shard has the same shape as the single file (a top-level `templates:`
+list) and is checked against schemas/comment_templates.schema.json.
+
+Loading:
+- Each shard is parsed and schema-validated on its own, in a process pool
+  when there are many shards that are not cached.
+- Results are cached per shard in build/cache/templates/, keyed by SHA-256
+  of the shard bytes and the schema, so a one-line change re-parses one
+  shard only.
+- Shards are merged in manifest order with global duplicate-ID detection
+  (across and within shards).
+
+Usage:
+  python scripts/template_library.py          # summary, exit 1 on schema errors or duplicate IDs
+  python scripts/template_library.py --no-cache
+
+Scope: local files only. No network calls.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from scripts.artifacts import write_if_changed
+from scripts.loaders import SCHEMAS_DIR, load_yaml, validate
+
+WORKSPACE_ROOT = Path(__file__).resolve().parents[1]
+
+SINGLE_FILE = "comment_templates.yaml"
+MANIFEST = "manifest.yaml"
+SCHEMA_PATH = SCHEMAS_DIR / "comment_templates.schema.json"
+DEFAULT_CACHE = WORKSPACE_ROOT / "build" / "cache" / "templates"
+CACHE_VERSION = 1
+# Below this many uncached shards the process pool is not worth starting
+PARALLEL_THRESHOLD = 8
+
+
+@dataclass
+class Shard:
+    path: str
+    templates: list[dict]
+    # Schema messages, or the load error when the shard could not be parsed
+    messages: list[str]
+    cached: bool = False
+
+
+@dataclass
+class TemplateLibrary:
+    """Merged templates keyed by ID (first occurrence wins), with per-shard results."""
+
+    templates: dict[str, dict] = field(default_factory=dict)
+    # template ID -> shard path (relative to the workspace root)
+    sources: dict[str, str] = field(default_factory=dict)
+    shards: list[Shard] = field(default_factory=list)
+    # template ID -> every shard path defining it, for IDs defined more than once
+    duplicates: dict[str, list[str]] = field(default_factory=dict)
+
+    @property
+    def all_templates(self) -> list[dict]:
+        """Every template in load order, duplicates included."""
+
+        return [tmpl for shard in self.shards for tmpl in shard.templates]
+
+    @property
+    def errors(self) -> list[str]:
+        errors = [f"{shard.path}: {m}" for shard in self.shards for m in shard.messages]
+        errors += [f"Duplicate template ID {tid} in {', '.join(paths)}" for tid, paths in self.duplicates.items()]
+        return errors
+
+
+def shard_paths(root: Path = WORKSPACE_ROOT) -> list[Path]:
+    """Shard files in load order: manifest entries (globs expanded, sorted) or the single file."""
+
+    templates_dir = root / "templates"
+    manifest_path = templates_dir / MANIFEST
+    if not manifest_path.exists():
+        return [templates_dir / SINGLE_FILE]
+    entries = load_yaml(manifest_path).get("shards") or []
+    paths: dict[Path, None] = {}
+    for entry in entries:
+        matches = sorted(templates_dir.glob(entry)) if any(c in entry for c in "*?[") else [templates_dir / entry]
+        for path in matches:
+            if path.name != MANIFEST:
+                paths.setdefault(path, None)
+    return list(paths)
+
+
+def _cache_key(data: bytes, schema: bytes) -> str:
+    digest = hashlib.sha256(f"v{CACHE_VERSION}\0".encode())
+    digest.update(hashlib.sha256(schema).digest())
+    digest.update(data)
+    return digest.hexdigest()
+
+
+def load_shard(path: Path, schema_path: Path = SCHEMA_PATH) -> tuple[list[dict], list[str]]:
+    """Parse and schema-validate one shard; returns (templates, messages)."""
+
+    try:
+        doc = load_yaml(path)
+    except Exception as exc:
+        return [], [f"could not be loaded: {exc}"]
+    messages = validate(doc, schema_path)
+    templates = [t for t in doc.get("templates") or [] if isinstance(t, dict)]
+    return templates, messages
+
+
+def _load_shard_job(item: tuple[str, str]) -> tuple[list[dict], list[str]]:
+    path, schema_path = item
+    return load_shard(Path(path), Path(schema_path))
+
+
+def load_library(
+    root: Path = WORKSPACE_ROOT,
+    cache_dir: Path | None = DEFAULT_CACHE,
+    jobs: int = os.cpu_count() or 1,
+    schema_path: Path = SCHEMA_PATH,
+) -> TemplateLibrary:
+    """Load every shard (cached by content hash) and merge them; ``cache_dir=None`` disables the cache."""
+
+    schema = schema_path.read_bytes()
+    shards: list[Shard | None] = []
+    pending: list[tuple[int, Path, str | None]] = []
+    for path in shard_paths(root):
+        rel = path.relative_to(root).as_posix()
+        if not path.exists():
+            shards.append(Shard(rel, [], ["listed in the manifest but missing"]))
+            continue
+        key = _cache_key(path.read_bytes(), schema) if cache_dir is not None else None
+        cache_file = cache_dir / f"{key}.json" if key else None
+        if cache_file is not None and cache_file.exists():
+            cached = json.loads(cache_file.read_text(encoding="utf-8"))
+            shards.append(Shard(rel, cached["templates"], cached["messages"], cached=True))
+            continue
+        pending.append((len(shards), path, key))
+        shards.append(None)
+
+    items = [(str(path), str(schema_path)) for _, path, _ in pending]
+    if len(items) >= PARALLEL_THRESHOLD and jobs > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            loaded = list(pool.map(_load_shard_job, items))
+    else:
+        loaded = [_load_shard_job(item) for item in items]
+    for (slot, path, key), (templates, messages) in zip(pending, loaded, strict=True):
+        shards[slot] = Shard(path.relative_to(root).as_posix(), templates, messages)
+        if key is not None:
+            payload = json.dumps({"templates": templates, "messages": messages}, separators=(",", ":"))
+            write_if_changed(cache_dir / f"{key}.json", payload.encode("utf-8"))
+
+    return merge_shards(shards)
+
+
+def merge_shards(shards: list[Shard]) -> TemplateLibrary:
+    """Merge shards in load order; the first definition of an ID wins, later ones are duplicates."""
+
+    library = TemplateLibrary(shards=shards)
+    seen: dict[str, list[str]] = {}
+    for shard in shards:
+        for tmpl in shard.templates:
+            tid = tmpl.get("id")
+            if not isinstance(tid, str):
+                continue
+            seen.setdefault(tid, []).append(shard.path)
+            if tid not in library.templates:
+                library.templates[tid] = tmpl
+                library.sources[tid] = shard.path
+    library.duplicates = {tid: paths for tid, paths in seen.items() if len(paths) > 1}
+    return library
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Load and check the (optionally sharded) template library.")
+    parser.add_argument("--no-cache", action="store_true", help="Ignore the per-shard cache")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="Worker processes for uncached shards")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    library = load_library(cache_dir=None if args.no_cache else DEFAULT_CACHE, jobs=args.jobs)
+    elapsed = (time.perf_counter() - start) * 1000
+    cached = sum(shard.cached for shard in library.shards)
+    print(
+        f"{len(library.templates)} templates from {len(library.shards)} shard(s) ({cached} cached) in {elapsed:.0f} ms"
+    )
+    for error in library.errors:
+        print(f"  - {error}")
+    return 1 if library.errors else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
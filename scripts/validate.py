@@ -9,42 +9,20 @@ from __future__ import annotations
 import csv
 import json
 import re
+import sys
 from dataclasses import dataclass, field
-from datetime import date, datetime
+from datetime import date
 from pathlib import Path
-from urllib.parse import unquote
 
-from jsonschema import Draft202012Validator
-from ruamel.yaml import YAML
-
-WORKSPACE_ROOT = Path(__file__).resolve().parents[1]
-SCHEMAS_DIR = WORKSPACE_ROOT / "schemas"
-
-YAML_LOADER = YAML(typ="safe")
-
-
-def normalize_yaml_scalars(value):
-    if isinstance(value, (date, datetime)):
-        return value.date().isoformat() if isinstance(value, datetime) else value.isoformat()
-    if isinstance(value, dict):
-        return {k: normalize_yaml_scalars(v) for k, v in value.items()}
-    if isinstance(value, list):
-        return [normalize_yaml_scalars(v) for v in value]
-    return value
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 
+from scripts.evidence_body import EvidenceBody, check_body_indicators, parse_evidence_body
+from scripts.front_matter import front_matter_data, read_body, read_front_matter, read_header
+from scripts.loaders import SCHEMAS_DIR, load_yaml, validate
+from scripts.template_library import SCHEMA_PATH, load_library
+from scripts.workspace_index import WorkspaceIndex
 
-def load_json(path: Path) -> dict:
-    return json.loads(path.read_text(encoding="utf-8"))
-
-
-def load_yaml(path: Path) -> dict:
-    with path.open("r", encoding="utf-8") as handle:
-        data = YAML_LOADER.load(handle)
-    if data is None:
-        raise ValueError(f"Empty YAML file: {path}")
-    if not isinstance(data, dict):
-        raise TypeError(f"Expected YAML mapping at root: {path}")
-    return normalize_yaml_scalars(data)
+WORKSPACE_ROOT = Path(__file__).resolve().parents[1]
 
 
 _FRONT_MATTER_RE = re.compile(r"\A---\s*\n(.*?)\n---\s*\n", re.DOTALL)
@@ -61,30 +39,23 @@ class ValidationContext:
     indicator_to_frame: dict[str, str] = field(default_factory=dict)
     templates_raw: list[dict] = field(default_factory=list)
     evidence_raw: list[dict] = field(default_factory=list)
+    evidence_bodies: dict[str, EvidenceBody] = field(default_factory=dict)
 
 
-def read_front_matter(markdown_path: Path) -> dict:
-    text = markdown_path.read_text(encoding="utf-8")
+def parse_front_matter(text: str, source: Path) -> tuple[dict, int]:
+    """Parse front matter from Markdown text; returns (data, body offset)."""
     match = _FRONT_MATTER_RE.match(text)
     if not match:
-        raise ValueError(f"Missing YAML front matter: {markdown_path}")
-    yaml_text = match.group(1)
-    data = YAML_LOADER.load(yaml_text)
-    if not isinstance(data, dict):
-        raise TypeError(f"Front matter must be a mapping: {markdown_path}")
-    return normalize_yaml_scalars(data)
-
-
-def validate(instance: dict, schema_path: Path) -> list[str]:
-    schema = load_json(schema_path)
-    validator = Draft202012Validator(schema)
-    errors = sorted(validator.iter_errors(instance), key=lambda e: e.path)
-    messages: list[str] = []
-    for error in errors:
-        loc = "/".join(str(p) for p in error.path)
-        prefix = f"{loc}: " if loc else ""
-        messages.append(prefix + error.message)
-    return messages
+        raise ValueError(f"Missing YAML front matter: {source}")
+    return front_matter_data(match.group(1), source), match.end()
+
+
+def read_evidence_pattern(markdown_path: Path) -> tuple[dict, EvidenceBody]:
+    """Read an evidence pattern's front matter, then its structured body from the header offset."""
+    header = read_header(markdown_path)
+    fm = front_matter_data(header.yaml, markdown_path)
+    pattern_id = fm.get("id") if isinstance(fm.get("id"), str) else markdown_path.stem
+    return fm, parse_evidence_body(read_body(markdown_path, header.offset), pattern_id, header.line)
 
 
 _MARKDOWN_LINK_RE = re.compile(r"!?\[[^\]]*\]\(([^)]+)\)")
@@ -121,34 +92,46 @@ def iter_relative_markdown_links(markdown_text: str) -> list[str]:
     return targets
 
 
-def check_markdown_links(md_path: Path) -> list[str]:
-    """Validate that relative markdown links resolve to existing files."""
+_WORKSPACE_INDEX: WorkspaceIndex | None = None
+
+
+def workspace_index() -> WorkspaceIndex:
+    """Index of the workspace, scanned once per process."""
+
+    global _WORKSPACE_INDEX
+    if _WORKSPACE_INDEX is None:
+        _WORKSPACE_INDEX = WorkspaceIndex.scan(WORKSPACE_ROOT)
+    return _WORKSPACE_INDEX
+
+
+def check_markdown_links(md_path: Path, index: WorkspaceIndex | None = None) -> list[str]:
+    """Validate that relative markdown links resolve to existing files.
+
+    Targets are resolved against ``index`` (see scripts/workspace_index.py),
+    so no filesystem call is made per link.
+    """
 
+    index = index or workspace_index()
     text = md_path.read_text(encoding="utf-8")
     targets = iter_relative_markdown_links(text)
     errors: list[str] = []
+    source = index.relative(md_path)
 
     for target in targets:
-        # Drop anchor fragments and URL-decode paths (spaces, etc.)
-        path_part = target.split("#", 1)[0]
-        path_part = unquote(path_part)
-
         # Ignore empty after stripping anchors
-        if not path_part:
+        if not target.split("#", 1)[0]:
             continue
 
-        resolved = (md_path.parent / path_part).resolve()
+        resolved = index.resolve_link(source, target)
 
         # Constrain to workspace (avoid weird absolute links)
-        try:
-            resolved.relative_to(WORKSPACE_ROOT)
-        except ValueError:
+        if resolved.path is None:
             errors.append(f"Invalid link target outside workspace: ({target})")
             continue
 
-        if not resolved.exists():
-            rel_from_root = md_path.relative_to(WORKSPACE_ROOT)
-            errors.append(f"Broken link in {rel_from_root}: ({target})")
+        if not resolved.exists:
+            hint = f" (case mismatch, did you mean {resolved.case_match}?)" if resolved.case_match else ""
+            errors.append(f"Broken link in {source}: ({target}){hint}")
 
     return errors
 
@@ -176,21 +159,22 @@ def build_validation_context() -> ValidationContext:
             if isinstance(i.get("frame"), str):
                 indicator_to_frame[ind_id] = i["frame"]
 
-    templates_doc = load_yaml(WORKSPACE_ROOT / "templates" / "comment_templates.yaml")
-    templates_raw = templates_doc.get("templates", [])
+    templates_raw = load_library(WORKSPACE_ROOT).all_templates
     template_ids = {t.get("id") for t in templates_raw if isinstance(t, dict) and isinstance(t.get("id"), str)}
 
     evidence_ids: set[str] = set()
     evidence_raw: list[dict] = []
+    evidence_bodies: dict[str, EvidenceBody] = {}
     evidence_dir = WORKSPACE_ROOT / "evidence"
     for md_path in sorted(evidence_dir.glob("evidence.pattern.*.md")):
         try:
-            fm = read_front_matter(md_path)
+            fm, body = read_evidence_pattern(md_path)
         except Exception:
             continue
         ev_id = fm.get("id")
         if isinstance(ev_id, str):
             evidence_ids.add(ev_id)
+            evidence_bodies[ev_id] = body
         evidence_raw.append(fm)
 
     tags_doc = load_yaml(WORKSPACE_ROOT / "taxonomy" / "tags.yaml")
@@ -208,6 +192,7 @@ def build_validation_context() -> ValidationContext:
         indicator_to_frame=indicator_to_frame,
         templates_raw=templates_raw,
         evidence_raw=evidence_raw,
+        evidence_bodies=evidence_bodies,
     )
 
 
@@ -457,6 +442,22 @@ def check_evidence_pattern_integrity(ctx: ValidationContext) -> list[str]:
     return errors
 
 
+def check_evidence_body_consistency(ctx: ValidationContext) -> list[str]:
+    """Ensure each evidence pattern's behaviors table matches its front matter indicators."""
+    errors: list[str] = []
+    for ev in ctx.evidence_raw:
+        if not isinstance(ev, dict):
+            continue
+        body = ctx.evidence_bodies.get(ev.get("id"))
+        if body is None:
+            continue
+        if not body.behaviors:
+            errors.append(f"Evidence pattern {body.pattern_id} has no Observable Behaviors table rows")
+            continue
+        errors.extend(check_body_indicators(ev, body))
+    return errors
+
+
 _HEADING_RE = re.compile(r"^#+\s+(.+)$", re.MULTILINE)
 
 
@@ -468,17 +469,20 @@ def slugify_heading(heading: str) -> str:
     return slug
 
 
-def check_anchor_fragments(markdown_front_matters: list[tuple[Path, dict]]) -> list[str]:
+def check_anchor_fragments(
+    markdown_front_matters: list[tuple[Path, dict]], index: WorkspaceIndex | None = None
+) -> list[str]:
     """Validate that #anchor links point to actual headings in target files."""
     errors: list[str] = []
+    index = index or workspace_index()
 
-    # Build heading cache for all markdown files
-    heading_cache: dict[Path, set[str]] = {}
+    # Build heading cache for all markdown files, keyed by workspace-relative path
+    heading_cache: dict[str, set[str]] = {}
 
-    def get_headings(path: Path) -> set[str]:
+    def get_headings(path: str) -> set[str]:
         if path not in heading_cache:
             try:
-                text = path.read_text(encoding="utf-8")
+                text = (index.root / path).read_text(encoding="utf-8")
             except Exception:
                 heading_cache[path] = set()
                 return heading_cache[path]
@@ -514,22 +518,17 @@ def check_anchor_fragments(markdown_front_matters: list[tuple[Path, dict]]) -> l
             if not anchor:
                 continue
 
-            # Determine target file
-            if path_part:
-                target_path = (md_path.parent / unquote(path_part)).resolve()
-            else:
-                # Same-file anchor
-                target_path = md_path
-
-            if not target_path.exists() or not target_path.suffix == ".md":
+            # Determine target file (an empty path part is a same-file anchor)
+            source = index.relative(md_path)
+            target = index.resolve_link(source, path_part)
+            if not target.exists or target.path not in index.files or not target.path.endswith(".md"):
                 continue
 
-            headings = get_headings(target_path)
+            headings = get_headings(target.path)
             anchor_lower = anchor.lower()
 
             if anchor_lower not in headings:
-                rel_from_root = md_path.relative_to(WORKSPACE_ROOT)
-                errors.append(f"{rel_from_root}: anchor #{anchor} not found in {target_path.name}")
+                errors.append(f"{source}: anchor #{anchor} not found in {target.path.rsplit('/', 1)[-1]}")
 
     return errors
 
@@ -630,7 +629,6 @@ def main() -> int:
         (WORKSPACE_ROOT / "taxonomy" / "col-sections.yaml", SCHEMAS_DIR / "col_sections.schema.json"),
         (WORKSPACE_ROOT / "taxonomy" / "tags.yaml", SCHEMAS_DIR / "tags.schema.json"),
         (WORKSPACE_ROOT / "taxonomy" / "roles.yaml", SCHEMAS_DIR / "roles.schema.json"),
-        (WORKSPACE_ROOT / "templates" / "comment_templates.yaml", SCHEMAS_DIR / "comment_templates.schema.json"),
     ]
 
     for yaml_path, schema_path in yaml_targets:
@@ -640,6 +638,16 @@ def main() -> int:
             failures.append(f"{yaml_path.relative_to(WORKSPACE_ROOT)} failed schema {schema_path.name}:")
             failures.extend([f"  - {m}" for m in messages])
 
+    # Template library: one file or manifest shards, each validated against the template schema
+    library = load_library(WORKSPACE_ROOT)
+    for shard in library.shards:
+        if shard.messages:
+            failures.append(f"{shard.path} failed schema {SCHEMA_PATH.name}:")
+            failures.extend([f"  - {m}" for m in shard.messages])
+    if library.duplicates:
+        failures.append("Duplicate template IDs across the template library:")
+        failures.extend([f"  - {tid}: {', '.join(paths)}" for tid, paths in library.duplicates.items()])
+
     # Markdown front matter
     doc_schema = SCHEMAS_DIR / "document.frontmatter.schema.json"
     entity_schema = SCHEMAS_DIR / "entity.frontmatter.schema.json"
@@ -715,9 +723,10 @@ def main() -> int:
             failures.extend([f"  - {m}" for m in dup_errors])
 
         # Validate relative links across canonical markdown docs
+        index = workspace_index()
         link_errors: list[str] = []
         for md_path, _fm in markdown_front_matters:
-            link_errors.extend(check_markdown_links(md_path))
+            link_errors.extend(check_markdown_links(md_path, index))
         if link_errors:
             failures.append("Broken internal markdown links:")
             failures.extend([f"  - {m}" for m in link_errors])
@@ -770,8 +779,14 @@ def main() -> int:
             failures.append("Evidence pattern integrity issues:")
             failures.extend([f"  - {m}" for m in ev_errors])
 
+        # Evidence body ↔ front matter consistency
+        body_errors = check_evidence_body_consistency(ctx)
+        if body_errors:
+            failures.append("Evidence pattern body issues:")
+            failures.extend([f"  - {m}" for m in body_errors])
+
         # Anchor fragment validation
-        anchor_errors = check_anchor_fragments(markdown_front_matters)
+        anchor_errors = check_anchor_fragments(markdown_front_matters, index)
         if anchor_errors:
             failures.append("Broken anchor links (heading not found):")
             failures.extend([f"  - {m}" for m in anchor_errors])
@@ -0,0 +1,129 @@
+"""In-memory index of workspace files for link resolution and staging.
+
+One `os.scandir` walk records every file and folder as a normalized POSIX
+path relative to the workspace root, plus a case-folded lookup. Link targets
+are then resolved by string normalization alone (`posixpath.normpath`), so
+checking links costs no filesystem calls after the walk, however many links
+or files there are.
+
+Used by validate.py (relative link and anchor checks) and stage_docs.py
+(source listing, with stat results captured during the same walk).
+
+Note: symlinks are indexed as files or folders but not followed, and
+resolution is purely lexical.
+"""
+
+from __future__ import annotations
+
+import os
+import posixpath
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
+from pathlib import Path
+from urllib.parse import unquote
+
+# Never part of the canonical tree
+SKIP_NAMES = frozenset(
+    {".git", "__pycache__", ".pytest_cache", ".ruff_cache", ".mypy_cache", ".venv", "venv", "node_modules", ".DS_Store"}
+)
+
+
+@dataclass(frozen=True)
+class LinkResolution:
+    # Normalized workspace-relative target ("" is the root), or None when it escapes the workspace
+    path: str | None
+    exists: bool
+    # Actual path when the target only exists with different letter case
+    case_match: str | None = None
+
+
+@dataclass
+class WorkspaceIndex:
+    root: Path
+    files: set[str] = field(default_factory=set)
+    dirs: set[str] = field(default_factory=set)
+    # Only filled when scanned with_stat=True
+    stats: dict[str, os.stat_result] = field(default_factory=dict)
+    _by_folded: dict[str, str] = field(default_factory=dict)
+
+    @classmethod
+    def scan(
+        cls,
+        root: Path,
+        include: Iterable[str] | None = None,
+        with_stat: bool = False,
+        skip: frozenset[str] = SKIP_NAMES,
+    ) -> WorkspaceIndex:
+        """Walk ``root`` once. ``include`` limits the walk to these top-level names."""
+
+        index = cls(root=Path(root))
+        wanted = set(include) if include is not None else None
+        stack: list[tuple[str, str]] = [(str(index.root), "")]
+        while stack:
+            directory, rel_dir = stack.pop()
+            try:
+                entries = os.scandir(directory)
+            except (FileNotFoundError, NotADirectoryError, PermissionError):
+                continue
+            with entries:
+                for entry in entries:
+                    if entry.name in skip or entry.name.endswith(".pyc"):
+                        continue
+                    if not rel_dir and wanted is not None and entry.name not in wanted:
+                        continue
+                    rel = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+                    if entry.is_dir(follow_symlinks=False):
+                        index.dirs.add(rel)
+                        stack.append((entry.path, rel))
+                    else:
+                        index.files.add(rel)
+                        if with_stat:
+                            index.stats[rel] = entry.stat()
+                    index._by_folded.setdefault(rel.casefold(), rel)
+        return index
+
+    def __contains__(self, rel: str) -> bool:
+        return rel in self.files or rel in self.dirs or rel == ""
+
+    def relative(self, path: Path) -> str:
+        """Workspace-relative POSIX path for an absolute path under the root (no syscalls)."""
+
+        return Path(os.path.relpath(path, self.root)).as_posix()
+
+    def normalize(self, base_dir: str, target: str) -> str | None:
+        """Join ``target`` onto ``base_dir`` lexically; None if it leaves the workspace.
+
+        Absolute targets count as leaving the workspace, as they did when
+        links were checked with `Path.resolve()`.
+        """
+
+        if target.startswith("/"):
+            return None
+        normalized = posixpath.normpath(posixpath.join(base_dir, target) if base_dir else target)
+        if normalized == ".":
+            return ""
+        if normalized == ".." or normalized.startswith("../"):
+            return None
+        return normalized
+
+    def resolve_link(self, source: str, target: str) -> LinkResolution:
+        """Resolve a Markdown link ``target`` (fragment and URL encoding allowed) from file ``source``."""
+
+        path_part = unquote(target.split("#", 1)[0])
+        if not path_part:
+            return LinkResolution(source, source in self)
+        rel = self.normalize(posixpath.dirname(source), path_part)
+        if rel is None:
+            return LinkResolution(None, False)
+        if rel in self:
+            return LinkResolution(rel, True)
+        actual = self._by_folded.get(rel.casefold())
+        return LinkResolution(rel, False, actual)
+
+    def iter_files(self, prefixes: Iterable[str] | None = None) -> Iterator[str]:
+        """Indexed files (sorted), optionally limited to top-level folders or files in ``prefixes``."""
+
+        tops = set(prefixes) if prefixes is not None else None
+        for rel in sorted(self.files):
+            if tops is None or rel.split("/", 1)[0] in tops:
+                yield rel
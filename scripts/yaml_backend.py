@@ -0,0 +1,274 @@
+"""Pluggable YAML loading with C acceleration and a parse cache.
+
+Backends, in order of preference:
+  ruamel-c   ruamel.yaml with its C extension (`_ruamel_yaml`), when built
+  pyyaml-c   PyYAML CSafeLoader (libyaml), with YAML 1.2 resolvers
+  ruamel     pure-Python ruamel.yaml (always available; the reference)
+  pyyaml     pure-Python PyYAML SafeLoader, with YAML 1.2 resolvers
+
+PyYAML implements YAML 1.1, where `yes`/`no`/`on`/`off` are booleans, `017`
+is octal and `1:20` is a base-60 integer. The PyYAML backends replace its
+implicit resolvers with ruamel's YAML 1.2 ones and use a 1.2 integer
+constructor, and they reject duplicate keys like ruamel does, so every backend
+returns the same data (tests/test_yaml_backend.py checks this).
+
+The first available backend is used unless `YAML_BACKEND` names another.
+
+`load_file` returns data after `normalize_yaml_scalars`. Files of at least
+CACHE_MIN_BYTES are cached in build/cache/yaml/ as `marshal` blobs keyed by
+SHA-256 of the file bytes; smaller files parse faster than they hash.
+
+Usage:
+  python scripts/yaml_backend.py                 # list backends
+  python scripts/yaml_backend.py --bench 50      # time each backend on a 50 MB templates file
+
+Scope: local files only. No network calls.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import marshal
+import os
+import sys
+import tempfile
+import time
+from collections.abc import Callable, Hashable
+from dataclasses import dataclass
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any
+
+from ruamel.yaml import YAML
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from scripts.artifacts import write_if_changed
+
+try:
+    import yaml as pyyaml
+except ImportError:  # pragma: no cover - optional dependency
+    pyyaml = None
+
+WORKSPACE_ROOT = Path(__file__).resolve().parents[1]
+DEFAULT_CACHE = WORKSPACE_ROOT / "build" / "cache" / "yaml"
+CACHE_VERSION = 1
+# Below this size hashing and reading the cache costs about as much as parsing
+CACHE_MIN_BYTES = 256 * 1024
+ENV_VAR = "YAML_BACKEND"
+
+
+def normalize_yaml_scalars(value):
+    if isinstance(value, (date, datetime)):
+        return value.date().isoformat() if isinstance(value, datetime) else value.isoformat()
+    if isinstance(value, dict):
+        return {k: normalize_yaml_scalars(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [normalize_yaml_scalars(v) for v in value]
+    return value
+
+
+@dataclass(frozen=True)
+class Backend:
+    name: str
+    load: Callable[[str], Any]
+    # True when parsing runs in C
+    native: bool
+
+
+def _ruamel_backend(name: str, pure: bool) -> Backend | None:
+    if not pure:
+        try:
+            import _ruamel_yaml  # noqa: F401
+        except ImportError:
+            return None
+    return Backend(name, YAML(typ="safe", pure=pure).load, native=not pure)
+
+
+def _yaml12_loader(base: type) -> type:
+    """Subclass a PyYAML loader with YAML 1.2 resolvers and ruamel's duplicate-key check."""
+
+    from ruamel.yaml.resolver import implicit_resolvers
+
+    resolvers: dict[str | None, list[tuple[str, Any]]] = {}
+    for versions, tag, regexp, first in implicit_resolvers:
+        if (1, 2) in versions:
+            for ch in first:
+                resolvers.setdefault(None if ch == "" else ch, []).append((tag, regexp))
+
+    def construct_int(loader, node) -> int:
+        value = loader.construct_scalar(node).replace("_", "")
+        sign = -1 if value[0] == "-" else 1
+        value = value.lstrip("+-")
+        for prefix, radix in (("0b", 2), ("0o", 8), ("0x", 16)):
+            if value.startswith(prefix):
+                return sign * int(value[2:], radix)
+        # YAML 1.2 has no implicit octal: 017 is seventeen
+        return sign * int(value)
+
+    def construct_mapping(loader, node, deep=False):
+        if isinstance(node, pyyaml.MappingNode):
+            # Check the node's own keys only: keys merged in with `<<` may be overridden
+            seen = set()
+            for key_node, _ in node.value:
+                if key_node.tag == "tag:yaml.org,2002:merge":
+                    continue
+                key = loader.construct_object(key_node, deep=deep)
+                if isinstance(key, Hashable) and key in seen:
+                    problem = f"found duplicate key {key!r}"
+                    raise pyyaml.constructor.ConstructorError(
+                        "while constructing a mapping", node.start_mark, problem, key_node.start_mark
+                    )
+                if isinstance(key, Hashable):
+                    seen.add(key)
+        return base.construct_mapping(loader, node, deep=deep)
+
+    loader = type(f"Yaml12{base.__name__}", (base,), {"yaml_implicit_resolvers": resolvers})
+    loader.construct_mapping = construct_mapping
+    # add_constructor copies the class dict first, so the base loader is untouched
+    loader.add_constructor("tag:yaml.org,2002:int", construct_int)
+    return loader
+
+
+def _pyyaml_backend(name: str, native: bool) -> Backend | None:
+    if pyyaml is None or (native and not getattr(pyyaml, "__with_libyaml__", False)):
+        return None
+    loader = _yaml12_loader(pyyaml.CSafeLoader if native else pyyaml.SafeLoader)
+    return Backend(name, lambda text: pyyaml.load(text, Loader=loader), native=native)
+
+
+_FACTORIES: dict[str, Callable[[], Backend | None]] = {
+    "ruamel-c": lambda: _ruamel_backend("ruamel-c", pure=False),
+    "pyyaml-c": lambda: _pyyaml_backend("pyyaml-c", native=True),
+    "ruamel": lambda: _ruamel_backend("ruamel", pure=True),
+    "pyyaml": lambda: _pyyaml_backend("pyyaml", native=False),
+}
+_BACKENDS: dict[str, Backend] | None = None
+
+
+def available_backends() -> dict[str, Backend]:
+    """Usable backends by name, in order of preference."""
+
+    global _BACKENDS
+    if _BACKENDS is None:
+        _BACKENDS = {name: b for name, factory in _FACTORIES.items() if (b := factory()) is not None}
+    return _BACKENDS
+
+
+def get_backend(name: str | None = None) -> Backend:
+    """Named backend, else the `YAML_BACKEND` one, else the fastest available."""
+
+    backends = available_backends()
+    name = name or os.environ.get(ENV_VAR)
+    if not name:
+        return next(iter(backends.values()))
+    if name not in backends:
+        state = "unavailable" if name in _FACTORIES else "unknown"
+        raise ValueError(f"YAML backend {name!r} is {state}; available: {', '.join(backends)}")
+    return backends[name]
+
+
+def load(text: str, backend: str | None = None) -> Any:
+    """Parse YAML text without normalization."""
+
+    return get_backend(backend).load(text)
+
+
+def _cache_key(data: bytes) -> str:
+    digest = hashlib.sha256(f"v{CACHE_VERSION}\0{sys.version_info[0]}.{sys.version_info[1]}\0".encode())
+    digest.update(data)
+    return digest.hexdigest()
+
+
+def load_file(path: Path, backend: str | None = None, cache_dir: Path | None = DEFAULT_CACHE) -> Any:
+    """Parse and normalize a YAML file, using the parse cache for large files."""
+
+    raw = path.read_bytes()
+    cache_file = None
+    if cache_dir is not None and len(raw) >= CACHE_MIN_BYTES:
+        cache_file = cache_dir / f"{_cache_key(raw)}.marshal"
+        try:
+            return marshal.loads(cache_file.read_bytes())
+        except (OSError, EOFError, ValueError, TypeError):
+            pass
+    data = normalize_yaml_scalars(load(raw.decode("utf-8"), backend))
+    if cache_file is not None:
+        try:
+            write_if_changed(cache_file, marshal.dumps(data))
+        except ValueError:
+            # Unmarshallable value (e.g. a set from !!set); skip caching
+            pass
+    return data
+
+
+def synthetic_templates(megabytes: float) -> str:
+    """A templates file of about ``megabytes`` MB in the comment_templates shape (benchmark only)."""
+
+    entry = (
+        "  - id: template.bench.t{n}\n"
+        "    frame: frame.bench\n"
+        "    section: key_learning\n"
+        "    indicators: [indicator.bench.a{n}, indicator.bench.b]\n"
+        "    slots: [child, pronoun_subject]\n"
+        "    updated: 2026-01-05\n"
+        "    active: true\n"
+        "    weight: 0.5\n"
+        "    text: >-\n"
+        "      {{child}} is beginning to explore ideas through play, and {{pronoun_subject}}\n"
+        "      shares discoveries with peers during group time (entry {n}).\n"
+    )
+    target = int(megabytes * 1024 * 1024)
+    parts = ["templates:\n"]
+    size = len(parts[0])
+    n = 0
+    while size < target:
+        parts.append(entry.format(n=n))
+        size += len(parts[-1])
+        n += 1
+    return "".join(parts)
+
+
+def bench(megabytes: float) -> list[tuple[str, float]]:
+    """Time each backend (and a warm cache read) on a synthetic file; returns (label, seconds)."""
+
+    text = synthetic_templates(megabytes)
+    results: list[tuple[str, float]] = []
+    reference = None
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "comment_templates.yaml"
+        path.write_text(text, encoding="utf-8")
+        for name in available_backends():
+            start = time.perf_counter()
+            data = load_file(path, backend=name, cache_dir=None)
+            results.append((name, time.perf_counter() - start))
+            if reference is None:
+                reference = data
+            elif data != reference:
+                raise AssertionError(f"backend {name} disagrees with {next(iter(available_backends()))}")
+        cache_dir = Path(tmp) / "cache"
+        load_file(path, cache_dir=cache_dir)
+        start = time.perf_counter()
+        load_file(path, cache_dir=cache_dir)
+        results.append(("cache hit", time.perf_counter() - start))
+    return results
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="List or benchmark the YAML loading backends.")
+    parser.add_argument("--bench", type=float, metavar="MB", help="Time each backend on a synthetic file of this size")
+    args = parser.parse_args(argv)
+
+    if args.bench:
+        for label, seconds in bench(args.bench):
+            print(f"{label:10} {seconds:8.2f} s")
+        return 0
+    default = get_backend().name
+    for name, backend in available_backends().items():
+        marker = " (default)" if name == default else ""
+        print(f"{name:10} {'C' if backend.native else 'pure Python'}{marker}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,467 @@
+"""Build derived artifacts from a declared, content-addressed target graph.
+
+Usage:
+  python scripts/build.py                # build all targets
+  python scripts/build.py matrix links   # build selected targets (and their deps)
+  python scripts/build.py --list
+  python scripts/build.py --force -j 4
+
+Each target declares the command that produces it, its input globs, its
+outputs and the targets it depends on. Before running a target the builder
+computes an action key: SHA-256 over the command, every input file's content
+hash and the keys of its dependencies. Then:
+
+- key in the action cache and outputs on disk match it: skip
+- key in the action cache but outputs differ or are missing: restore outputs
+  from the cache's content-addressed store without running anything
+- otherwise: run the command, then store its outputs under the key
+
+Input hashes are memoized by (size, mtime_ns), so a no-op `build` only stats
+files. Independent targets run in parallel (`-j`).
+
+The cache lives in build/cache/ (ignored by git): `actions/<key>.json`
+maps a key to output hashes, `cas/` holds output blobs by SHA-256 and
+`produced/<target>.json` lists the files each target last put on disk. A
+restore only overwrites or deletes files the target itself produced.
+
+Scope: local files only. No network calls.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from pathlib import Path
+
+WORKSPACE_ROOT = Path(__file__).resolve().parents[1]
+DEFAULT_CACHE = WORKSPACE_ROOT / "build" / "cache"
+
+# Canonical sources read by most generators
+CANONICAL = (
+    "taxonomy/*.yaml",
+    "templates/**/*.yaml",
+    "evidence/*.md",
+    "references/bibliography.yaml",
+)
+LIBRARY = (
+    "scripts/catalog.py",
+    "scripts/validate.py",
+    "scripts/evidence_body.py",
+    "scripts/artifacts.py",
+    "scripts/template_library.py",
+    "scripts/yaml_backend.py",
+    "scripts/front_matter.py",
+    "scripts/loaders.py",
+)
+
+
+@dataclass(frozen=True)
+class Target:
+    name: str
+    command: tuple[str, ...]
+    inputs: tuple[str, ...]
+    # Files or directories, relative to the workspace root. A directory output
+    # belongs to this target alone; list files when the folder is shared.
+    outputs: tuple[str, ...]
+    deps: tuple[str, ...] = ()
+    description: str = ""
+
+
+TARGETS: dict[str, Target] = {
+    t.name: t
+    for t in (
+        Target(
+            name="links",
+            command=("scripts/generate_links.py",),
+            inputs=("references/bibliography.yaml", "scripts/generate_links.py", "scripts/artifacts.py"),
+            outputs=("references/links.md", "references/generated.json"),
+            description="references/links.md quick links",
+        ),
+        Target(
+            name="matrix",
+            command=("scripts/generate_matrix.py",),
+            inputs=(*CANONICAL, "scripts/generate_matrix.py", *LIBRARY),
+            # Exact files: the folder also holds the hand-written README.md
+            outputs=tuple(
+                f"datasets/traceability/{name}"
+                for name in (
+                    "matrix.csv",
+                    "matrix.parquet",
+                    "evidence_behaviors.csv",
+                    "evidence_behaviors.parquet",
+                    "evidence_prompts.csv",
+                    "evidence_prompts.parquet",
+                    "generated.json",
+                )
+            ),
+            description="traceability matrix and evidence tables",
+        ),
+        Target(
+            name="reports",
+            command=("scripts/coverage.py", "--reports"),
+            inputs=(*CANONICAL, "scripts/coverage.py", *LIBRARY),
+            outputs=("reports/coverage.md", "reports/gaps.md"),
+            description="reports/coverage.md and reports/gaps.md",
+        ),
+        Target(
+            name="docs_bundle",
+            command=("scripts/docs_bundle.py",),
+            inputs=(*CANONICAL, "scripts/docs_bundle.py", "scripts/coverage.py", *LIBRARY),
+            outputs=("build/docs_bundle.json",),
+            description="precomputed data bundle for the docs macros",
+        ),
+        Target(
+            name="link_graph",
+            command=("scripts/link_graph.py", "--rebuild"),
+            inputs=(
+                "*.md",
+                *(
+                    f"{d}/**/*.md"
+                    for d in (
+                        "audits",
+                        "datasets",
+                        "decisions",
+                        "docs",
+                        "evidence",
+                        "examples",
+                        "guidance",
+                        "knowledge",
+                        "references",
+                        "reports",
+                        "schemas",
+                        "scripts",
+                        "sources",
+                        "templates",
+                    )
+                ),
+                *CANONICAL,
+                "scripts/link_graph.py",
+                "scripts/workspace_index.py",
+                *LIBRARY,
+            ),
+            outputs=("build/link_graph.json",),
+            # links.md and the coverage reports are documents in the graph
+            deps=("links", "reports"),
+            description="global link graph (backlinks, orphans, impact sets)",
+        ),
+        Target(
+            name="search_index",
+            command=("scripts/search_index.py", "--export"),
+            inputs=(
+                *(f"{d}/**/*.md" for d in ("docs", "sources", "guidance", "knowledge")),
+                "scripts/search_index.py",
+                "scripts/workspace_index.py",
+                *LIBRARY,
+            ),
+            outputs=("build/search_index.json",),
+            description="static full-text search index for the docs site",
+        ),
+        Target(
+            name="site_docs",
+            command=("scripts/stage_docs.py",),
+            inputs=(
+                "index.md",
+                "docs/**/*",
+                "taxonomy/**/*",
+                "evidence/**/*",
+                "templates/**/*",
+                "guidance/**/*",
+                "knowledge/**/*",
+                "audits/**/*",
+                "schemas/**/*",
+                "scripts/**/*",
+                # Staged as site_docs/assets/search_index.json
+                "build/search_index.json",
+            ),
+            outputs=("site_docs",),
+            deps=("search_index",),
+            description="site_docs/ tree for mkdocs",
+        ),
+    )
+}
+
+
+def sha256_file(path: Path, chunk_size: int = 1 << 20) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        while chunk := handle.read(chunk_size):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class FileHasher:
+    """Content hashes memoized by (size, mtime_ns), persisted between runs."""
+
+    def __init__(self, root: Path, cache_path: Path):
+        self.root = root
+        self.cache_path = cache_path
+        self._lock = threading.Lock()
+        try:
+            self._entries: dict[str, list] = json.loads(cache_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            self._entries = {}
+        self._dirty = False
+
+    def hash(self, rel: str) -> str | None:
+        path = self.root / rel
+        try:
+            st = path.stat()
+        except FileNotFoundError:
+            return None
+        with self._lock:
+            entry = self._entries.get(rel)
+        if entry and entry[0] == st.st_size and entry[1] == st.st_mtime_ns:
+            return entry[2]
+        digest = sha256_file(path)
+        with self._lock:
+            self._entries[rel] = [st.st_size, st.st_mtime_ns, digest]
+            self._dirty = True
+        return digest
+
+    def save(self) -> None:
+        if not self._dirty:
+            return
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.cache_path.with_name(self.cache_path.name + ".tmp")
+        tmp.write_text(json.dumps(self._entries, sort_keys=True), encoding="utf-8")
+        os.replace(tmp, self.cache_path)
+        self._dirty = False
+
+
+class ActionCache:
+    """Action key -> output hashes, plus a content-addressed blob store."""
+
+    def __init__(self, cache_dir: Path):
+        self.actions_dir = cache_dir / "actions"
+        self.cas_dir = cache_dir / "cas"
+        self.produced_dir = cache_dir / "produced"
+
+    def _blob(self, digest: str) -> Path:
+        return self.cas_dir / digest[:2] / digest
+
+    def lookup(self, key: str) -> dict[str, str] | None:
+        try:
+            return json.loads((self.actions_dir / f"{key}.json").read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+
+    def store(self, key: str, root: Path, outputs: dict[str, str]) -> None:
+        for rel, digest in outputs.items():
+            blob = self._blob(digest)
+            if not blob.exists():
+                blob.parent.mkdir(parents=True, exist_ok=True)
+                tmp = blob.with_name(f"{digest}.{threading.get_ident()}.tmp")
+                shutil.copyfile(root / rel, tmp)
+                os.replace(tmp, blob)
+        self.actions_dir.mkdir(parents=True, exist_ok=True)
+        tmp = self.actions_dir / f"{key}.json.tmp"
+        tmp.write_text(json.dumps(outputs, sort_keys=True), encoding="utf-8")
+        os.replace(tmp, self.actions_dir / f"{key}.json")
+
+    def can_restore(self, outputs: dict[str, str]) -> bool:
+        return all(self._blob(d).exists() for d in outputs.values())
+
+    def produced(self, name: str) -> list[str]:
+        """Files target ``name`` last built or restored."""
+
+        try:
+            return json.loads((self.produced_dir / f"{name}.json").read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return []
+
+    def record_produced(self, name: str, outputs: dict[str, str]) -> None:
+        self.produced_dir.mkdir(parents=True, exist_ok=True)
+        tmp = self.produced_dir / f"{name}.json.tmp"
+        tmp.write_text(json.dumps(sorted(outputs)), encoding="utf-8")
+        os.replace(tmp, self.produced_dir / f"{name}.json")
+
+    def restore(self, root: Path, target: Target, outputs: dict[str, str]) -> None:
+        # Only files this target produced before and the cached action did not: never
+        # anything else that happens to live in an output folder
+        for rel in self.produced(target.name):
+            if rel not in outputs:
+                (root / rel).unlink(missing_ok=True)
+        for rel, digest in outputs.items():
+            dest = root / rel
+            dest.parent.mkdir(parents=True, exist_ok=True)
+            tmp = dest.with_name(f".{dest.name}.tmp")
+            shutil.copyfile(self._blob(digest), tmp)
+            os.replace(tmp, dest)
+
+
+@dataclass
+class TargetResult:
+    name: str
+    # "cached", "restored", "built" or "failed"
+    status: str
+    seconds: float
+    key: str = ""
+    detail: str = ""
+
+
+class Builder:
+    def __init__(
+        self,
+        root: Path = WORKSPACE_ROOT,
+        targets: dict[str, Target] | None = None,
+        cache_dir: Path = DEFAULT_CACHE,
+        jobs: int | None = None,
+    ):
+        self.root = Path(root)
+        self.targets = TARGETS if targets is None else targets
+        self.cache_dir = Path(cache_dir)
+        self.jobs = jobs or min(4, os.cpu_count() or 1)
+        self.hasher = FileHasher(self.root, self.cache_dir / "stat.json")
+        self.cache = ActionCache(self.cache_dir)
+        self._keys: dict[str, str] = {}
+
+    def closure(self, names: list[str]) -> list[str]:
+        """Requested targets plus their dependencies, in dependency order."""
+
+        order: list[str] = []
+        visiting: set[str] = set()
+
+        def visit(name: str) -> None:
+            if name in order:
+                return
+            if name not in self.targets:
+                raise KeyError(f"Unknown target: {name}")
+            if name in visiting:
+                raise ValueError(f"Dependency cycle through {name}")
+            visiting.add(name)
+            for dep in self.targets[name].deps:
+                visit(dep)
+            visiting.discard(name)
+            order.append(name)
+
+        for name in names:
+            visit(name)
+        return order
+
+    def _files(self, patterns: tuple[str, ...]) -> list[str]:
+        files: set[str] = set()
+        for pattern in patterns:
+            for path in self.root.glob(pattern):
+                if path.is_file() and "__pycache__" not in path.parts:
+                    files.add(path.relative_to(self.root).as_posix())
+        return sorted(files)
+
+    def action_key(self, target: Target) -> str:
+        payload = {
+            "command": list(target.command),
+            "python": sys.version_info[:2],
+            "inputs": {rel: self.hasher.hash(rel) for rel in self._files(target.inputs)},
+            "deps": {dep: self._keys[dep] for dep in target.deps},
+            "outputs": list(target.outputs),
+        }
+        return hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
+
+    def output_hashes(self, target: Target) -> dict[str, str] | None:
+        """Current output hashes, or None if a declared output is missing."""
+
+        hashes: dict[str, str] = {}
+        for out in target.outputs:
+            path = self.root / out
+            if path.is_dir():
+                for rel in self._files((f"{out}/**/*",)):
+                    hashes[rel] = self.hasher.hash(rel)
+            elif path.is_file():
+                hashes[out] = self.hasher.hash(out)
+            else:
+                return None
+        return hashes
+
+    def _run_target(self, name: str, force: bool) -> TargetResult:
+        target = self.targets[name]
+        start = time.perf_counter()
+        key = self.action_key(target)
+        self._keys[name] = key
+        cached = None if force else self.cache.lookup(key)
+        if cached is not None:
+            if self.output_hashes(target) == cached:
+                return TargetResult(name, "cached", time.perf_counter() - start, key)
+            if self.cache.can_restore(cached):
+                self.cache.restore(self.root, target, cached)
+                self.cache.record_produced(name, cached)
+                return TargetResult(name, "restored", time.perf_counter() - start, key)
+
+        proc = subprocess.run(
+            [sys.executable, *target.command], cwd=self.root, capture_output=True, text=True, check=False
+        )
+        if proc.returncode != 0:
+            detail = (proc.stderr or proc.stdout).strip().splitlines()
+            return TargetResult(name, "failed", time.perf_counter() - start, key, detail[-1] if detail else "")
+        outputs = self.output_hashes(target)
+        if outputs is None:
+            return TargetResult(name, "failed", time.perf_counter() - start, key, "declared outputs missing")
+        self.cache.store(key, self.root, outputs)
+        self.cache.record_produced(name, outputs)
+        return TargetResult(name, "built", time.perf_counter() - start, key)
+
+    def build(self, names: list[str] | None = None, force: bool = False) -> list[TargetResult]:
+        order = self.closure(names or list(self.targets))
+        results: dict[str, TargetResult] = {}
+        pending = list(order)
+        running: dict[Future, str] = {}
+
+        with ThreadPoolExecutor(max_workers=self.jobs) as pool:
+            while pending or running:
+                for name in list(pending):
+                    deps = self.targets[name].deps
+                    if any(results.get(d) and results[d].status == "failed" for d in deps):
+                        results[name] = TargetResult(name, "failed", 0.0, detail="dependency failed")
+                        pending.remove(name)
+                    elif all(d in results for d in deps):
+                        running[pool.submit(self._run_target, name, force)] = name
+                        pending.remove(name)
+                if not running:
+                    continue
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    results[name] = future.result()
+
+        self.hasher.save()
+        return [results[name] for name in order]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Build derived artifacts (content-addressed, incremental).")
+    parser.add_argument("targets", nargs="*", help="Targets to build (default: all)")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="Parallel targets")
+    parser.add_argument("--force", action="store_true", help="Ignore the action cache")
+    parser.add_argument("--cache-dir", type=Path, default=DEFAULT_CACHE)
+    parser.add_argument("--list", action="store_true", help="List targets and exit")
+    args = parser.parse_args()
+
+    if args.list:
+        for target in TARGETS.values():
+            deps = f" (after {', '.join(target.deps)})" if target.deps else ""
+            print(f"{target.name:<10} {target.description}{deps}")
+        return 0
+
+    start = time.perf_counter()
+    builder = Builder(cache_dir=args.cache_dir, jobs=args.jobs)
+    try:
+        results = builder.build(args.targets or None, force=args.force)
+    except (KeyError, ValueError) as exc:
+        print(f"ERROR: {exc.args[0]}")
+        return 2
+    for r in results:
+        line = f"  {r.status:<9} {r.name:<10} {r.seconds * 1000:8.1f} ms"
+        print(line + (f"  {r.detail}" if r.detail else ""))
+    print(f"Build finished in {(time.perf_counter() - start) * 1000:.0f} ms")
+    return 1 if any(r.status == "failed" for r in results) else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,122 @@
+"""Load canonical artifacts into a single in-memory catalog.
+
+Tools that query templates, indicators and evidence patterns together (the
+recommender, class assignment, report batches) share this loader so they all
+see the same view of the canonical files.
+
+Scope: read-only, local files only. No network calls.
+"""
+
+from __future__ import annotations
+
+import sys
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from scripts.evidence_body import BehaviorRecord, EvidenceBody, PromptRecord
+from scripts.template_library import TemplateLibrary, load_library
+from scripts.validate import WORKSPACE_ROOT, load_yaml, read_evidence_pattern
+
+
+def ensure_list(value) -> list:
+    if value is None:
+        return []
+    if isinstance(value, list):
+        return value
+    return [value]
+
+
+def _index_by_id(items) -> dict[str, dict]:
+    return {i["id"]: i for i in items or [] if isinstance(i, dict) and isinstance(i.get("id"), str)}
+
+
+@dataclass(frozen=True)
+class Catalog:
+    """Canonical artifacts keyed by ID (file order preserved)."""
+
+    frames: dict[str, dict] = field(default_factory=dict)
+    indicators: dict[str, dict] = field(default_factory=dict)
+    templates: dict[str, dict] = field(default_factory=dict)
+    evidence_patterns: dict[str, dict] = field(default_factory=dict)
+    col_sections: dict[str, dict] = field(default_factory=dict)
+    refs: dict[str, dict] = field(default_factory=dict)
+    evidence_bodies: dict[str, EvidenceBody] = field(default_factory=dict)
+    # indicator_id -> records, for O(1) lookups without re-reading Markdown
+    behaviors_by_indicator: dict[str, list[BehaviorRecord]] = field(default_factory=dict)
+    prompts_by_indicator: dict[str, list[PromptRecord]] = field(default_factory=dict)
+    # template_id -> shard file it was loaded from (see scripts/template_library.py)
+    template_sources: dict[str, str] = field(default_factory=dict)
+
+    @property
+    def section_keys(self) -> list[str]:
+        return list(self.col_sections)
+
+
+def read_evidence(path: Path) -> tuple[dict, EvidenceBody] | None:
+    """One evidence pattern with list fields normalized; None when it has no string ``id``."""
+
+    fm, body = read_evidence_pattern(path)
+    if not isinstance(fm.get("id"), str):
+        return None
+    fm["indicators"] = ensure_list(fm.get("indicators"))
+    fm["refs"] = ensure_list(fm.get("refs"))
+    return fm, body
+
+
+def assemble_catalog(
+    frames_doc: dict,
+    indicators_doc: dict,
+    refs_doc: dict,
+    col_sections_doc: dict,
+    library: TemplateLibrary,
+    evidence: Iterable[tuple[dict, EvidenceBody]],
+) -> Catalog:
+    """Build a Catalog from parsed files; parsed objects are shared, not copied."""
+
+    col_sections: dict[str, dict] = {}
+    for section in col_sections_doc.get("col_sections", []):
+        if isinstance(section, dict) and isinstance(section.get("key"), str):
+            col_sections[section["key"]] = section
+
+    evidence_patterns: dict[str, dict] = {}
+    evidence_bodies: dict[str, EvidenceBody] = {}
+    behaviors_by_indicator: dict[str, list[BehaviorRecord]] = {}
+    prompts_by_indicator: dict[str, list[PromptRecord]] = {}
+    for fm, body in evidence:
+        evidence_patterns[fm["id"]] = fm
+        evidence_bodies[fm["id"]] = body
+        for record in body.behaviors:
+            behaviors_by_indicator.setdefault(record.indicator_id, []).append(record)
+        # Prompts are written per pattern, so they apply to each indicator it covers
+        for ind_id in dict.fromkeys(fm["indicators"] + body.table_indicators):
+            prompts_by_indicator.setdefault(ind_id, []).extend(body.prompts)
+
+    return Catalog(
+        frames=_index_by_id(frames_doc.get("frames")),
+        indicators=_index_by_id(indicators_doc.get("indicators")),
+        templates=library.templates,
+        evidence_patterns=evidence_patterns,
+        col_sections=col_sections,
+        refs=_index_by_id(refs_doc.get("references")),
+        evidence_bodies=evidence_bodies,
+        behaviors_by_indicator=behaviors_by_indicator,
+        prompts_by_indicator=prompts_by_indicator,
+        template_sources=library.sources,
+    )
+
+
+def load_catalog(root: Path = WORKSPACE_ROOT) -> Catalog:
+    """Load taxonomy, templates, evidence patterns and references under ``root``."""
+
+    evidence = (read_evidence(path) for path in sorted((root / "evidence").glob("evidence.pattern.*.md")))
+    return assemble_catalog(
+        load_yaml(root / "taxonomy" / "frames.yaml"),
+        load_yaml(root / "taxonomy" / "indicators.yaml"),
+        load_yaml(root / "references" / "bibliography.yaml"),
+        load_yaml(root / "taxonomy" / "col-sections.yaml"),
+        load_library(root),
+        (item for item in evidence if item is not None),
+    )
@@ -0,0 +1,457 @@
+"""Read-only HTTP API over the in-memory catalog.
+
+Usage:
+  python scripts/catalog_api.py                      # serve on 127.0.0.1:8765
+  python scripts/catalog_api.py --port 9000
+  python scripts/catalog_api.py --bench --concurrency 32 --requests 20000
+
+Endpoints (GET and HEAD, JSON):
+  /                                  endpoint list and counts
+  /frames, /frames/{id}
+  /templates?frame=&section=&tone=&indicator=, /templates/{id}
+  /indicators?frame=, /indicators/{id}
+  /evidence-patterns?frame=&indicator=, /evidence-patterns/{id}
+  /coverage                          same coverage data as the docs bundle
+
+A filter may be repeated (OR within a filter, AND across filters). List
+responses are `{"count": n, "items": [...]}`.
+
+Responses are built once per catalog: every item is encoded to JSON at
+startup, and filters intersect precomputed value -> ID indexes and join the
+encoded items. Filtered slices are cached (LRU); a query on a single resource
+is ignored. Each response has a strong ETag (SHA-256 of the body, suffixed
+per content-coding) and precompressed gzip and, when `brotli` is installed,
+br variants. `If-None-Match` with the tag of the negotiated coding returns 304.
+
+The server is plain asyncio streams (HTTP/1.1, keep-alive), with no web
+framework. A request line over 64 KiB gets 414, oversized or too many
+headers get 431, and a connection idle for IDLE_TIMEOUT seconds is closed.
+`--bench` starts it on a free port and drives it with an in-process asyncio
+load generator, then prints p50/p99 latency and requests per second.
+
+Scope: serves local files only, bound to localhost by default. No outbound
+network calls.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import gzip
+import hashlib
+import json
+import sys
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from pathlib import Path
+from urllib.parse import parse_qs, unquote
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from scripts.catalog import WORKSPACE_ROOT, Catalog, ensure_list, load_catalog
+from scripts.docs_bundle import build_bundle, encode_json
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+# Bodies smaller than this are always sent uncompressed
+MIN_COMPRESS_BYTES = 1024
+SLICE_CACHE_SIZE = 256
+MAX_HEADERS = 100
+# Seconds a keep-alive connection may sit idle (or dribble a request) before it is closed
+IDLE_TIMEOUT = 30.0
+
+_REASONS = {
+    200: "OK",
+    304: "Not Modified",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    414: "URI Too Long",
+    431: "Request Header Fields Too Large",
+}
+
+
+@dataclass(frozen=True)
+class Entity:
+    """One precomputed response body with its ETag and compressed variants."""
+
+    body: bytes
+    etag: str
+    # content-coding -> compressed body
+    variants: dict[str, bytes] = field(default_factory=dict)
+
+    @classmethod
+    def from_body(cls, body: bytes) -> Entity:
+        variants = {}
+        if len(body) >= MIN_COMPRESS_BYTES:
+            variants["gzip"] = gzip.compress(body, compresslevel=9, mtime=0)
+            if brotli is not None:
+                variants["br"] = brotli.compress(body, quality=9)
+        return cls(body, f'"{hashlib.sha256(body).hexdigest()[:32]}"', variants)
+
+    def etag_for(self, coding: str) -> str:
+        """Strong ETags differ per representation, so each coding gets its own tag."""
+
+        return self.etag if coding == "identity" else f'{self.etag[:-1]}-{coding}"'
+
+    def matches(self, if_none_match: str, coding: str) -> bool:
+        """Only the tag of the representation being sent (or ``*``) counts as a match."""
+
+        tags = {t.strip().removeprefix("W/") for t in if_none_match.split(",")}
+        return "*" in tags or self.etag_for(coding) in tags
+
+
+def choose_encoding(accept_encoding: str, available) -> str:
+    """Best content-coding the client accepts (br, then gzip), else identity."""
+
+    prefs: dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.partition(";")
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if coding.strip():
+            prefs[coding.strip().lower()] = q
+    for coding in ("br", "gzip"):
+        if coding in available and prefs.get(coding, prefs.get("*", 0.0)) > 0:
+            return coding
+    return "identity"
+
+
+def _list_body(fragments: list[bytes]) -> bytes:
+    return b'{"count":%d,"items":[' % len(fragments) + b",".join(fragments) + b"]}"
+
+
+class Collection:
+    """A list endpoint: encoded items in catalog order plus a value -> IDs index per filter."""
+
+    def __init__(self, items: dict[str, dict], filters: dict[str, Callable[[dict], list]]):
+        self.order = list(items)
+        self.fragments = {item_id: encode_json(item) for item_id, item in items.items()}
+        self.filters = filters
+        self.index: dict[str, dict[str, set[str]]] = {name: {} for name in filters}
+        for item_id, item in items.items():
+            for name, values in filters.items():
+                for value in values(item):
+                    if isinstance(value, str):
+                        self.index[name].setdefault(value, set()).add(item_id)
+
+    def select(self, query: dict[str, list[str]]) -> list[str]:
+        selected: set[str] | None = None
+        for name, values in query.items():
+            ids = set().union(*(self.index[name].get(v, set()) for v in values))
+            selected = ids if selected is None else selected & ids
+        return self.order if selected is None else [i for i in self.order if i in selected]
+
+
+class ApiSnapshot:
+    """Every response for one catalog, precomputed; filtered slices are built on first use."""
+
+    def __init__(self, catalog: Catalog):
+        bundle = build_bundle(catalog)
+        frames = {fid: {"id": fid, **frame} for fid, frame in bundle["frames"].items()}
+        indicators = {iid: {"id": iid, **ind} for iid, ind in bundle["indicators"].items()}
+        self.collections: dict[str, Collection] = {
+            "frames": Collection(frames, {}),
+            "templates": Collection(
+                catalog.templates,
+                {
+                    "frame": lambda t: [t.get("frame")],
+                    "section": lambda t: [t.get("section")],
+                    "tone": lambda t: [t.get("tone")],
+                    "indicator": lambda t: ensure_list(t.get("indicators")),
+                },
+            ),
+            "indicators": Collection(indicators, {"frame": lambda i: [i.get("frame")]}),
+            "evidence-patterns": Collection(
+                catalog.evidence_patterns,
+                {"frame": lambda p: [p.get("frame")], "indicator": lambda p: p.get("indicators", [])},
+            ),
+        }
+        details = {name: dict(collection.fragments) for name, collection in self.collections.items()}
+        for pid, body in catalog.evidence_bodies.items():
+            if pid in catalog.evidence_patterns:
+                details["evidence-patterns"][pid] = encode_json(
+                    {
+                        **catalog.evidence_patterns[pid],
+                        "context": body.context,
+                        "behaviors": [
+                            {"indicator": b.indicator_id, "text": b.text, "behaviors": list(b.behaviors)}
+                            for b in body.behaviors
+                        ],
+                        "prompts": [p.prompt for p in body.prompts],
+                        "sample_note": body.sample_note,
+                    }
+                )
+
+        self.entities: dict[str, Entity] = {}
+        for name, collection in self.collections.items():
+            self.entities[f"/{name}"] = Entity.from_body(_list_body(list(collection.fragments.values())))
+            for item_id, fragment in details[name].items():
+                self.entities[f"/{name}/{item_id}"] = Entity.from_body(fragment)
+        self.entities["/coverage"] = Entity.from_body(encode_json(bundle["coverage"]))
+        self.entities["/"] = Entity.from_body(
+            encode_json(
+                {
+                    "endpoints": [
+                        f"/{name}" + (f"?{'&'.join(f'{f}=' for f in c.filters)}" if c.filters else "")
+                        for name, c in self.collections.items()
+                    ]
+                    + [f"/{name}/{{id}}" for name in self.collections]
+                    + ["/coverage"],
+                    "counts": {name: len(c.order) for name, c in self.collections.items()},
+                }
+            )
+        )
+        self._slices: OrderedDict[tuple, Entity] = OrderedDict()
+
+    def lookup(self, path: str, query: dict[str, list[str]]) -> tuple[int, Entity | str]:
+        """(200, entity) or (status, error message) for a GET of ``path?query``."""
+
+        path = unquote(path).rstrip("/") or "/"
+        collection = self.collections.get(path.lstrip("/")) if path != "/" else None
+        if not query or collection is None:
+            # Single resources take no filters, so a query there (e.g. a cache-buster) is ignored
+            entity = self.entities.get(path)
+            return (200, entity) if entity is not None else (404, f"No resource at {path}")
+        unknown = sorted(set(query) - set(collection.filters))
+        if unknown:
+            allowed = ", ".join(collection.filters) or "none"
+            return (400, f"Unknown filter(s) {', '.join(unknown)} for {path}; allowed: {allowed}")
+        key = (path, *sorted((name, tuple(sorted(set(values)))) for name, values in query.items()))
+        entity = self._slices.get(key)
+        if entity is None:
+            ids = collection.select(query)
+            entity = Entity.from_body(_list_body([collection.fragments[i] for i in ids]))
+            self._slices[key] = entity
+            if len(self._slices) > SLICE_CACHE_SIZE:
+                self._slices.popitem(last=False)
+        else:
+            self._slices.move_to_end(key)
+        return 200, entity
+
+
+@dataclass
+class Response:
+    status: int
+    headers: list[tuple[str, str]]
+    body: bytes = b""
+
+    def encode(self, head_only: bool = False) -> bytes:
+        lines = [f"HTTP/1.1 {self.status} {_REASONS[self.status]}"]
+        lines += [f"{name}: {value}" for name, value in self.headers]
+        head = ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+        return head if head_only else head + self.body
+
+
+class CatalogServer:
+    """asyncio HTTP/1.1 server answering from ``self.snapshot``."""
+
+    def __init__(self, snapshot: ApiSnapshot, idle_timeout: float = IDLE_TIMEOUT):
+        self.snapshot = snapshot
+        self.idle_timeout = idle_timeout
+
+    def respond(self, method: str, target: str, headers: dict[str, str]) -> Response:
+        if method not in ("GET", "HEAD"):
+            return self._error(405, f"{method} is not allowed; this API is read-only", [("Allow", "GET, HEAD")])
+        # Split by hand: urlsplit() would read the "x" of "//x" as a host name
+        path, _, query = target.partition("?")
+        if not path.startswith("/"):
+            return self._error(400, f"Unsupported request target {target}")
+        status, result = self.snapshot.lookup(path, parse_qs(query))
+        if not isinstance(result, Entity):
+            return self._error(status, result)
+        coding = choose_encoding(headers.get("accept-encoding", ""), result.variants)
+        common = [("ETag", result.etag_for(coding)), ("Vary", "Accept-Encoding"), ("Cache-Control", "no-cache")]
+        if_none_match = headers.get("if-none-match")
+        if if_none_match is not None and result.matches(if_none_match, coding):
+            return Response(304, common)
+        body = result.variants.get(coding, result.body)
+        fields = [("Content-Type", "application/json; charset=utf-8"), ("Content-Length", str(len(body))), *common]
+        if coding != "identity":
+            fields.append(("Content-Encoding", coding))
+        return Response(200, fields, body)
+
+    @staticmethod
+    def _error(status: int, message: str, extra: list[tuple[str, str]] | None = None) -> Response:
+        body = encode_json({"error": message})
+        fields = [("Content-Type", "application/json; charset=utf-8"), ("Content-Length", str(len(body)))]
+        return Response(status, fields + (extra or []), body)
+
+    async def _reject(self, writer: asyncio.StreamWriter, status: int, message: str) -> None:
+        writer.write(self._error(status, message, [("Connection", "close")]).encode())
+        await writer.drain()
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                # readline() raises ValueError for a line over the stream limit (64 KiB)
+                try:
+                    request_line = await asyncio.wait_for(reader.readline(), self.idle_timeout)
+                except ValueError:
+                    await self._reject(writer, 414, "Request line too long")
+                    break
+                if not request_line.strip():
+                    break
+                try:
+                    method, target, version = request_line.decode("latin-1").split()
+                except ValueError:
+                    await self._reject(writer, 400, "Malformed request line")
+                    break
+                headers: dict[str, str] = {}
+                try:
+                    for _ in range(MAX_HEADERS + 1):
+                        line = await asyncio.wait_for(reader.readline(), self.idle_timeout)
+                        if line in (b"\r\n", b"\n", b""):
+                            break
+                        name, _, value = line.decode("latin-1").partition(":")
+                        headers[name.strip().lower()] = value.strip()
+                    else:
+                        raise ValueError
+                except ValueError:
+                    await self._reject(writer, 431, "Request headers too large")
+                    break
+                response = self.respond(method, target, headers)
+                connection = headers.get("connection", "").lower()
+                close = connection == "close" or (version == "HTTP/1.0" and connection != "keep-alive")
+                # Request bodies are never read, so a request with one ends the connection
+                if close or headers.get("content-length", "0") != "0":
+                    response.headers.append(("Connection", "close"))
+                    close = True
+                writer.write(response.encode(head_only=method == "HEAD"))
+                await writer.drain()
+                if close:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.TimeoutError):
+            pass
+        finally:
+            writer.close()
+
+
+async def serve(server: CatalogServer, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> asyncio.Server:
+    return await asyncio.start_server(server.handle, host, port)
+
+
+def bench_paths(snapshot: ApiSnapshot) -> list[tuple[str, dict[str, str]]]:
+    """A request mix: lists, details, filtered slices and conditional GETs."""
+
+    templates = snapshot.collections["templates"]
+    frame = next(iter(templates.index["frame"]), "")
+    indicator = next(iter(templates.index["indicator"]), "")
+    gzip_only = {"Accept-Encoding": "gzip"}
+    return [
+        ("/templates", gzip_only),
+        (f"/templates?frame={frame}&section=key_learning", gzip_only),
+        (f"/templates?indicator={indicator}", {}),
+        (f"/templates/{templates.order[0]}", {}) if templates.order else ("/", {}),
+        ("/indicators", gzip_only),
+        ("/evidence-patterns", gzip_only),
+        ("/coverage", gzip_only),
+        ("/templates", {"Accept-Encoding": "gzip", "If-None-Match": snapshot.entities["/templates"].etag_for("gzip")}),
+    ]
+
+
+async def run_bench(snapshot: ApiSnapshot, concurrency: int = 32, requests: int = 20000) -> dict:
+    """Serve ``snapshot`` on a free port and load it with ``concurrency`` keep-alive clients."""
+
+    app = CatalogServer(snapshot)
+    server = await serve(app, DEFAULT_HOST, 0)
+    port = server.sockets[0].getsockname()[1]
+    paths = bench_paths(snapshot)
+    latencies: list[float] = []
+    statuses: dict[int, int] = {}
+
+    async def client(worker: int, count: int) -> None:
+        reader, writer = await asyncio.open_connection(DEFAULT_HOST, port)
+        for i in range(count):
+            path, extra = paths[(worker + i) % len(paths)]
+            head = "".join(f"{k}: {v}\r\n" for k, v in extra.items())
+            start = time.perf_counter()
+            writer.write(f"GET {path} HTTP/1.1\r\nHost: localhost\r\n{head}\r\n".encode("latin-1"))
+            status = int((await reader.readline()).split()[1])
+            length = 0
+            while (line := await reader.readline()) not in (b"\r\n", b""):
+                name, _, value = line.decode("latin-1").partition(":")
+                if name.lower() == "content-length":
+                    length = int(value)
+            await reader.readexactly(length)
+            latencies.append(time.perf_counter() - start)
+            statuses[status] = statuses.get(status, 0) + 1
+        writer.close()
+
+    per_client = max(1, requests // concurrency)
+    start = time.perf_counter()
+    await asyncio.gather(*(client(w, per_client) for w in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    server.close()
+    await server.wait_closed()
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "concurrency": concurrency,
+        "seconds": elapsed,
+        "rps": len(latencies) / elapsed,
+        "p50_ms": latencies[len(latencies) // 2] * 1000,
+        "p99_ms": latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000,
+        "statuses": statuses,
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Serve the catalog as a read-only JSON API.")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--bench", action="store_true", help="Run the built-in load test instead of serving")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--watch", type=float, metavar="SECONDS", help="Hot-reload catalog edits at this poll interval")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    snapshot = ApiSnapshot(load_catalog(WORKSPACE_ROOT))
+    print(f"{len(snapshot.entities)} responses precomputed in {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    if args.bench:
+        result = asyncio.run(run_bench(snapshot, args.concurrency, args.requests))
+        print(json.dumps(result, indent=2))
+        return 0
+
+    app = CatalogServer(snapshot)
+    if args.watch:
+        from scripts.catalog_reload import LiveCatalog
+
+        def swap(new) -> None:
+            # Responses are rebuilt off the event loop, then published with one assignment
+            app.snapshot = ApiSnapshot(new.catalog)
+            print(f"catalog generation {new.generation} is live")
+
+        live = LiveCatalog(WORKSPACE_ROOT, on_swap=swap)
+        live.start(args.watch)
+
+    async def run() -> None:
+        server = await serve(app, args.host, args.port)
+        print(f"Serving on http://{args.host}:{args.port}/ (Ctrl+C to stop)")
+        async with server:
+            await server.serve_forever()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,254 @@
+"""Tag free-text observation notes with candidate indicators and frames.
+
+Usage:
+  python scripts/classify_notes.py "Sam counted the blocks and compared the two towers."
+  python scripts/classify_notes.py --evaluate tests/fixtures/observation_notes.yaml
+  python scripts/classify_notes.py --bench 200000
+
+Phrases come from two canonical sources:
+- `evidence_signals` in taxonomy/indicators.yaml
+- the "Observable Behaviors (Signals)" tables in evidence/evidence.pattern.*.md
+
+Each phrase is normalized (lowercase, punctuation and stopwords dropped, light
+suffix stemming) and expanded into word bigrams, plus unigrams that occur
+under at most two indicators. All patterns are compiled into one word-level
+Aho–Corasick automaton, so a note is tagged in a single pass over its tokens
+no matter how many phrases exist. Matches add weight to their indicators
+(bigram 2, unigram 1). An indicator is tagged once its score reaches the
+threshold and at least half of the note's top score.
+
+Notes used here are synthetic. This repository never stores real observations.
+"""
+
+from __future__ import annotations
+
+import argparse
+import re
+import sys
+import time
+from collections import defaultdict, deque
+from dataclasses import dataclass, field
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from scripts.catalog import WORKSPACE_ROOT, Catalog, load_catalog
+from scripts.validate import load_yaml
+
+DEFAULT_THRESHOLD = 2.0
+# Secondary tags must also reach this share of the note's top score
+RELATIVE_THRESHOLD = 0.5
+BIGRAM_WEIGHT = 2.0
+UNIGRAM_WEIGHT = 1.0
+MAX_UNIGRAM_INDICATORS = 2
+
+_WORD_RE = re.compile(r"[a-z]+")
+
+STOPWORDS = frozenset(
+    """
+    a an the and or but of to in on at by for from with without into onto as is are was were be been being
+    it its this that these those there then than so such very too also just while when during after before
+    he she they him her them his hers their theirs we our you your i me my who what which how why
+    has have had do does did can could will would should may might not no yes up out over about
+    """.split()
+)
+
+
+def stem(word: str) -> str:
+    """Light suffix stripping so 'sharing', 'shares' and 'shared' agree."""
+
+    if len(word) <= 3:
+        return word
+    if word.endswith("ies") and len(word) > 4:
+        word = word[:-3] + "y"
+    elif word.endswith("ing") and len(word) > 5:
+        word = word[:-3]
+        if len(word) > 2 and word[-1] == word[-2] and word[-1] not in "lsz":
+            word = word[:-1]
+    elif word.endswith("ed") and len(word) > 4:
+        word = word[:-2]
+        if len(word) > 2 and word[-1] == word[-2] and word[-1] not in "lsz":
+            word = word[:-1]
+    elif word.endswith("ly") and len(word) > 4:
+        word = word[:-2]
+    elif word.endswith("es") and len(word) > 4 and word[-3] in "sxhz":
+        word = word[:-2]
+    elif word.endswith("s") and not word.endswith("ss"):
+        word = word[:-1]
+    if word.endswith("e") and len(word) > 3:
+        word = word[:-1]
+    return word
+
+
+def normalize(text: str) -> list[str]:
+    """Lowercase, drop stopwords and stem; returns content-word stems in order."""
+
+    return [stem(w) for w in _WORD_RE.findall(text.lower().replace("'", "")) if w not in STOPWORDS]
+
+
+def collect_phrases(catalog: Catalog) -> list[tuple[str, str]]:
+    """Return ``(indicator_id, phrase)`` pairs from signals and evidence behaviors."""
+
+    phrases: list[tuple[str, str]] = []
+    for ind_id, ind in catalog.indicators.items():
+        for signal in ind.get("evidence_signals") or []:
+            if isinstance(signal, str):
+                phrases.append((ind_id, signal))
+        for record in catalog.behaviors_by_indicator.get(ind_id, []):
+            phrases.extend((ind_id, phrase) for phrase in record.behaviors)
+    return phrases
+
+
+class AhoCorasick:
+    """Word-level Aho–Corasick automaton; outputs are arbitrary payloads."""
+
+    def __init__(self):
+        self.goto: list[dict[str, int]] = [{}]
+        self.fail: list[int] = [0]
+        self.out: list[list] = [[]]
+
+    def add(self, words: tuple[str, ...], payload) -> None:
+        state = 0
+        for word in words:
+            nxt = self.goto[state].get(word)
+            if nxt is None:
+                nxt = len(self.goto)
+                self.goto[state][word] = nxt
+                self.goto.append({})
+                self.fail.append(0)
+                self.out.append([])
+            state = nxt
+        self.out[state].append(payload)
+
+    def build(self) -> None:
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for word, nxt in self.goto[state].items():
+                queue.append(nxt)
+                f = self.fail[state]
+                while f and word not in self.goto[f]:
+                    f = self.fail[f]
+                self.fail[nxt] = self.goto[f].get(word, 0)
+                self.out[nxt] = self.out[nxt] + self.out[self.fail[nxt]]
+
+    def iter_matches(self, words: list[str]):
+        goto, fail, out = self.goto, self.fail, self.out
+        state = 0
+        for word in words:
+            while state and word not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(word, 0)
+            if out[state]:
+                yield from out[state]
+
+
+@dataclass(frozen=True)
+class NoteTags:
+    indicators: tuple[str, ...]
+    frames: tuple[str, ...]
+    scores: dict[str, float] = field(default_factory=dict)
+
+
+class NoteClassifier:
+    def __init__(self, catalog: Catalog, threshold: float = DEFAULT_THRESHOLD):
+        self.threshold = threshold
+        self.indicator_frame = {ind_id: ind.get("frame") for ind_id, ind in catalog.indicators.items()}
+
+        bigrams: dict[tuple[str, ...], set[str]] = defaultdict(set)
+        unigrams: dict[tuple[str, ...], set[str]] = defaultdict(set)
+        for ind_id, phrase in collect_phrases(catalog):
+            words = normalize(phrase)
+            for word in words:
+                unigrams[(word,)].add(ind_id)
+            for pair in zip(words, words[1:], strict=False):
+                bigrams[pair].add(ind_id)
+
+        self.automaton = AhoCorasick()
+        self.pattern_count = 0
+        for pattern, ind_ids in bigrams.items():
+            self.automaton.add(pattern, (BIGRAM_WEIGHT, tuple(sorted(ind_ids))))
+            self.pattern_count += 1
+        for pattern, ind_ids in unigrams.items():
+            if len(ind_ids) <= MAX_UNIGRAM_INDICATORS:
+                self.automaton.add(pattern, (UNIGRAM_WEIGHT, tuple(sorted(ind_ids))))
+                self.pattern_count += 1
+        self.automaton.build()
+
+    def classify(self, note: str) -> NoteTags:
+        scores: dict[str, float] = defaultdict(float)
+        for weight, ind_ids in self.automaton.iter_matches(normalize(note)):
+            for ind_id in ind_ids:
+                scores[ind_id] += weight
+        cutoff = max(self.threshold, RELATIVE_THRESHOLD * max(scores.values(), default=0.0))
+        tagged = tuple(sorted(i for i, s in scores.items() if s >= cutoff))
+        frames = tuple(sorted({self.indicator_frame[i] for i in tagged if self.indicator_frame.get(i)}))
+        return NoteTags(indicators=tagged, frames=frames, scores=dict(scores))
+
+
+def load_fixtures(path: Path) -> list[dict]:
+    return [n for n in load_yaml(path).get("notes", []) if isinstance(n, dict) and isinstance(n.get("text"), str)]
+
+
+def evaluate(classifier: NoteClassifier, fixtures: list[dict]) -> dict[str, float]:
+    """Micro-averaged precision/recall/F1 of indicator tags against labelled notes."""
+
+    tp = fp = fn = 0
+    for note in fixtures:
+        expected = set(note.get("indicators") or [])
+        predicted = set(classifier.classify(note["text"]).indicators)
+        tp += len(expected & predicted)
+        fp += len(predicted - expected)
+        fn += len(expected - predicted)
+    precision = tp / (tp + fp) if tp + fp else 0.0
+    recall = tp / (tp + fn) if tp + fn else 0.0
+    f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+    return {"notes": len(fixtures), "precision": precision, "recall": recall, "f1": f1}
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Tag observation notes with candidate indicators.")
+    parser.add_argument("note", nargs="?", help="A single observation note")
+    parser.add_argument("--evaluate", type=Path, help="Labelled fixture YAML (notes: [{text, indicators}])")
+    parser.add_argument("--bench", type=int, default=0, help="Classify N notes from the fixture set and time it")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    args = parser.parse_args(argv)
+
+    if not (args.note or args.evaluate or args.bench):
+        parser.error("provide a note, --evaluate or --bench")
+
+    classifier = NoteClassifier(load_catalog(), threshold=args.threshold)
+
+    if args.note:
+        tags = classifier.classify(args.note)
+        if not tags.indicators:
+            print("No indicators tagged")
+            return 0
+        for ind_id in tags.indicators:
+            print(f"  {ind_id} (score {tags.scores[ind_id]:.1f})")
+        print(f"  Frames: {', '.join(tags.frames)}")
+        return 0
+
+    fixture_path = args.evaluate or WORKSPACE_ROOT / "tests" / "fixtures" / "observation_notes.yaml"
+    fixtures = load_fixtures(fixture_path)
+
+    if args.evaluate:
+        metrics = evaluate(classifier, fixtures)
+        print(f"Patterns: {classifier.pattern_count}")
+        print(f"Notes: {metrics['notes']}")
+        print(f"Precision: {metrics['precision']:.2f}")
+        print(f"Recall: {metrics['recall']:.2f}")
+        print(f"F1: {metrics['f1']:.2f}")
+
+    if args.bench:
+        texts = [n["text"] for n in fixtures]
+        started = time.perf_counter()
+        for i in range(args.bench):
+            classifier.classify(texts[i % len(texts)])
+        elapsed = time.perf_counter() - started
+        print(f"Classified {args.bench} notes in {elapsed:.2f} s ({args.bench / elapsed * 60:,.0f} notes/min)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -4,10 +4,19 @@ Reports:
 - Indicators with zero template references
 - Templates per indicator distribution
 - Coverage percentage by frame
+- Section-level gaps (e.g. indicators with no `next_steps` template)
+- Redundancy (templates duplicating another template's indicators and section)
+
+Relationships are held as sparse boolean incidence matrices (scipy CSR):
+indicator×template, indicator×evidence pattern, template×reference and
+template×section. Every metric is a sparse product or row/column sum over
+those matrices, so the report scales with the number of links rather than
+with nested loops over the catalog.
 
 Usage:
-  python scripts/coverage.py          # Report only (always exit 0)
-  python scripts/coverage.py --strict # Fail if coverage < 100%
+  python scripts/coverage.py           # Report only (always exit 0)
+  python scripts/coverage.py --strict  # Fail if coverage < 100%
+  python scripts/coverage.py --reports # Also write reports/coverage.md + reports/gaps.md
 
 Scope: local QA and planning tool.
 """
@@ -15,62 +24,276 @@ Scope: local QA and planning tool.
 from __future__ import annotations
 
 import sys
-from collections import defaultdict
+from dataclasses import dataclass
 from pathlib import Path
 
-from ruamel.yaml import YAML
+import numpy as np
+from scipy import sparse
+from scipy.sparse.csgraph import connected_components
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from scripts.artifacts import write_if_changed
+from scripts.catalog import WORKSPACE_ROOT, Catalog, ensure_list, load_catalog
+
+REPORTS_DIR = WORKSPACE_ROOT / "reports"
+
+
+def incidence(rows: list[str], cols: list[str], pairs) -> sparse.csr_matrix:
+    """Build a boolean CSR matrix from (row_id, col_id) pairs; unknown IDs are skipped."""
+
+    row_index = {r: i for i, r in enumerate(rows)}
+    col_index = {c: j for j, c in enumerate(cols)}
+    coords = {(row_index[r], col_index[c]) for r, c in pairs if r in row_index and c in col_index}
+    if coords:
+        i, j = np.array(sorted(coords)).T
+    else:
+        i = j = np.array([], dtype=np.int64)
+    return sparse.csr_matrix((np.ones(len(i), dtype=bool), (i, j)), shape=(len(rows), len(cols)))
+
+
+@dataclass(frozen=True)
+class CoverageMatrices:
+    """Sparse incidence matrices over the catalog, with their axis labels."""
+
+    indicator_ids: list[str]
+    template_ids: list[str]
+    pattern_ids: list[str]
+    ref_ids: list[str]
+    frame_ids: list[str]
+    section_keys: list[str]
+    ind_tmpl: sparse.csr_matrix
+    ind_ev: sparse.csr_matrix
+    tmpl_ref: sparse.csr_matrix
+    tmpl_section: sparse.csr_matrix
+    frame_ind: sparse.csr_matrix
+
+    @classmethod
+    def from_catalog(cls, catalog: Catalog) -> CoverageMatrices:
+        indicator_ids = sorted(catalog.indicators)
+        template_ids = list(catalog.templates)
+        pattern_ids = list(catalog.evidence_patterns)
+        ref_ids = sorted(catalog.refs)
+        # Frames referenced by indicators but missing from frames.yaml still get a row
+        frame_ids = sorted(set(catalog.frames) | {i.get("frame", "unknown") for i in catalog.indicators.values()})
+        section_keys = list(
+            dict.fromkeys(catalog.section_keys + [t.get("section") for t in catalog.templates.values()])
+        )
+        section_keys = [s for s in section_keys if isinstance(s, str)]
+
+        tmpls = catalog.templates.items()
+        return cls(
+            indicator_ids=indicator_ids,
+            template_ids=template_ids,
+            pattern_ids=pattern_ids,
+            ref_ids=ref_ids,
+            frame_ids=frame_ids,
+            section_keys=section_keys,
+            ind_tmpl=incidence(
+                indicator_ids, template_ids, ((i, tid) for tid, t in tmpls for i in ensure_list(t.get("indicators")))
+            ),
+            ind_ev=incidence(
+                indicator_ids,
+                pattern_ids,
+                ((i, pid) for pid, p in catalog.evidence_patterns.items() for i in ensure_list(p.get("indicators"))),
+            ),
+            tmpl_ref=incidence(
+                template_ids, ref_ids, ((tid, r) for tid, t in tmpls for r in ensure_list(t.get("refs")))
+            ),
+            tmpl_section=incidence(template_ids, section_keys, ((tid, t.get("section")) for tid, t in tmpls)),
+            frame_ind=incidence(
+                frame_ids, indicator_ids, ((i.get("frame", "unknown"), iid) for iid, i in catalog.indicators.items())
+            ),
+        )
+
+
+@dataclass(frozen=True)
+class CoverageReport:
+    matrices: CoverageMatrices
+    templates_per_indicator: np.ndarray
+    patterns_per_indicator: np.ndarray
+    # indicator × section template counts
+    section_counts: np.ndarray
+    # frame -> (covered, total)
+    by_frame: dict[str, tuple[int, int]]
+    templates_without_refs: list[str]
+    # groups of templates sharing the same section and indicator set
+    redundant_groups: list[list[str]]
+
+    @property
+    def uncovered(self) -> list[str]:
+        ids = self.matrices.indicator_ids
+        return [ids[i] for i in np.flatnonzero(self.templates_per_indicator == 0)]
+
+    @property
+    def covered_count(self) -> int:
+        return int(np.count_nonzero(self.templates_per_indicator))
+
+    def section_gaps(self, section: str) -> list[str]:
+        """Indicators with no template in ``section``."""
+
+        col = self.matrices.section_keys.index(section)
+        ids = self.matrices.indicator_ids
+        return [ids[i] for i in np.flatnonzero(self.section_counts[:, col] == 0)]
+
+    @property
+    def indicators_without_evidence(self) -> list[str]:
+        ids = self.matrices.indicator_ids
+        return [ids[i] for i in np.flatnonzero(self.patterns_per_indicator == 0)]
+
 
-WORKSPACE_ROOT = Path(__file__).resolve().parents[1]
-YAML_LOADER = YAML(typ="safe")
+def compute_coverage(matrices: CoverageMatrices) -> CoverageReport:
+    m = matrices
+    ind_tmpl = m.ind_tmpl.astype(np.int32)
 
+    templates_per_indicator = np.asarray(ind_tmpl.sum(axis=1)).ravel()
+    patterns_per_indicator = np.asarray(m.ind_ev.astype(np.int32).sum(axis=1)).ravel()
+    section_counts = (ind_tmpl @ m.tmpl_section.astype(np.int32)).toarray()
 
-def load_yaml(path: Path) -> dict:
-    with path.open("r", encoding="utf-8") as handle:
-        data = YAML_LOADER.load(handle)
-    if not isinstance(data, dict):
-        raise TypeError(f"Expected mapping at root: {path}")
-    return data
+    covered = (templates_per_indicator > 0).astype(np.int32)
+    frame_ind = m.frame_ind.astype(np.int32)
+    frame_covered = frame_ind @ covered
+    frame_total = np.asarray(frame_ind.sum(axis=1)).ravel()
+    by_frame = {f: (int(c), int(t)) for f, c, t in zip(m.frame_ids, frame_covered, frame_total, strict=True) if t > 0}
 
+    refs_per_template = np.asarray(m.tmpl_ref.astype(np.int32).sum(axis=1)).ravel()
+    templates_without_refs = [m.template_ids[j] for j in np.flatnonzero(refs_per_template == 0)]
 
-def main() -> int:
-    strict_mode = "--strict" in sys.argv
+    # Two templates are redundant when their indicator sets match exactly and
+    # they target the same section: overlap == |a| == |b| on the Gram matrix.
+    tmpl_ind = ind_tmpl.T.tocsr()
+    sizes = np.asarray(tmpl_ind.sum(axis=1)).ravel()
+    same_section = m.tmpl_section.astype(np.int32) @ m.tmpl_section.astype(np.int32).T
+    overlap = (tmpl_ind @ tmpl_ind.T).multiply(same_section).tocoo()
+    mask = (overlap.row < overlap.col) & (overlap.data == sizes[overlap.row]) & (overlap.data == sizes[overlap.col])
+    pairs = sparse.csr_matrix(
+        (np.ones(int(mask.sum()), dtype=bool), (overlap.row[mask], overlap.col[mask])), shape=overlap.shape
+    )
+    _, labels = connected_components(pairs, directed=False)
+    sizes_by_label = np.bincount(labels)
+    redundant_groups = [
+        [m.template_ids[j] for j in np.flatnonzero(labels == label)]
+        for label in dict.fromkeys(labels[np.isin(labels, np.flatnonzero(sizes_by_label > 1))])
+    ]
 
-    # Load indicators
-    indicators_doc = load_yaml(WORKSPACE_ROOT / "taxonomy" / "indicators.yaml")
-    indicators = {i["id"]: i for i in indicators_doc.get("indicators", []) if isinstance(i, dict) and "id" in i}
+    return CoverageReport(
+        matrices=m,
+        templates_per_indicator=templates_per_indicator,
+        patterns_per_indicator=patterns_per_indicator,
+        section_counts=section_counts,
+        by_frame=by_frame,
+        templates_without_refs=templates_without_refs,
+        redundant_groups=redundant_groups,
+    )
 
-    # Load templates
-    templates_doc = load_yaml(WORKSPACE_ROOT / "templates" / "comment_templates.yaml")
-    templates = templates_doc.get("templates", [])
 
-    # Count references
-    indicator_refs: dict[str, list[str]] = defaultdict(list)
-    for tmpl in templates:
-        if not isinstance(tmpl, dict):
-            continue
-        tid = tmpl.get("id", "<missing>")
-        for ind_id in tmpl.get("indicators", []) or []:
-            indicator_refs[ind_id].append(tid)
+def _pct(covered: int, total: int) -> float:
+    return (covered / total * 100) if total > 0 else 0
 
-    # Analyze coverage
-    uncovered: list[str] = []
-    coverage_by_frame: dict[str, dict[str, int]] = defaultdict(lambda: {"total": 0, "covered": 0})
+
+def render_coverage_md(report: CoverageReport) -> str:
+    m = report.matrices
+    lines = [
+        "# Coverage Report",
+        "",
+        "Generated by `python scripts/coverage.py --reports`. Do not edit by hand.",
+        "",
+        "## Summary",
+        "",
+        f"- Indicators: {len(m.indicator_ids)}",
+        f"- Templates: {len(m.template_ids)}",
+        f"- Evidence patterns: {len(m.pattern_ids)}",
+        f"- Indicators covered: {report.covered_count}/{len(m.indicator_ids)} "
+        f"({_pct(report.covered_count, len(m.indicator_ids)):.0f}%)",
+        f"- Redundant template groups: {len(report.redundant_groups)}",
+        "",
+        "## Coverage by Frame",
+        "",
+        "| Frame | Covered | Total | Coverage |",
+        "|-------|---------|-------|----------|",
+    ]
+    for frame, (covered, total) in sorted(report.by_frame.items()):
+        lines.append(f"| `{frame}` | {covered} | {total} | {_pct(covered, total):.0f}% |")
+
+    header = " | ".join(m.section_keys)
+    lines += [
+        "",
+        "## Templates per Indicator",
+        "",
+        f"| Indicator | Templates | Evidence patterns | {header} |",
+        "|" + "---|" * (3 + len(m.section_keys)),
+    ]
+    for i, ind_id in enumerate(m.indicator_ids):
+        counts = " | ".join(str(int(c)) for c in report.section_counts[i])
+        lines.append(
+            f"| `{ind_id}` | {int(report.templates_per_indicator[i])} | {int(report.patterns_per_indicator[i])} "
+            f"| {counts} |"
+        )
+
+    lines += ["", "## Redundant Templates", ""]
+    if report.redundant_groups:
+        lines.append("Templates in each group share the same section and indicator set.")
+        lines.append("")
+        for group in report.redundant_groups:
+            lines.append("- " + ", ".join(f"`{t}`" for t in group))
+    else:
+        lines.append("None.")
+    return "\n".join(lines) + "\n"
+
+
+def render_gaps_md(report: CoverageReport) -> str:
+    m = report.matrices
+
+    def bullet_list(ids: list[str]) -> list[str]:
+        return [f"- `{i}`" for i in ids] if ids else ["None."]
+
+    lines = [
+        "# Coverage Gaps",
+        "",
+        "Generated by `python scripts/coverage.py --reports`. Do not edit by hand.",
+        "",
+        "## Indicators without templates",
+        "",
+        *bullet_list(report.uncovered),
+    ]
+    for section in m.section_keys:
+        lines += ["", f"## Indicators without a `{section}` template", "", *bullet_list(report.section_gaps(section))]
+    lines += [
+        "",
+        "## Indicators without evidence patterns",
+        "",
+        *bullet_list(report.indicators_without_evidence),
+        "",
+        "## Templates without references",
+        "",
+        *bullet_list(report.templates_without_refs),
+    ]
+    return "\n".join(lines) + "\n"
+
+
+def write_reports(report: CoverageReport, out_dir: Path = REPORTS_DIR) -> list[tuple[Path, bool]]:
+    """Write both reports, leaving unchanged files (and their mtimes) alone; returns (path, changed)."""
+
+    written = []
+    for name, text in (("coverage.md", render_coverage_md(report)), ("gaps.md", render_gaps_md(report))):
+        path = out_dir / name
+        written.append((path, write_if_changed(path, text.encode("utf-8"))))
+    return written
+
+
+def main(argv: list[str] | None = None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    strict_mode = "--strict" in argv
+
+    report = compute_coverage(CoverageMatrices.from_catalog(load_catalog()))
+    m = report.matrices
 
     print("=" * 60)
     print("INDICATOR COVERAGE REPORT")
     print("=" * 60)
     print()
 
-    for ind_id, ind in sorted(indicators.items()):
-        frame = ind.get("frame", "unknown")
-        coverage_by_frame[frame]["total"] += 1
-
-        ref_count = len(indicator_refs.get(ind_id, []))
-        if ref_count == 0:
-            uncovered.append(ind_id)
-        else:
-            coverage_by_frame[frame]["covered"] += 1
-
+    for ind_id, ref_count in zip(m.indicator_ids, report.templates_per_indicator, strict=True):
         status = "OK" if ref_count > 0 else "MISSING"
         print(f"  {status} {ind_id}: {ref_count} template(s)")
 
@@ -79,30 +302,37 @@ def main() -> int:
     print("COVERAGE BY FRAME")
     print("-" * 60)
 
-    total_indicators = 0
-    total_covered = 0
+    for frame, (covered, total) in sorted(report.by_frame.items()):
+        print(f"  {frame}: {covered}/{total} ({_pct(covered, total):.0f}%)")
 
-    for frame, counts in sorted(coverage_by_frame.items()):
-        total = counts["total"]
-        covered = counts["covered"]
-        pct = (covered / total * 100) if total > 0 else 0
-        total_indicators += total
-        total_covered += covered
-        print(f"  {frame}: {covered}/{total} ({pct:.0f}%)")
+    total_indicators = len(m.indicator_ids)
+    print()
+    print(f"  OVERALL: {report.covered_count}/{total_indicators} ({_pct(report.covered_count, total_indicators):.0f}%)")
 
-    overall_pct = (total_covered / total_indicators * 100) if total_indicators > 0 else 0
     print()
-    print(f"  OVERALL: {total_covered}/{total_indicators} ({overall_pct:.0f}%)")
+    print("-" * 60)
+    print("SECTIONS")
+    print("-" * 60)
+    for section in m.section_keys:
+        gaps = report.section_gaps(section)
+        print(f"  {section}: {total_indicators - len(gaps)}/{total_indicators} indicators have a template")
+    print(f"  Redundant template groups: {len(report.redundant_groups)}")
 
+    uncovered = report.uncovered
     print()
     print("-" * 60)
     print("SUMMARY")
     print("-" * 60)
-    print(f"  Total indicators: {len(indicators)}")
-    print(f"  Total templates: {len(templates)}")
+    print(f"  Total indicators: {total_indicators}")
+    print(f"  Total templates: {len(m.template_ids)}")
     print(f"  Uncovered indicators: {len(uncovered)}")
     print(f"  Mode: {'STRICT' if strict_mode else 'REPORT'}")
 
+    if "--reports" in argv:
+        print()
+        for path, changed in write_reports(report):
+            print(f"{'Generated' if changed else 'Unchanged'} {path.relative_to(WORKSPACE_ROOT)}")
+
     if uncovered:
         print()
         print("UNCOVERED INDICATORS:")
@@ -0,0 +1,137 @@
+"""Parse the structured body of evidence-pattern Markdown files.
+
+Evidence patterns (evidence/evidence.pattern.*.md) carry their most useful
+content below the front matter:
+
+- "## Observable Behaviors (Signals)": a table of indicator → behaviors
+- "## Teacher Moves (Prompts)": a bullet list of prompts
+- "## Sample Observation Note (Template)": a blockquote template
+
+`parse_evidence_body` turns that into typed records in a single pass over the
+lines. `check_body_indicators` cross-checks the table against the front
+matter `indicators` list.
+
+This module has no dependencies on the other scripts so validate.py,
+generate_matrix.py and catalog.py can all import it.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+
+_PAREN_RE = re.compile(r"\([^)]*\)")
+_SECTION_KEYS = {
+    "context": "context",
+    "observable behaviors": "behaviors",
+    "teacher moves": "prompts",
+    "sample observation note": "sample_note",
+}
+
+
+@dataclass(frozen=True)
+class BehaviorRecord:
+    pattern_id: str
+    indicator_id: str
+    text: str
+    behaviors: tuple[str, ...]
+    line: int
+
+
+@dataclass(frozen=True)
+class PromptRecord:
+    pattern_id: str
+    prompt: str
+    line: int
+
+
+@dataclass(frozen=True)
+class EvidenceBody:
+    pattern_id: str
+    context: str = ""
+    behaviors: tuple[BehaviorRecord, ...] = ()
+    prompts: tuple[PromptRecord, ...] = ()
+    sample_note: str = ""
+
+    @property
+    def table_indicators(self) -> list[str]:
+        return [b.indicator_id for b in self.behaviors]
+
+
+def split_behaviors(cell: str) -> list[str]:
+    """Split a behaviors table cell into individual phrases (parentheticals dropped)."""
+
+    cell = _PAREN_RE.sub("", cell)
+    return [p.strip() for p in re.split(r"[,.;]", cell) if p.strip()]
+
+
+def _section_for(heading: str) -> str | None:
+    lowered = heading.lower()
+    for prefix, key in _SECTION_KEYS.items():
+        if lowered.startswith(prefix):
+            return key
+    return None
+
+
+def parse_evidence_body(body: str, pattern_id: str, first_line: int = 1) -> EvidenceBody:
+    """Extract context, behaviors, prompts and sample note from a pattern body.
+
+    ``first_line`` is the 1-based line number of ``body`` within its file, so
+    record ``line`` values point at the real file location.
+    """
+
+    section: str | None = None
+    context: list[str] = []
+    sample: list[str] = []
+    behaviors: list[BehaviorRecord] = []
+    prompts: list[PromptRecord] = []
+
+    for offset, raw in enumerate(body.splitlines()):
+        line = raw.strip()
+        lineno = first_line + offset
+        if line.startswith("## "):
+            section = _section_for(line[3:].strip())
+            continue
+        if not line or section is None:
+            continue
+
+        if section == "context":
+            context.append(line)
+        elif section == "behaviors" and line.startswith("|"):
+            cells = [c.strip() for c in line.strip("|").split("|")]
+            if len(cells) < 2 or set(cells[0]) <= set("-: ") or cells[0].lower() == "indicator":
+                continue
+            indicator_id = cells[0].strip("`")
+            text = " | ".join(cells[1:]).strip()
+            behaviors.append(BehaviorRecord(pattern_id, indicator_id, text, tuple(split_behaviors(text)), lineno))
+        elif section == "prompts" and line.startswith(("- ", "* ")):
+            prompt = line[2:].strip().strip('"').strip("“”")
+            if prompt:
+                prompts.append(PromptRecord(pattern_id, prompt, lineno))
+        elif section == "sample_note" and line.startswith(">"):
+            sample.append(line.lstrip(">").strip())
+
+    return EvidenceBody(
+        pattern_id=pattern_id,
+        context=" ".join(context),
+        behaviors=tuple(behaviors),
+        prompts=tuple(prompts),
+        sample_note=" ".join(sample),
+    )
+
+
+def check_body_indicators(front_matter: dict, body: EvidenceBody) -> list[str]:
+    """Compare the behaviors table's indicator column with front matter ``indicators``."""
+
+    declared = [i for i in front_matter.get("indicators") or [] if isinstance(i, str)]
+    in_table = body.table_indicators
+    errors: list[str] = []
+
+    for ind_id in sorted(set(in_table) - set(declared)):
+        errors.append(f"Evidence pattern {body.pattern_id}: table lists {ind_id} but front matter does not")
+    for ind_id in sorted(set(declared) - set(in_table)):
+        errors.append(f"Evidence pattern {body.pattern_id}: front matter lists {ind_id} but table has no row for it")
+    duplicates = sorted({i for i in in_table if in_table.count(i) > 1})
+    for ind_id in duplicates:
+        errors.append(f"Evidence pattern {body.pattern_id}: table lists {ind_id} more than once")
+    return errors
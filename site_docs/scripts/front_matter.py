@@ -0,0 +1,100 @@
+"""Read Markdown front matter without reading the whole file.
+
+`read_header` reads from the start of the file in growing chunks (4 KiB,
+then doubling) until the closing `---` line is found, so metadata-only
+passes over large documents stay I/O-light. It stops with an error once
+MAX_HEADER_BYTES have been read without a terminator, or as soon as the
+file does not start with `---`.
+
+The delimiters follow the pattern validate.py has always used
+(`---` line, YAML, `---` line). `Header.offset` is the byte offset where the
+body starts, so body scanners can resume from there with `read_body`.
+
+`read_front_matter` parses the header into a mapping (dates normalized to
+ISO strings). The module imports only yaml_backend.py, so validate.py and
+generate_matrix.py can both use it.
+"""
+
+from __future__ import annotations
+
+import io
+import re
+from dataclasses import dataclass
+from pathlib import Path
+
+from scripts.yaml_backend import load, normalize_yaml_scalars
+
+_FRONT_MATTER_RE = re.compile(rb"\A---\s*\n(.*?)\n---\s*\n", re.DOTALL)
+
+FIRST_CHUNK = 4096
+MAX_HEADER_BYTES = 256 * 1024
+
+
+@dataclass(frozen=True)
+class Header:
+    # YAML text between the delimiters
+    yaml: str
+    # Byte offset of the first body byte
+    offset: int
+    # 1-based line number of the first body line
+    line: int
+
+
+def split_header(data: bytes, complete: bool = True) -> Header | None:
+    """Find the front matter at the start of ``data``.
+
+    With ``complete=False`` (``data`` is a prefix of the file), a match whose
+    closing delimiter could still grow (only whitespace after it) is not
+    trusted and None is returned so the caller reads more.
+    """
+
+    match = _FRONT_MATTER_RE.match(data)
+    if not match or (not complete and not data[match.end() :].strip()):
+        return None
+    offset = match.end()
+    return Header(match.group(1).decode("utf-8"), offset, data.count(b"\n", 0, offset) + 1)
+
+
+def read_header(path: Path, max_bytes: int = MAX_HEADER_BYTES) -> Header:
+    """Read only as much of ``path`` as needed to parse its front matter."""
+
+    data = b""
+    chunk = FIRST_CHUNK
+    with path.open("rb") as handle:
+        while True:
+            block = handle.read(chunk)
+            data += block
+            eof = not block
+            if not data.startswith(b"---"[: len(data)]) or (eof and len(data) < 3):
+                raise ValueError(f"Missing YAML front matter: {path}")
+            header = split_header(data, complete=eof)
+            if header is not None:
+                return header
+            if eof:
+                raise ValueError(f"Missing YAML front matter: {path}")
+            if len(data) >= max_bytes:
+                raise ValueError(f"Front matter larger than {max_bytes} bytes: {path}")
+            chunk = min(chunk * 2, max_bytes - len(data))
+
+
+def read_body(path: Path, offset: int) -> str:
+    """Body text from byte ``offset`` on, with the same newline handling as ``Path.read_text``."""
+
+    with path.open("rb") as handle:
+        handle.seek(offset)
+        return io.TextIOWrapper(handle, encoding="utf-8").read()
+
+
+def front_matter_data(yaml_text: str, source: Path) -> dict:
+    """Parse front matter YAML, which must be a mapping."""
+
+    data = load(yaml_text)
+    if not isinstance(data, dict):
+        raise TypeError(f"Front matter must be a mapping: {source}")
+    return normalize_yaml_scalars(data)
+
+
+def read_front_matter(markdown_path: Path) -> dict:
+    """Read only the front matter (bounded read; the body is never loaded)."""
+
+    return front_matter_data(read_header(markdown_path).yaml, markdown_path)
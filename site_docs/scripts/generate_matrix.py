@@ -5,6 +5,15 @@ Usage: python scripts/generate_matrix.py
 Builds a traceability matrix linking:
 Frames → Indicators → Evidence Patterns → Comment Templates → References.
 
+Also exports the structured evidence-pattern bodies (see scripts/evidence_body.py):
+- evidence_behaviors.{csv,parquet}: one row per indicator behavior phrase
+- evidence_prompts.{csv,parquet}: one row per teacher prompt
+
+Outputs are content-stable: no dates inside them, and files are only rewritten
+when their bytes change. The generation date of each CSV lives in the
+generated.json sidecar (see scripts/artifacts.py); Parquet files are local
+builds and are not listed there.
+
 Notes:
 - No network calls.
 - Evidence pattern selection is heuristic:
@@ -15,39 +24,67 @@ Notes:
 
 from __future__ import annotations
 
+import io
 import json
-import re
-from datetime import date
+import sys
 from pathlib import Path
 
 import pandas as pd
-from ruamel.yaml import YAML
-
-WORKSPACE_ROOT = Path(__file__).resolve().parents[1]
-YAML_LOADER = YAML(typ="safe")
-
-_FRONT_MATTER_RE = re.compile(r"\A---\s*\n(.*?)\n---\s*\n", re.DOTALL)
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 
-def load_yaml(path: Path) -> dict:
-    with path.open("r", encoding="utf-8") as handle:
-        data = YAML_LOADER.load(handle)
-    if data is None:
-        raise ValueError(f"Empty YAML file: {path}")
-    if not isinstance(data, dict):
-        raise TypeError(f"Expected YAML mapping at root: {path}")
-    return data
+from scripts.artifacts import GeneratedFiles, write_if_changed
+from scripts.evidence_body import EvidenceBody, parse_evidence_body
+from scripts.front_matter import front_matter_data, read_body, read_header
+from scripts.loaders import load_yaml
+from scripts.template_library import load_library
 
+WORKSPACE_ROOT = Path(__file__).resolve().parents[1]
 
-def read_front_matter(markdown_path: Path) -> dict:
-    text = markdown_path.read_text(encoding="utf-8")
-    match = _FRONT_MATTER_RE.match(text)
-    if not match:
-        raise ValueError(f"Missing YAML front matter: {markdown_path}")
-    data = YAML_LOADER.load(match.group(1))
-    if not isinstance(data, dict):
-        raise TypeError(f"Front matter must be a mapping: {markdown_path}")
-    return data
+MATRIX_COLUMNS = [
+    "frame_id",
+    "frame_name",
+    "indicator_id",
+    "indicator_name",
+    "evidence_pattern_id",
+    "evidence_pattern_title",
+    "template_id",
+    "section",
+    "ref_ids",
+]
+
+
+def read_markdown(markdown_path: Path) -> tuple[dict, str, int]:
+    """Return (front matter, body text, body first line number)."""
+    header = read_header(markdown_path)
+    data = front_matter_data(header.yaml, markdown_path)
+    return data, read_body(markdown_path, header.offset), header.line
+
+
+def write_table(rows: list[dict], columns: list[str], files: GeneratedFiles, stem: str) -> list[str]:
+    """Write rows as CSV (list columns JSON-encoded) and, when possible, Parquet.
+
+    Returns the names of files whose content changed.
+    """
+    df = pd.DataFrame(rows, columns=columns)
+    changed = []
+    df_csv = df.copy()
+    for col in columns:
+        if df_csv[col].map(lambda v: isinstance(v, list)).any():
+            df_csv[col] = df_csv[col].apply(json.dumps)
+    if files.write(f"{stem}.csv", df_csv.to_csv(index=False, lineterminator="\n").encode("utf-8")):
+        changed.append(f"{stem}.csv")
+    try:
+        buffer = io.BytesIO()
+        df.to_parquet(buffer, index=False)
+    except Exception as exc:  # pragma: no cover
+        print(f"WARN: Parquet write failed for {stem} ({exc}); CSV still generated.")
+    else:
+        # Parquet files are local builds (not committed; their bytes vary with the pyarrow
+        # version), so they stay out of the committed generated.json sidecar
+        if write_if_changed(files.out_dir / f"{stem}.parquet", buffer.getvalue()):
+            changed.append(f"{stem}.parquet")
+    return changed
 
 
 def ensure_list(value) -> list:
@@ -59,16 +96,13 @@ def ensure_list(value) -> list:
 
 
 def main() -> int:
-    today = date.today().isoformat()
-
     indicators_path = WORKSPACE_ROOT / "taxonomy" / "indicators.yaml"
     frames_path = WORKSPACE_ROOT / "taxonomy" / "frames.yaml"
-    templates_path = WORKSPACE_ROOT / "templates" / "comment_templates.yaml"
     bibliography_path = WORKSPACE_ROOT / "references" / "bibliography.yaml"
 
     indicators = load_yaml(indicators_path).get("indicators", [])
     frames = load_yaml(frames_path).get("frames", [])
-    templates = load_yaml(templates_path).get("templates", [])
+    templates = load_library(WORKSPACE_ROOT).all_templates
     bibliography = load_yaml(bibliography_path).get("references", [])
 
     indicator_by_id = {i["id"]: i for i in indicators if isinstance(i, dict) and "id" in i}
@@ -77,8 +111,10 @@ def main() -> int:
 
     evidence_dir = WORKSPACE_ROOT / "evidence"
     evidence_patterns: list[dict] = []
+    evidence_bodies: list[tuple[dict, EvidenceBody]] = []
     for path in sorted(evidence_dir.glob("evidence.pattern.*.md")):
-        fm = read_front_matter(path)
+        fm, body_text, first_line = read_markdown(path)
+        evidence_bodies.append((fm, parse_evidence_body(body_text, fm.get("id") or path.stem, first_line)))
         evidence_patterns.append(
             {
                 "id": fm.get("id"),
@@ -133,11 +169,10 @@ def main() -> int:
                     "template_id": template_id,
                     "section": section,
                     "ref_ids": merged_refs,
-                    "generated": today,
                 }
             )
 
-    df = pd.DataFrame(rows)
+    df = pd.DataFrame(rows, columns=MATRIX_COLUMNS)
 
     # Basic sanity checks (fail fast with clear errors)
     missing_indicators = sorted({r["indicator_id"] for r in rows if r["indicator_id"] not in indicator_by_id})
@@ -156,23 +191,51 @@ def main() -> int:
     out_dir = WORKSPACE_ROOT / "datasets" / "traceability"
     out_dir.mkdir(parents=True, exist_ok=True)
 
-    csv_path = out_dir / "matrix.csv"
-    parquet_path = out_dir / "matrix.parquet"
-
-    # CSV: store ref_ids as JSON for lossless round-trip
-    df_csv = df.copy()
-    df_csv["ref_ids"] = df_csv["ref_ids"].apply(json.dumps)
-    df_csv.to_csv(csv_path, index=False, encoding="utf-8")
-
-    # Parquet: keep ref_ids as a list column when possible
-    try:
-        df.to_parquet(parquet_path, index=False)
-    except Exception as exc:  # pragma: no cover
-        print(f"WARN: Parquet write failed ({exc}); CSV still generated.")
+    files = GeneratedFiles(out_dir, generator="scripts/generate_matrix.py")
+    changed = write_table(rows, list(df.columns), files, "matrix")
+
+    behavior_rows: list[dict] = []
+    prompt_rows: list[dict] = []
+    for fm, body in evidence_bodies:
+        for record in body.behaviors:
+            for position, behavior in enumerate(record.behaviors, start=1):
+                behavior_rows.append(
+                    {
+                        "evidence_pattern_id": body.pattern_id,
+                        "frame_id": fm.get("frame"),
+                        "indicator_id": record.indicator_id,
+                        "position": position,
+                        "behavior": behavior,
+                    }
+                )
+        indicator_ids = list(dict.fromkeys(ensure_list(fm.get("indicators")) + body.table_indicators))
+        for position, record in enumerate(body.prompts, start=1):
+            prompt_rows.append(
+                {
+                    "evidence_pattern_id": body.pattern_id,
+                    "frame_id": fm.get("frame"),
+                    "position": position,
+                    "prompt": record.prompt,
+                    "indicator_ids": indicator_ids,
+                }
+            )
 
-    print(f"Generated {csv_path.relative_to(WORKSPACE_ROOT)}")
-    if parquet_path.exists():
-        print(f"Generated {parquet_path.relative_to(WORKSPACE_ROOT)}")
+    for rows_out, columns, name in (
+        (
+            behavior_rows,
+            ["evidence_pattern_id", "frame_id", "indicator_id", "position", "behavior"],
+            "evidence_behaviors",
+        ),
+        (prompt_rows, ["evidence_pattern_id", "frame_id", "position", "prompt", "indicator_ids"], "evidence_prompts"),
+    ):
+        changed += write_table(rows_out, columns, files, name)
+    files.save()
+
+    out_rel = out_dir.relative_to(WORKSPACE_ROOT)
+    for stem in ("matrix", "evidence_behaviors", "evidence_prompts"):
+        for name in (f"{stem}.csv", f"{stem}.parquet"):
+            if (out_dir / name).exists():
+                print(f"{'Generated' if name in changed else 'Unchanged'} {out_rel / name}")
 
     return 0
 
@@ -0,0 +1,370 @@
+"""Change-impact analysis for taxonomy, template and reference edits.
+
+Usage:
+  python scripts/impact.py indicator.belonging.relationships
+  python scripts/impact.py ref.ontario.kindergarten.program.2016 --locations
+  python scripts/impact.py --diff origin/main              # PR summary (Markdown)
+  python scripts/impact.py --diff origin/main --out impact.md
+
+Answers "what breaks if this ID is renamed or retired?". Two precomputed
+structures back each query:
+
+- A reverse reference index (build/impact_index.json): every ID-shaped token
+  in canonical Markdown, YAML and CSV files, with its file, line and the
+  artifact it sits in (YAML list item, document or matrix row). It is stored
+  per file and refreshed incrementally: only files whose size or mtime changed
+  are re-read.
+- The link graph (scripts/link_graph.py), whose impact sets give the
+  transitive closure: templates citing an indicator, matrix rows for those
+  templates, and so on.
+
+With --diff, IDs whose `id:` line was removed (retired or renamed) and
+artifacts containing changed lines are read from `git diff` of the canonical
+files, and a Markdown summary suitable for a PR comment is printed.
+
+Scope: local files and git only. No network calls.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from scripts.artifacts import write_if_changed
+from scripts.catalog import WORKSPACE_ROOT
+from scripts.link_graph import DEFAULT_GRAPH, LinkGraph, load_or_build
+from scripts.workspace_index import WorkspaceIndex
+
+DEFAULT_INDEX = WORKSPACE_ROOT / "build" / "impact_index.json"
+INDEX_VERSION = 1
+
+INDEXED_SUFFIXES = (".md", ".yaml", ".yml", ".csv")
+SKIP_TOP_LEVEL = frozenset({"site_docs", "build", "site", "tests"})
+# Files whose edits are reported by --diff
+CANONICAL_PATHS = ("taxonomy", "templates", "evidence", "references/bibliography.yaml", "knowledge", "guidance")
+
+# Prefixes from the ID naming convention (docs/infrastructure.md), plus CoL sections and processes
+_ID_RE = re.compile(
+    r"(?<![\w.])(?:doc|ref|entity|frame|indicator|evidence|template|req|col_section|process)"
+    r"(?:\.[a-z0-9_-]+)+"
+)
+_FILE_SUFFIX_RE = re.compile(r"\.(?:md|ya?ml|csv|json)$")
+_YAML_ITEM_ID_RE = re.compile(r"^\s*-\s+id:\s*['\"]?([^'\"\s#]+)")
+_DEF_ID_RE = re.compile(r"^\s*(?:-\s+)?id:\s*['\"]?([^'\"\s#]+)")
+_HUNK_RE = re.compile(r"^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@")
+
+# Locations listed per ID in the PR summary
+MAX_LISTED = 50
+# First line of the summary; CI finds and updates its own PR comment by it
+COMMENT_MARKER = "<!-- change-impact -->"
+
+# Rows of the traceability matrix; other CSVs (evidence behaviors, prompts) are "dataset rows"
+MATRIX_CSV = "datasets/traceability/matrix.csv"
+
+CATEGORIES = ("templates", "evidence patterns", "matrix rows", "dataset rows", "indicators", "documents", "other")
+
+
+def scan_ids(line: str) -> list[str]:
+    """ID-shaped tokens on a line; file names such as evidence.pattern.x.md count as their ID."""
+
+    return [_FILE_SUFFIX_RE.sub("", m.group(0)) for m in _ID_RE.finditer(line)]
+
+
+def line_artifacts(rel: str, text: str) -> list[str]:
+    """The artifact each line (1-based, index 0 unused) of a canonical file belongs to."""
+
+    lines = text.splitlines()
+    owners = [rel]
+    if rel.endswith(".md"):
+        match = re.search(r"^id:\s*['\"]?([^'\"\s#]+)", text.split("\n---", 1)[0], re.MULTILINE)
+        owner = match.group(1) if text.startswith("---") and match else rel
+        owners.extend(owner for _ in lines)
+    elif rel.endswith(".csv"):
+        owners.append(rel)
+        owners.extend(f"{rel}:{n}" for n in range(2, len(lines) + 1))
+    else:
+        current = rel
+        for line in lines:
+            match = _YAML_ITEM_ID_RE.match(line)
+            if match:
+                current = match.group(1)
+            elif line and not line[0].isspace() and not line.startswith("#"):
+                # A new top-level key ends the previous list item
+                current = rel
+            owners.append(current)
+    return owners
+
+
+@dataclass(frozen=True)
+class Location:
+    path: str
+    line: int
+    artifact: str
+
+    def __str__(self) -> str:
+        owner = "" if self.artifact.startswith(self.path) else f" ({self.artifact})"
+        return f"{self.path}:{self.line}{owner}"
+
+
+def category(location: Location) -> str:
+    if location.path == MATRIX_CSV:
+        return "matrix rows"
+    if location.path.endswith(".csv"):
+        return "dataset rows"
+    artifact = location.artifact
+    if artifact.startswith("template."):
+        return "templates"
+    if artifact.startswith("evidence.pattern."):
+        return "evidence patterns"
+    if artifact.startswith("indicator."):
+        return "indicators"
+    if location.path.endswith(".md"):
+        return "documents"
+    return "other"
+
+
+@dataclass
+class ImpactIndex:
+    """Per-file reference records, plus the ID -> locations reverse index built from them."""
+
+    root: Path
+    # rel -> {"stat": [size, mtime_ns], "refs": [[id, line, artifact], ...]}
+    files: dict[str, dict] = field(default_factory=dict)
+    _by_id: dict[str, list[Location]] | None = field(default=None, init=False, repr=False)
+
+    @staticmethod
+    def index_file(rel: str, text: str) -> list[list]:
+        owners = line_artifacts(rel, text)
+        refs = []
+        for number, line in enumerate(text.splitlines(), start=1):
+            for item_id in dict.fromkeys(scan_ids(line)):
+                if item_id != owners[number]:
+                    refs.append([item_id, number, owners[number]])
+        return refs
+
+    def refresh(self, workspace: WorkspaceIndex | None = None) -> list[str]:
+        """Re-read files added or changed since the last refresh; returns the paths that changed."""
+
+        workspace = workspace or WorkspaceIndex.scan(self.root, with_stat=True)
+        changed = []
+        seen = set()
+        for rel in workspace.iter_files():
+            top = rel.split("/", 1)[0]
+            if not rel.endswith(INDEXED_SUFFIXES) or top in SKIP_TOP_LEVEL or top.startswith("."):
+                continue
+            seen.add(rel)
+            st = workspace.stats.get(rel) or (self.root / rel).stat()
+            stamp = [st.st_size, st.st_mtime_ns]
+            if self.files.get(rel, {}).get("stat") == stamp:
+                continue
+            text = (self.root / rel).read_text(encoding="utf-8", errors="replace")
+            self.files[rel] = {"stat": stamp, "refs": self.index_file(rel, text)}
+            changed.append(rel)
+        removed = [rel for rel in self.files if rel not in seen]
+        for rel in removed:
+            del self.files[rel]
+        if changed or removed:
+            self._by_id = None
+        return changed + removed
+
+    @property
+    def by_id(self) -> dict[str, list[Location]]:
+        if self._by_id is None:
+            by_id: dict[str, list[Location]] = defaultdict(list)
+            for rel in sorted(self.files):
+                for item_id, line, artifact in self.files[rel]["refs"]:
+                    by_id[item_id].append(Location(rel, line, artifact))
+            self._by_id = dict(by_id)
+        return self._by_id
+
+    def locations(self, item_id: str) -> list[Location]:
+        return self.by_id.get(item_id, [])
+
+    def save(self, path: Path = DEFAULT_INDEX) -> bool:
+        data = {"version": INDEX_VERSION, "files": self.files}
+        return write_if_changed(path, json.dumps(data, sort_keys=True, separators=(",", ":")).encode("utf-8"))
+
+    @classmethod
+    def load(cls, path: Path = DEFAULT_INDEX, root: Path = WORKSPACE_ROOT) -> ImpactIndex:
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return cls(root)
+        if data.get("version") != INDEX_VERSION:
+            return cls(root)
+        return cls(root, data["files"])
+
+
+@dataclass
+class ImpactReport:
+    item_id: str
+    # Lines mentioning the ID itself
+    direct: list[Location]
+    # IDs that transitively depend on it (link graph impact set)
+    dependents: list[str]
+    # Lines mentioning the ID or any dependent
+    locations: list[Location]
+
+    def by_category(self) -> dict[str, set[str]]:
+        """Affected artifacts (matrix rows as path:line) per category."""
+
+        groups: dict[str, set[str]] = {c: set() for c in CATEGORIES}
+        for location in self.locations:
+            groups[category(location)].add(location.artifact)
+        return groups
+
+
+def analyze(item_id: str, index: ImpactIndex, graph: LinkGraph) -> ImpactReport:
+    dependents = graph.impact(item_id) if item_id in graph else []
+    locations = [loc for i in (item_id, *dependents) for loc in index.locations(i)]
+    # Lines inside the changed artifact itself are not impact
+    locations = sorted({loc for loc in locations if loc.artifact != item_id}, key=lambda c: (c.path, c.line))
+    return ImpactReport(item_id, index.locations(item_id), dependents, locations)
+
+
+def load_state(
+    root: Path = WORKSPACE_ROOT, index_path: Path = DEFAULT_INDEX, graph_path: Path = DEFAULT_GRAPH
+) -> tuple[ImpactIndex, LinkGraph]:
+    """Load the reverse index and link graph, refreshing both when canonical files changed."""
+
+    index = ImpactIndex.load(index_path, root)
+    if index.refresh():
+        index.save(index_path)
+    graph, _ = load_or_build(graph_path, root)
+    return index, graph
+
+
+@dataclass
+class DiffChanges:
+    removed: list[str]
+    added: list[str]
+    modified: list[str]
+
+
+def _git(root: Path, *args: str) -> str:
+    return subprocess.run(["git", *args], cwd=root, capture_output=True, text=True, check=True).stdout
+
+
+def diff_changes(base: str, head: str | None = None, root: Path = WORKSPACE_ROOT) -> DiffChanges:
+    """IDs removed, added and modified between ``base`` and ``head`` (default: working tree)."""
+
+    revs = [base] if head is None else [base, head]
+    diff = _git(root, "diff", "--unified=0", "--no-color", "--no-renames", *revs, "--", *CANONICAL_PATHS)
+    removed: set[str] = set()
+    added: set[str] = set()
+    touched: dict[str, set[int]] = defaultdict(set)
+    path = None
+    for line in diff.splitlines():
+        if line.startswith("+++ "):
+            path = line[6:] if line.startswith("+++ b/") else None
+        elif line.startswith("--- "):
+            continue
+        elif (match := _HUNK_RE.match(line)) and path:
+            start, count = int(match.group(3)), int(match.group(4) or 1)
+            # Pure deletions report the line before the gap; attribute them to the next line
+            touched[path].update(range(start, start + count) if count else [start + 1])
+        elif line.startswith("-") and (match := _DEF_ID_RE.match(line[1:])):
+            removed.add(match.group(1))
+        elif line.startswith("+") and (match := _DEF_ID_RE.match(line[1:])):
+            added.add(match.group(1))
+
+    modified: set[str] = set()
+    for rel, lines in touched.items():
+        try:
+            text = _git(root, "show", f"{head}:{rel}") if head else (root / rel).read_text(encoding="utf-8")
+        except (subprocess.CalledProcessError, OSError):
+            continue
+        owners = line_artifacts(rel, text)
+        modified.update(owners[n] for n in lines if 0 < n < len(owners))
+    return DiffChanges(
+        removed=sorted(removed - added),
+        added=sorted(added - removed),
+        modified=sorted(modified - added - removed - set(touched)),
+    )
+
+
+def render_summary(changes: DiffChanges, reports: dict[str, ImpactReport]) -> str:
+    """Markdown impact summary for a PR comment."""
+
+    lines = [COMMENT_MARKER, "## Change impact", ""]
+    if not reports and not changes.added:
+        lines.append("No canonical IDs changed.")
+        return "\n".join(lines) + "\n"
+    if changes.added:
+        lines += [f"**Added:** {', '.join(f'`{i}`' for i in changes.added)}", ""]
+    if reports:
+        lines += [
+            "| Changed ID | Change | " + " | ".join(c.capitalize() for c in CATEGORIES) + " |",
+            "|---|---|" + "---:|" * len(CATEGORIES),
+        ]
+        for item_id, report in reports.items():
+            change = "removed/renamed" if item_id in changes.removed else "modified"
+            counts = report.by_category()
+            lines.append(f"| `{item_id}` | {change} | " + " | ".join(str(len(counts[c])) for c in CATEGORIES) + " |")
+        lines.append("")
+    for item_id in changes.removed:
+        report = reports[item_id]
+        if report.direct:
+            lines.append(
+                f"> **`{item_id}`** was removed or renamed but is still referenced {len(report.direct)} times."
+            )
+            lines.append("")
+    for item_id, report in reports.items():
+        if not report.locations:
+            continue
+        lines += [f"<details><summary><code>{item_id}</code>: {len(report.locations)} locations</summary>", ""]
+        lines += [f"- `{location}`" for location in report.locations[:MAX_LISTED]]
+        if len(report.locations) > MAX_LISTED:
+            lines.append(f"- … and {len(report.locations) - MAX_LISTED} more")
+        lines += ["", "</details>", ""]
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Show what an ID change affects.")
+    parser.add_argument("ids", nargs="*", help="IDs to analyze")
+    parser.add_argument("--diff", metavar="BASE[..HEAD]", help="Analyze IDs changed since BASE (PR summary)")
+    parser.add_argument("--locations", action="store_true", help="List every affected line")
+    parser.add_argument("--out", type=Path, help="Write the --diff summary to a file")
+    args = parser.parse_args(argv)
+    if not args.ids and not args.diff:
+        parser.error("give one or more IDs or --diff BASE")
+
+    start = time.perf_counter()
+    index, graph = load_state()
+    loaded = time.perf_counter()
+
+    if args.diff:
+        base, _, head = args.diff.partition("..")
+        changes = diff_changes(base, head or None)
+        reports = {i: analyze(i, index, graph) for i in changes.removed + changes.modified}
+        summary = render_summary(changes, reports)
+        if args.out:
+            args.out.write_text(summary, encoding="utf-8")
+        print(summary, end="")
+        return 0
+
+    for item_id in args.ids:
+        report = analyze(item_id, index, graph)
+        print(f"{item_id}: {len(report.direct)} direct references, {len(report.dependents)} dependents")
+        for name, members in report.by_category().items():
+            if members:
+                print(f"  {name}: {len(members)}")
+        if args.locations:
+            for location in report.locations:
+                print(f"    {location}")
+    print(f"(loaded in {(loaded - start) * 1000:.1f} ms, queried in {(time.perf_counter() - loaded) * 1000:.1f} ms)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
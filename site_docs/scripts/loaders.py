@@ -0,0 +1,46 @@
+"""YAML/JSON loading and JSON Schema checks shared across the scripts.
+
+validate.py, template_library.py and the generators load canonical files with
+`load_yaml` and check them with `validate`. These live here, importing only
+yaml_backend.py, so template_library.py does not import validate.py (which
+itself loads the template library) and neither side needs function-local
+imports.
+
+Scope: local files only. No network calls.
+"""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from jsonschema import Draft202012Validator
+
+from scripts.yaml_backend import load_file
+
+SCHEMAS_DIR = Path(__file__).resolve().parents[1] / "schemas"
+
+
+def load_json(path: Path) -> dict:
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def load_yaml(path: Path) -> dict:
+    data = load_file(path)
+    if data is None:
+        raise ValueError(f"Empty YAML file: {path}")
+    if not isinstance(data, dict):
+        raise TypeError(f"Expected YAML mapping at root: {path}")
+    return data
+
+
+def validate(instance: dict, schema_path: Path) -> list[str]:
+    schema = load_json(schema_path)
+    validator = Draft202012Validator(schema)
+    errors = sorted(validator.iter_errors(instance), key=lambda e: e.path)
+    messages: list[str] = []
+    for error in errors:
+        loc = "/".join(str(p) for p in error.path)
+        prefix = f"{loc}: " if loc else ""
+        messages.append(prefix + error.message)
+    return messages
@@ -0,0 +1,239 @@
+"""Row-level diff between two traceability matrix versions.
+
+Usage:
+  python scripts/matrix_diff.py                                   # HEAD vs working tree
+  python scripts/matrix_diff.py main:datasets/traceability/matrix.csv datasets/traceability/matrix.csv
+  python scripts/matrix_diff.py old.parquet new.parquet --limit 0 --fail-on-change
+  python scripts/matrix_diff.py --bench 5000000
+
+A text diff of `matrix.csv` shows which lines moved, not which links
+changed, and is unreadable for large regenerations. This tool joins the two
+versions on (template_id, indicator_id) and reports rows that were added,
+removed or changed, with `ref_ids` differences spelled out per reference.
+
+Either side may be a CSV or Parquet file, or `REV:path` to read a file from
+git. Both sides are loaded with Arrow, the `generated` column of older
+matrices is dropped, and the join is Arrow's hash join, so the diff is linear in the number of rows and
+stays in columnar memory for multi-million-row matrices.
+
+Scope: local, read-only. No network calls.
+"""
+
+from __future__ import annotations
+
+import argparse
+import io
+import subprocess
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
+
+WORKSPACE_ROOT = Path(__file__).resolve().parents[1]
+MATRIX_PATH = "datasets/traceability/matrix.csv"
+KEY_COLUMNS = ("template_id", "indicator_id")
+# Matrices generated before the date moved to generated.json carry it as a column;
+# dropping it lets `REV:path` from older commits diff cleanly against current output
+VOLATILE_COLUMNS = ("generated",)
+
+
+def _read_bytes(source: str) -> tuple[bytes, str]:
+    path = Path(source)
+    if not path.exists() and ":" in source:
+        rev, rel = source.split(":", 1)
+        result = subprocess.run(["git", "show", f"{rev}:{rel}"], cwd=WORKSPACE_ROOT, capture_output=True, check=False)
+        if result.returncode != 0:
+            raise FileNotFoundError(f"Cannot read {source} from git: {result.stderr.decode().strip()}")
+        return result.stdout, rel
+    return path.read_bytes(), source
+
+
+def _canonical_refs(column: pa.ChunkedArray) -> pa.ChunkedArray:
+    """Reduce `ref_ids` (JSON text in CSV, list in Parquet) to comma-joined text."""
+
+    if pa.types.is_list(column.type) or pa.types.is_large_list(column.type):
+        return pc.binary_join(column, ",")
+    return pc.replace_substring_regex(column.cast(pa.string()), r'[\[\]" ]', "")
+
+
+def load_matrix(source: str) -> pa.Table:
+    """Load a matrix version as all-string columns, volatile columns removed."""
+
+    data, name = _read_bytes(source)
+    if name.endswith(".parquet"):
+        table = pq.read_table(io.BytesIO(data))
+    else:
+        table = pacsv.read_csv(
+            io.BytesIO(data), convert_options=pacsv.ConvertOptions(column_types={"ref_ids": pa.string()})
+        )
+    table = table.drop_columns([c for c in VOLATILE_COLUMNS if c in table.column_names])
+    missing = [c for c in KEY_COLUMNS if c not in table.column_names]
+    if missing:
+        raise ValueError(f"{source}: missing key column(s) {missing}")
+
+    columns = []
+    for col_name in table.column_names:
+        column = table.column(col_name)
+        column = _canonical_refs(column) if col_name == "ref_ids" else column.cast(pa.string())
+        columns.append(pc.fill_null(column, ""))
+    table = pa.table(columns, names=table.column_names)
+
+    counts = table.group_by(list(KEY_COLUMNS)).aggregate([([], "count_all")])
+    dupes = counts.filter(pc.greater(counts["count_all"], 1))
+    if dupes.num_rows:
+        first = dupes.slice(0, 1).to_pylist()[0]
+        raise ValueError(
+            f"{source}: {dupes.num_rows} duplicate key(s), e.g. {first['template_id']} / {first['indicator_id']}"
+        )
+    return table
+
+
+@dataclass
+class MatrixDiff:
+    added: pa.Table
+    removed: pa.Table
+    # Keys plus `<col>_old` / `<col>_new` for every compared column
+    changed: pa.Table
+    compared: list[str]
+    unchanged: int
+
+    @property
+    def is_empty(self) -> bool:
+        return not (self.added.num_rows or self.removed.num_rows or self.changed.num_rows)
+
+
+def diff_tables(old: pa.Table, new: pa.Table) -> MatrixDiff:
+    keys = list(KEY_COLUMNS)
+    compared = [c for c in new.column_names if c in old.column_names and c not in keys]
+
+    joined = old.append_column("_old", pc.is_valid(old[keys[0]])).join(
+        new.append_column("_new", pc.is_valid(new[keys[0]])),
+        keys=keys,
+        join_type="full outer",
+        left_suffix="_old",
+        right_suffix="_new",
+    )
+    in_old = pc.fill_null(joined["_old"], False)
+    in_new = pc.fill_null(joined["_new"], False)
+    both = pc.and_(in_old, in_new)
+
+    changed_mask = pc.invert(pc.is_valid(joined[keys[0]]))  # all False
+    for col in compared:
+        differs = pc.fill_null(pc.not_equal(joined[f"{col}_old"], joined[f"{col}_new"]), False)
+        changed_mask = pc.or_(changed_mask, pc.and_(both, differs))
+
+    def side(mask, suffix: str) -> pa.Table:
+        rows = joined.filter(mask)
+        names = [c for c in joined.column_names if c.endswith(suffix) and c not in ("_old", "_new")]
+        return pa.table(
+            [rows[k] for k in keys] + [rows[c] for c in names], names=keys + [c[: -len(suffix)] for c in names]
+        )
+
+    changed = joined.filter(changed_mask)
+    changed = changed.select(keys + [f"{c}{s}" for c in compared for s in ("_old", "_new")])
+    return MatrixDiff(
+        added=side(pc.invert(in_old), "_new").sort_by([(k, "ascending") for k in keys]),
+        removed=side(pc.invert(in_new), "_old").sort_by([(k, "ascending") for k in keys]),
+        changed=changed.sort_by([(k, "ascending") for k in keys]),
+        compared=compared,
+        unchanged=pc.sum(both).as_py() - changed.num_rows if joined.num_rows else 0,
+    )
+
+
+def describe_change(row: dict, compared: list[str]) -> list[str]:
+    """Human-readable per-column changes for one `changed` row."""
+
+    parts = []
+    for col in compared:
+        before, after = row[f"{col}_old"], row[f"{col}_new"]
+        if before == after:
+            continue
+        if col == "ref_ids":
+            old_refs = {r for r in before.split(",") if r}
+            new_refs = {r for r in after.split(",") if r}
+            parts += [f"+ref {r}" for r in sorted(new_refs - old_refs)]
+            parts += [f"-ref {r}" for r in sorted(old_refs - new_refs)]
+            if old_refs == new_refs:
+                parts.append("ref_ids reordered")
+        else:
+            parts.append(f"{col}: {before!r} -> {after!r}")
+    return parts
+
+
+def format_diff(diff: MatrixDiff, limit: int = 50) -> str:
+    lines = [
+        f"Added: {diff.added.num_rows}  Removed: {diff.removed.num_rows}  "
+        f"Changed: {diff.changed.num_rows}  Unchanged: {diff.unchanged}"
+    ]
+
+    def head(table: pa.Table) -> list[dict]:
+        return table.slice(0, limit if limit > 0 else table.num_rows).to_pylist()
+
+    for title, table, mark in (("ADDED", diff.added, "+"), ("REMOVED", diff.removed, "-")):
+        if table.num_rows:
+            lines += ["", f"{title}:"]
+            lines += [f"  {mark} {r['template_id']} / {r['indicator_id']}" for r in head(table)]
+            if 0 < limit < table.num_rows:
+                lines.append(f"  ... {table.num_rows - limit} more")
+    if diff.changed.num_rows:
+        lines += ["", "CHANGED:"]
+        for row in head(diff.changed):
+            lines.append(f"  ~ {row['template_id']} / {row['indicator_id']}")
+            lines += [f"      {part}" for part in describe_change(row, diff.compared)]
+        if 0 < limit < diff.changed.num_rows:
+            lines.append(f"  ... {diff.changed.num_rows - limit} more")
+    return "\n".join(lines)
+
+
+def synthetic_matrix(rows: int, seed_shift: int = 0) -> pa.Table:
+    """Synthetic matrix with ``rows`` rows; ``seed_shift`` perturbs a slice of it."""
+
+    idx = pa.array(range(rows))
+    template = pc.binary_join_element_wise("template.synthetic.", pc.cast(pc.divide(idx, 4), pa.string()), "")
+    indicator = pc.binary_join_element_wise("indicator.synthetic.", pc.cast(pc.bit_wise_and(idx, 3), pa.string()), "")
+    refs = pc.if_else(
+        pc.less(pc.bit_wise_and(pc.add(idx, seed_shift), 1023), 4 if seed_shift else 0),
+        "ref.synthetic.a,ref.synthetic.b",
+        "ref.synthetic.a",
+    )
+    return pa.table(
+        {
+            "template_id": template,
+            "indicator_id": indicator,
+            "section": pa.array(["key_learning"] * rows),
+            "ref_ids": refs,
+        }
+    )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Row-level diff of two traceability matrix versions.")
+    parser.add_argument("old", nargs="?", default=f"HEAD:{MATRIX_PATH}", help="Old version (path or REV:path)")
+    parser.add_argument("new", nargs="?", default=str(WORKSPACE_ROOT / MATRIX_PATH), help="New version")
+    parser.add_argument("--limit", type=int, default=50, help="Rows listed per category (0 = all)")
+    parser.add_argument("--fail-on-change", action="store_true", help="Exit 1 when the matrices differ")
+    parser.add_argument("--bench", type=int, metavar="ROWS", help="Diff two synthetic matrices of ROWS rows")
+    args = parser.parse_args()
+
+    if args.bench:
+        old = synthetic_matrix(args.bench)
+        # Drop the first 400 rows, append 400 new ones and alter refs on a slice
+        new = synthetic_matrix(args.bench + 400, seed_shift=7).slice(400)
+        start = time.perf_counter()
+        diff = diff_tables(old, new)
+        elapsed = time.perf_counter() - start
+        print(format_diff(diff, limit=3))
+        print(f"\nDiffed {args.bench:,} rows in {elapsed:.2f}s ({args.bench / elapsed:,.0f} rows/s)")
+        return 0
+
+    diff = diff_tables(load_matrix(args.old), load_matrix(args.new))
+    print(format_diff(diff, limit=args.limit))
+    return 1 if args.fail_on_change and not diff.is_empty else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,349 @@
+"""Bulk-rename canonical IDs across the workspace.
+
+Usage:
+  python scripts/migrate_ids.py renames.yaml --dry-run    # print a unified diff, write nothing
+  python scripts/migrate_ids.py renames.yaml
+  python scripts/migrate_ids.py --rename indicator.belonging.identity=indicator.belonging.self_identity
+  python scripts/migrate_ids.py --bench 5000 --renames 2000 --no-verify
+
+ADR 0005 makes an ID change a breaking change; this is the migration step.
+The rename map is a YAML mapping (`old.id: new.id`) or a two-column CSV.
+Renames are applied simultaneously, so `a -> b` together with `b -> c`
+swaps cleanly instead of chaining.
+
+How it works:
+
+- One pass per file: a single regex finds every ID-shaped token, and each
+  token is looked up in the rename map (a dict), so the cost per file does not
+  grow with the number of renames. Tokens are matched whole, so renaming
+  `indicator.a` never touches `indicator.a.b`. File names such as
+  `evidence.pattern.x.md` in links are renamed with their ID, and so are the
+  files themselves.
+- Text is rewritten in place, token by token, which keeps YAML comments,
+  quoting and layout byte-for-byte. Every rewritten YAML file and front matter
+  block is then parsed again (scripts/yaml_backend.py) and compared with the
+  original data after renaming, and any mismatch aborts the migration before
+  anything is written. Parsing dominates the run time (about 1.5 ms per file
+  with libyaml, 10 ms with the pure Python parser); `--no-verify` skips it for
+  very large migrations, which is safe as long as new IDs pass the ADR 0005
+  check (they never need quoting).
+- Files are processed in a process pool when there are many of them. Writes
+  are atomic (temp file + rename).
+
+Generated files (datasets/, references/links.md, reports/) are not edited.
+Run `python scripts/build.py` afterwards to regenerate them.
+
+Scope: local files only. No network calls.
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import difflib
+import os
+import re
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from scripts.artifacts import write_if_changed
+from scripts.catalog import WORKSPACE_ROOT
+from scripts.link_graph import build_graph
+from scripts.validate import _FRONT_MATTER_RE
+from scripts.workspace_index import WorkspaceIndex
+from scripts.yaml_backend import load
+
+REWRITTEN_SUFFIXES = (".md", ".yaml", ".yml")
+# Staged/generated copies and historical records (ADRs, saved sources) keep old IDs
+SKIP_TOP_LEVEL = frozenset({"site_docs", "build", "site", "datasets", "reports", "decisions", "sources"})
+SKIP_FILES = frozenset({"references/links.md", "docs/CHANGELOG.md"})
+# Below this many files the process pool is not worth starting
+PARALLEL_THRESHOLD = 256
+# ADR 0005: lowercase, underscores, dots for hierarchy
+_VALID_ID_RE = re.compile(r"^[a-z][a-z0-9_]*(?:\.[a-z0-9_]+)+$")
+_FILE_SUFFIXES = (".md", ".yaml", ".yml", ".csv", ".json")
+
+
+class Renamer:
+    """Single-pass, whole-token rewrite of IDs using one regex and a dict lookup."""
+
+    def __init__(self, renames: dict[str, str]):
+        self.renames = renames
+        prefixes = sorted({old.split(".", 1)[0] for old in renames}, key=len, reverse=True)
+        alternatives = "|".join(map(re.escape, prefixes)) or r"(?!)"
+        self.pattern = re.compile(rf"(?<![\w.\-])(?:{alternatives})(?:\.[A-Za-z0-9_\-]+)+")
+
+    def _replace(self, match: re.Match) -> str:
+        token = match.group(0)
+        new = self.renames.get(token)
+        if new is not None:
+            return new
+        for suffix in _FILE_SUFFIXES:
+            if token.endswith(suffix) and token[: -len(suffix)] in self.renames:
+                return self.renames[token[: -len(suffix)]] + suffix
+        return token
+
+    def rewrite(self, text: str) -> tuple[str, int]:
+        count = 0
+
+        def replace(match: re.Match) -> str:
+            nonlocal count
+            new = self._replace(match)
+            count += new != match.group(0)
+            return new
+
+        return self.pattern.sub(replace, text), count
+
+    def rename_data(self, value):
+        """Apply the renames to parsed YAML data (keys and string scalars that are whole IDs)."""
+
+        if isinstance(value, dict):
+            return {self.rename_data(k): self.rename_data(v) for k, v in value.items()}
+        if isinstance(value, list):
+            return [self.rename_data(v) for v in value]
+        if isinstance(value, str):
+            return self.rewrite(value)[0]
+        return value
+
+
+@dataclass
+class FileChange:
+    path: str
+    old: str
+    new: str
+    count: int
+    # Set when the rewritten YAML does not parse to the renamed original data
+    error: str | None = None
+
+    def diff(self) -> str:
+        return "".join(
+            difflib.unified_diff(
+                self.old.splitlines(keepends=True),
+                self.new.splitlines(keepends=True),
+                fromfile=f"a/{self.path}",
+                tofile=f"b/{self.path}",
+            )
+        )
+
+
+def load_rename_map(path: Path) -> dict[str, str]:
+    """Read ``old: new`` pairs from YAML or a two-column CSV (header optional)."""
+
+    if path.suffix == ".csv":
+        with path.open(encoding="utf-8", newline="") as handle:
+            rows = [row for row in csv.reader(handle) if len(row) >= 2]
+        if rows and not _VALID_ID_RE.match(rows[0][0].strip()):
+            rows = rows[1:]
+        return {old.strip(): new.strip() for old, new, *_ in rows}
+    data = load(path.read_text(encoding="utf-8")) or {}
+    if not isinstance(data, dict):
+        raise TypeError(f"Rename map must be a mapping: {path}")
+    return {str(k): str(v) for k, v in data.items()}
+
+
+def check_rename_map(renames: dict[str, str], existing: set[str] | None = None) -> list[str]:
+    """Problems that would make the migration ambiguous or break ADR 0005."""
+
+    errors = []
+    for old, new in renames.items():
+        if not _VALID_ID_RE.match(new):
+            errors.append(f"{old} -> {new}: new ID does not follow the type.domain.name convention")
+        if old == new:
+            errors.append(f"{old}: renamed to itself")
+    targets: dict[str, list[str]] = {}
+    for old, new in renames.items():
+        targets.setdefault(new, []).append(old)
+    for new, olds in targets.items():
+        if len(olds) > 1:
+            errors.append(f"{new}: target of several renames ({', '.join(sorted(olds))})")
+        if existing is not None and new in existing and new not in renames:
+            errors.append(f"{new}: already exists and is not renamed away")
+    return errors
+
+
+def iter_targets(root: Path) -> list[str]:
+    files = []
+    for rel in WorkspaceIndex.scan(root).iter_files():
+        top = rel.split("/", 1)[0]
+        if not rel.endswith(REWRITTEN_SUFFIXES) or top in SKIP_TOP_LEVEL or top.startswith("."):
+            continue
+        if rel not in SKIP_FILES:
+            files.append(rel)
+    return files
+
+
+def _verify(rel: str, old: str, new: str, renamer: Renamer) -> str | None:
+    """Round-trip check: the rewritten file must parse to the original data with IDs renamed."""
+
+    def parse(text: str):
+        if rel.endswith(".md"):
+            match = _FRONT_MATTER_RE.match(text)
+            return load(match.group(1)) if match else None
+        return load(text)
+
+    try:
+        before = parse(old)
+    except Exception:
+        # Files that did not parse before the rename are not ours to judge
+        return None
+    try:
+        after = parse(new)
+    except Exception as exc:
+        return f"no longer parses: {exc}"
+    if after != renamer.rename_data(before):
+        return "parsed data differs from the renamed original"
+    return None
+
+
+# Per-process worker state, set by _init_worker (in the pool initializer, or inline when serial)
+_WORKER: Renamer | None = None
+_VERIFY = True
+
+
+def _init_worker(renames: dict[str, str], verify: bool = True) -> None:
+    global _WORKER, _VERIFY
+    _WORKER = Renamer(renames)
+    _VERIFY = verify
+
+
+def _rewrite_file(item: tuple[Path, str]) -> FileChange | None:
+    root, rel = item
+    old = (root / rel).read_bytes().decode("utf-8")
+    new, count = _WORKER.rewrite(old)
+    if not count:
+        return None
+    return FileChange(rel, old, new, count, _verify(rel, old, new, _WORKER) if _VERIFY else None)
+
+
+def plan(root: Path, renames: dict[str, str], jobs: int = os.cpu_count() or 1, verify: bool = True) -> list[FileChange]:
+    """Rewrite every target file in memory; returns the files that would change."""
+
+    files = iter_targets(root)
+    items = [(root, rel) for rel in files]
+    if len(items) >= PARALLEL_THRESHOLD and jobs > 1:
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=(renames, verify)) as pool:
+            results = list(pool.map(_rewrite_file, items, chunksize=64))
+    else:
+        _init_worker(renames, verify)
+        results = [_rewrite_file(item) for item in items]
+    return [change for change in results if change is not None]
+
+
+def plan_moves(root: Path, renames: dict[str, str], files: list[str] | None = None) -> list[tuple[str, str]]:
+    """Files named after a renamed ID (e.g. evidence/evidence.pattern.x.md) and their new paths."""
+
+    moves = []
+    for rel in files if files is not None else iter_targets(root):
+        directory, _, name = rel.rpartition("/")
+        stem, dot, suffix = name.rpartition(".")
+        if dot and stem in renames:
+            moves.append((rel, f"{directory}/{renames[stem]}.{suffix}" if directory else f"{renames[stem]}.{suffix}"))
+    return moves
+
+
+def apply(root: Path, changes: list[FileChange], moves: list[tuple[str, str]]) -> None:
+    for change in changes:
+        write_if_changed(root / change.path, change.new.encode("utf-8"))
+    for old, new in moves:
+        os.replace(root / old, root / new)
+
+
+def existing_ids(root: Path) -> set[str]:
+    return set(build_graph(root).nodes)
+
+
+def synthetic_tree(root: Path, files: int, renames: int) -> dict[str, str]:
+    """Write ``files`` template YAML files under ``root`` and return a rename map (benchmark only)."""
+
+    per_file = 20
+    ids = [f"indicator.synthetic.i{n:06d}" for n in range(max(renames * 2, per_file))]
+    (root / "templates").mkdir(parents=True, exist_ok=True)
+    for f in range(files):
+        lines = ["templates:"]
+        for t in range(per_file):
+            lines += [
+                f"  - id: template.synthetic.f{f:06d}.t{t:02d}  # synthetic",
+                f"    indicators: [{ids[(f * per_file + t) % len(ids)]}, {ids[(f + t) % len(ids)]}]",
+                "    text: 'Uses evidence.pattern.block_play.md as a model'",
+            ]
+        (root / "templates" / f"synthetic_{f:06d}.yaml").write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return {old: old.replace(".i", ".renamed_", 1) for old in ids[:renames]}
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Bulk-rename canonical IDs (ADR 0005 migrations).")
+    parser.add_argument("map", nargs="?", type=Path, help="Rename map (YAML mapping or two-column CSV)")
+    parser.add_argument("--rename", action="append", default=[], metavar="OLD=NEW", help="Inline rename (repeatable)")
+    parser.add_argument("--dry-run", action="store_true", help="Print a unified diff and write nothing")
+    parser.add_argument("--no-verify", action="store_true", help="Skip the YAML round-trip check")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="Worker processes for large trees")
+    parser.add_argument("--bench", type=int, metavar="FILES", help="Benchmark on a synthetic tree of FILES files")
+    parser.add_argument("--renames", type=int, default=1000, help="Renames in the --bench map")
+    args = parser.parse_args(argv)
+
+    if args.bench:
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            renames = synthetic_tree(root, args.bench, args.renames)
+            start = time.perf_counter()
+            changes = plan(root, renames, args.jobs, verify=not args.no_verify)
+            planned = time.perf_counter()
+            apply(root, changes, [])
+            done = time.perf_counter()
+        edits = sum(c.count for c in changes)
+        print(
+            f"{len(renames)} renames, {args.bench} files: {edits} replacements in {len(changes)} files, "
+            f"planned in {planned - start:.2f}s, written in {done - planned:.2f}s"
+        )
+        return 0
+
+    renames = load_rename_map(args.map) if args.map else {}
+    for pair in args.rename:
+        old, sep, new = pair.partition("=")
+        if not sep:
+            parser.error(f"--rename expects OLD=NEW, got {pair}")
+        renames[old.strip()] = new.strip()
+    if not renames:
+        parser.error("give a rename map or --rename OLD=NEW")
+
+    errors = check_rename_map(renames, existing_ids(WORKSPACE_ROOT))
+    if errors:
+        print("ERROR: invalid rename map:")
+        for message in errors:
+            print(f"  - {message}")
+        return 1
+
+    changes = plan(WORKSPACE_ROOT, renames, args.jobs, verify=not args.no_verify)
+    moves = plan_moves(WORKSPACE_ROOT, renames)
+    failed = [c for c in changes if c.error]
+    if failed:
+        print("ERROR: round-trip check failed, nothing written:")
+        for change in failed:
+            print(f"  - {change.path}: {change.error}")
+        return 1
+
+    if args.dry_run:
+        for change in changes:
+            print(change.diff(), end="")
+        for old, new in moves:
+            print(f"rename {old} => {new}")
+    else:
+        apply(WORKSPACE_ROOT, changes, moves)
+    verb = "Would rewrite" if args.dry_run else "Rewrote"
+    print(
+        f"{verb} {sum(c.count for c in changes)} occurrences in {len(changes)} files"
+        + (f", moved {len(moves)} file(s)" if moves else "")
+    )
+    if changes and not args.dry_run:
+        print("Run 'python scripts/build.py' to regenerate derived artifacts.")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,279 @@
+"""Find a minimal set of templates that still covers every indicator.
+
+Usage:
+  python scripts/min_cover.py
+  python scripts/min_cover.py --exact
+  python scripts/min_cover.py --synthetic 100000 --boards 20
+
+The question boards ask is "what is the smallest comment bank that still
+covers every indicator in every CoL section?". The library is split into one
+set-cover problem per (frame, section): the universe is the frame's
+indicators that at least one template in that section covers, and each
+template is an integer bitset over that universe.
+
+Solvers:
+  greedy  Classic greedy set cover with lazy priority updates. A template's
+          gain only ever shrinks, so a stale heap entry is re-scored when it
+          reaches the top and taken only if it still beats the next entry.
+  exact   Branch-and-bound (always branch on the uncovered indicator with the
+          fewest candidate templates, prune with a size lower bound). Used
+          for groups small enough to solve exactly; larger groups fall back
+          to greedy and are flagged in the output.
+
+Before solving, templates with identical bitsets are collapsed and templates
+whose bitset is a strict subset of another are dropped; neither can be
+needed in a minimum cover. Every template not selected is reported as
+redundant.
+
+Scope: local, read-only. No network calls.
+"""
+
+from __future__ import annotations
+
+import argparse
+import heapq
+import random
+import sys
+import time
+from collections import defaultdict
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from scripts.catalog import ensure_list, load_catalog
+
+# Groups above either limit are solved greedily even in --exact mode
+EXACT_MAX_INDICATORS = 64
+EXACT_MAX_CANDIDATES = 200
+
+
+@dataclass
+class CoverGroup:
+    """One (frame, section) set-cover result."""
+
+    frame: str
+    section: str
+    universe: list[str]
+    selected: list[str] = field(default_factory=list)
+    redundant: list[str] = field(default_factory=list)
+    # Frame indicators no template in this section covers
+    uncoverable: list[str] = field(default_factory=list)
+    method: str = "greedy"
+
+
+def _bits(ids: Iterable[str], bit_of: dict[str, int]) -> int:
+    mask = 0
+    for ind_id in ids:
+        pos = bit_of.get(ind_id)
+        if pos is not None:
+            mask |= 1 << pos
+    return mask
+
+
+def reduce_candidates(candidates: list[tuple[str, int]]) -> list[tuple[str, int]]:
+    """Drop empty, duplicate and dominated bitsets (first template in library order wins)."""
+
+    unique: dict[int, str] = {}
+    for tid, mask in candidates:
+        if mask and mask not in unique:
+            unique[mask] = tid
+    # Check larger sets first; a set can only be dominated by a bigger one
+    kept: list[tuple[str, int]] = []
+    for mask, tid in sorted(unique.items(), key=lambda item: -item[0].bit_count()):
+        if not any(mask & other == mask for _, other in kept):
+            kept.append((tid, mask))
+    order = {tid: i for i, (tid, _) in enumerate(candidates)}
+    return sorted(kept, key=lambda item: order[item[0]])
+
+
+def greedy_cover(candidates: list[tuple[str, int]], universe: int) -> list[str]:
+    """Greedy set cover with lazy gain updates; ties go to library order."""
+
+    heap = [(-(mask & universe).bit_count(), i, tid, mask) for i, (tid, mask) in enumerate(candidates)]
+    heapq.heapify(heap)
+    uncovered = universe
+    chosen: list[str] = []
+    while uncovered and heap:
+        neg_gain, order, tid, mask = heapq.heappop(heap)
+        gain = (mask & uncovered).bit_count()
+        if gain == 0:
+            continue
+        if gain != -neg_gain and heap and -heap[0][0] > gain:
+            # Stale priority; re-queue with the current gain
+            heapq.heappush(heap, (-gain, order, tid, mask))
+            continue
+        chosen.append(tid)
+        uncovered &= ~mask
+    return chosen
+
+
+def exact_cover(candidates: list[tuple[str, int]], universe: int) -> list[str]:
+    """Minimum-cardinality cover by branch-and-bound, seeded with the greedy solution."""
+
+    best = greedy_cover(candidates, universe)
+    if len(best) <= 1:
+        return best
+    max_size = max((mask & universe).bit_count() for _, mask in candidates)
+    covering: dict[int, list[tuple[str, int]]] = defaultdict(list)
+    for tid, mask in sorted(candidates, key=lambda c: -(c[1] & universe).bit_count()):
+        bits = mask & universe
+        while bits:
+            low = bits & -bits
+            covering[low].append((tid, mask))
+            bits ^= low
+
+    def search(uncovered: int, chosen: list[str]) -> None:
+        nonlocal best
+        if not uncovered:
+            if len(chosen) < len(best):
+                best = list(chosen)
+            return
+        # Lower bound: every further template covers at most max_size indicators
+        if len(chosen) + -(-uncovered.bit_count() // max_size) >= len(best):
+            return
+        bits = uncovered
+        pivot = None
+        while bits:
+            low = bits & -bits
+            if pivot is None or len(covering[low]) < len(covering[pivot]):
+                pivot = low
+            bits ^= low
+        for tid, mask in covering[pivot]:
+            chosen.append(tid)
+            search(uncovered & ~mask, chosen)
+            chosen.pop()
+
+    search(universe, [])
+    return best
+
+
+def solve(
+    templates: Iterable[dict],
+    indicators: dict[str, dict],
+    sections: list[str] | None = None,
+    exact: bool = False,
+) -> list[CoverGroup]:
+    """Solve one set-cover problem per (frame, section) over ``templates``."""
+
+    frame_indicators: dict[str, list[str]] = defaultdict(list)
+    for ind_id, ind in sorted(indicators.items()):
+        frame_indicators[ind.get("frame", "unknown")].append(ind_id)
+
+    grouped: dict[tuple[str, str], list[dict]] = defaultdict(list)
+    for tmpl in templates:
+        if isinstance(tmpl, dict) and isinstance(tmpl.get("id"), str):
+            grouped[(tmpl.get("frame") or "unknown", tmpl.get("section") or "unknown")].append(tmpl)
+
+    keys = {(f, s) for f in frame_indicators for s in sections or []} | set(grouped)
+    results: list[CoverGroup] = []
+    for frame, section in sorted(keys):
+        ind_ids = frame_indicators.get(frame, [])
+        bit_of = {ind_id: pos for pos, ind_id in enumerate(ind_ids)}
+        rows = [(t["id"], _bits(ensure_list(t.get("indicators")), bit_of)) for t in grouped.get((frame, section), [])]
+        reachable = 0
+        for _, mask in rows:
+            reachable |= mask
+
+        group = CoverGroup(
+            frame=frame,
+            section=section,
+            universe=[i for i in ind_ids if reachable >> bit_of[i] & 1],
+            uncoverable=[i for i in ind_ids if not reachable >> bit_of[i] & 1],
+        )
+        candidates = reduce_candidates(rows)
+        if exact and len(ind_ids) <= EXACT_MAX_INDICATORS and len(candidates) <= EXACT_MAX_CANDIDATES:
+            group.method = "exact"
+            chosen = exact_cover(candidates, reachable)
+        else:
+            chosen = greedy_cover(candidates, reachable)
+        selected = set(chosen)
+        group.selected = [tid for tid, _ in rows if tid in selected]
+        group.redundant = [tid for tid, _ in rows if tid not in selected]
+        results.append(group)
+    return results
+
+
+def synthetic_library(
+    templates: int,
+    boards: int = 10,
+    indicators_per_frame: int = 12,
+    frames: int = 5,
+    sections: tuple[str, ...] = ("key_learning", "growth", "next_steps"),
+    seed: int = 0,
+) -> tuple[list[dict], dict[str, dict]]:
+    """Random multi-board library for benchmarking (no real content)."""
+
+    rng = random.Random(seed)
+    indicators = {
+        f"indicator.synthetic_{f}.{i:03d}": {"id": f"indicator.synthetic_{f}.{i:03d}", "frame": f"frame.synthetic_{f}"}
+        for f in range(frames)
+        for i in range(indicators_per_frame)
+    }
+    by_frame: dict[str, list[str]] = defaultdict(list)
+    for ind_id, ind in indicators.items():
+        by_frame[ind["frame"]].append(ind_id)
+    frame_ids = sorted(by_frame)
+
+    library = []
+    for n in range(templates):
+        frame = frame_ids[n % len(frame_ids)]
+        section = sections[(n // len(frame_ids)) % len(sections)]
+        library.append(
+            {
+                "id": f"template.board{n % boards:02d}.{frame.rsplit('.', 1)[-1]}.{section}.{n:06d}",
+                "frame": frame,
+                "section": section,
+                "indicators": rng.sample(by_frame[frame], rng.randint(1, 4)),
+            }
+        )
+    return library, indicators
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Minimal covering template set per frame and CoL section.")
+    parser.add_argument("--exact", action="store_true", help="Solve small groups exactly (branch-and-bound)")
+    parser.add_argument("--synthetic", type=int, metavar="N", help="Benchmark on N synthetic templates")
+    parser.add_argument("--boards", type=int, default=10, help="Boards in the synthetic library")
+    parser.add_argument("--indicators-per-frame", type=int, default=12)
+    parser.add_argument("--quiet", action="store_true", help="Print only the per-group summary")
+    args = parser.parse_args(argv)
+
+    if args.synthetic:
+        templates, indicators = synthetic_library(
+            args.synthetic, boards=args.boards, indicators_per_frame=args.indicators_per_frame
+        )
+        sections = None
+    else:
+        catalog = load_catalog()
+        templates, indicators = list(catalog.templates.values()), catalog.indicators
+        sections = catalog.section_keys
+
+    start = time.perf_counter()
+    groups = solve(templates, indicators, sections=sections, exact=args.exact)
+    elapsed = time.perf_counter() - start
+
+    total_selected = sum(len(g.selected) for g in groups)
+    total = sum(len(g.selected) + len(g.redundant) for g in groups)
+    for g in groups:
+        print(
+            f"{g.frame} / {g.section}: {len(g.selected)} of {len(g.selected) + len(g.redundant)} templates "
+            f"cover {len(g.universe)} indicator(s) [{g.method}]"
+        )
+        if args.quiet:
+            continue
+        for tid in g.selected:
+            print(f"  keep      {tid}")
+        for tid in g.redundant:
+            print(f"  redundant {tid}")
+        for ind_id in g.uncoverable:
+            print(f"  GAP       {ind_id} (no template in this section)")
+
+    print()
+    print(f"Selected {total_selected}/{total} templates across {len(groups)} group(s) in {elapsed:.2f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,176 @@
+"""Recommend comment templates for a set of observed indicators.
+
+Usage:
+  python scripts/recommend.py evidence.pattern.block_play
+  python scripts/recommend.py --indicators indicator.belonging.relationships,indicator.belonging.community
+  python scripts/recommend.py evidence.pattern.block_play --section next_steps --tone parent_friendly -k 3
+
+Every template and evidence pattern is reduced once to an integer bitset over
+the indicator taxonomy. A query is then a single AND + popcount per candidate,
+and the top-k are picked with a heap rather than a full sort, so the
+recommender is cheap enough to call on every keystroke of a report-writing UI.
+
+Scoring:
+  1) Number of query indicators the template covers (higher first).
+  2) Number of template indicators outside the query (fewer first).
+  3) Template ID (library order) for stable ties.
+
+Scope: local, read-only. No network calls.
+"""
+
+from __future__ import annotations
+
+import argparse
+import heapq
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from scripts.catalog import Catalog, load_catalog
+
+
+@dataclass(frozen=True)
+class Recommendation:
+    template_id: str
+    score: int
+    matched: tuple[str, ...]
+    extra: int
+
+
+class TemplateRecommender:
+    """Precomputed indicator bitsets for templates and evidence patterns."""
+
+    def __init__(self, catalog: Catalog):
+        self.catalog = catalog
+        self.indicator_ids: list[str] = sorted(catalog.indicators)
+        self.bit_of: dict[str, int] = {ind_id: pos for pos, ind_id in enumerate(self.indicator_ids)}
+
+        # (template_id, mask, popcount, frame, section, tone) in library order
+        self._rows: list[tuple[str, int, int, str, str, str]] = []
+        for tid, tmpl in catalog.templates.items():
+            mask = self._mask(tmpl.get("indicators") or [], strict=False)
+            self._rows.append((tid, mask, mask.bit_count(), tmpl.get("frame"), tmpl.get("section"), tmpl.get("tone")))
+
+        self.evidence_masks: dict[str, int] = {
+            ev_id: self._mask(ev.get("indicators") or [], strict=False)
+            for ev_id, ev in catalog.evidence_patterns.items()
+        }
+        self._pools: dict[tuple[str | None, str | None, str | None], list[tuple[str, int, int]]] = {}
+
+    def _mask(self, indicator_ids, strict: bool = True) -> int:
+        mask = 0
+        unknown: list[str] = []
+        for ind_id in indicator_ids:
+            pos = self.bit_of.get(ind_id)
+            if pos is None:
+                unknown.append(ind_id)
+                continue
+            mask |= 1 << pos
+        if unknown and strict:
+            raise ValueError(f"Unknown indicator IDs: {sorted(unknown)}")
+        return mask
+
+    def mask_for(self, indicator_ids) -> int:
+        """Return the bitset for an ad-hoc indicator set (unknown IDs raise ValueError)."""
+        return self._mask(indicator_ids)
+
+    def indicators_for(self, mask: int) -> tuple[str, ...]:
+        return tuple(ind_id for pos, ind_id in enumerate(self.indicator_ids) if mask >> pos & 1)
+
+    def candidates(self, frame: str | None, section: str | None, tone: str | None) -> list[tuple[str, int, int]]:
+        """Return ``(template_id, mask, popcount)`` rows matching the filters (cached)."""
+        key = (frame, section, tone)
+        pool = self._pools.get(key)
+        if pool is None:
+            pool = [
+                (tid, mask, size)
+                for tid, mask, size, t_frame, t_section, t_tone in self._rows
+                if (frame is None or t_frame == frame)
+                and (section is None or t_section == section)
+                and (tone is None or t_tone == tone)
+            ]
+            self._pools[key] = pool
+        return pool
+
+    def recommend(
+        self,
+        indicators=None,
+        evidence_pattern: str | None = None,
+        section: str | None = None,
+        tone: str | None = None,
+        frame: str | None = None,
+        k: int = 5,
+    ) -> list[Recommendation]:
+        """Return up to ``k`` templates ranked by indicator overlap.
+
+        Pass either an evidence pattern ID or an iterable of indicator IDs (or both,
+        in which case the sets are combined). Templates with no overlap are skipped.
+        """
+
+        query = 0
+        if evidence_pattern is not None:
+            if evidence_pattern not in self.evidence_masks:
+                raise ValueError(f"Unknown evidence pattern: {evidence_pattern}")
+            query |= self.evidence_masks[evidence_pattern]
+        if indicators is not None:
+            query |= self.mask_for(indicators)
+        if not query or k <= 0:
+            return []
+
+        scored = []
+        for tid, mask, size in self.candidates(frame, section, tone):
+            overlap = (mask & query).bit_count()
+            if overlap:
+                scored.append((overlap, size - overlap, tid, mask))
+
+        # nlargest is stable, so equal keys keep library order
+        top = heapq.nlargest(k, scored, key=lambda row: (row[0], -row[1]))
+        return [
+            Recommendation(template_id=tid, score=overlap, matched=self.indicators_for(mask & query), extra=extra)
+            for overlap, extra, tid, mask in top
+        ]
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Rank comment templates by indicator overlap.")
+    parser.add_argument("evidence_pattern", nargs="?", help="Evidence pattern ID (e.g. evidence.pattern.block_play)")
+    parser.add_argument("--indicators", default="", help="Comma-separated indicator IDs")
+    parser.add_argument("--section", help="CoL section key (key_learning, growth, next_steps)")
+    parser.add_argument("--tone", help="Template tone (e.g. parent_friendly)")
+    parser.add_argument("--frame", help="Restrict to one frame ID")
+    parser.add_argument("-k", type=int, default=5, help="Number of templates to return")
+    args = parser.parse_args(argv)
+
+    indicators = [i.strip() for i in args.indicators.split(",") if i.strip()]
+    if not args.evidence_pattern and not indicators:
+        parser.error("provide an evidence pattern ID or --indicators")
+
+    recommender = TemplateRecommender(load_catalog())
+    try:
+        results = recommender.recommend(
+            indicators=indicators or None,
+            evidence_pattern=args.evidence_pattern,
+            section=args.section,
+            tone=args.tone,
+            frame=args.frame,
+            k=args.k,
+        )
+    except ValueError as exc:
+        print(f"ERROR: {exc}")
+        return 1
+
+    if not results:
+        print("No matching templates")
+        return 0
+
+    for rank, rec in enumerate(results, start=1):
+        print(f"{rank}. {rec.template_id} (score {rec.score}, extra {rec.extra})")
+        for ind_id in rec.matched:
+            print(f"     - {ind_id}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,6 @@
+#!/usr/bin/env python3
+"""Remind developer to update discussion.md if design decisions were made."""
+import sys
+
+print("TIP: If this session involved design decisions, update docs/discussion.md")
+sys.exit(0)
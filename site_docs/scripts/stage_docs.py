@@ -1,8 +1,47 @@
+"""Stage canonical content into site_docs/ for mkdocs.
+
+Usage:
+  python scripts/stage_docs.py
+  python scripts/stage_docs.py --link hardlink
+  python scripts/stage_docs.py --full --jobs 8    # cold run, parallel copies
+
+Staging is an incremental sync rather than delete-and-copy:
+
+- Files whose size and mtime match the manifest from the previous run are
+  skipped after a single stat (source and staged copy).
+- Files whose stat changed are hashed; identical content only refreshes the
+  manifest entry, anything else is copied (or linked, see --link).
+- Staged files with no source any more are removed, as are empty folders.
+- When many files need copying (cold runs), copies run in a thread pool.
+
+Copies are written to a temp file and renamed into place, so `mkdocs serve`
+never sees a half-written page. The manifest lives in build/ and is not part
+of the staged site.
+
+Generated assets are staged too when they have been built: the search index
+from `scripts/search_index.py --export` becomes `assets/search_index.json`,
+which mkdocs copies into the site for client-side search.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
 import shutil
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from scripts.workspace_index import WorkspaceIndex
+
 ROOT = Path(__file__).parents[1]
 SITE_DOCS = ROOT / "site_docs"
+MANIFEST_PATH = ROOT / "build" / "stage_docs_manifest.json"
 
 DIRS_TO_COPY = [
     "docs",
@@ -18,26 +57,184 @@ DIRS_TO_COPY = [
 FILES_TO_COPY = [
     "index.md",
 ]
+# Built artifacts staged under another name (source -> staged path), when present
+GENERATED_ASSETS = {
+    "build/search_index.json": "assets/search_index.json",
+}
+SKIP_NAMES = {"__pycache__", ".DS_Store"}
+# Below this many pending copies the thread pool is not worth starting
+PARALLEL_THRESHOLD = 64
+
+
+def sha256_file(path: Path, chunk_size: int = 1 << 20) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        while chunk := handle.read(chunk_size):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def iter_sources(root: Path = ROOT, index: WorkspaceIndex | None = None):
+    """Yield (relative path, os.stat_result) for every file to stage.
+
+    Reuses ``index`` when one is passed (stat results captured during its
+    walk); otherwise scans only the staged folders once.
+    """
+
+    tops = DIRS_TO_COPY + FILES_TO_COPY
+    if index is None:
+        index = WorkspaceIndex.scan(root, include=tops, with_stat=True)
+    for rel in index.iter_files(tops):
+        if rel.rsplit("/", 1)[-1] in SKIP_NAMES:
+            continue
+        st = index.stats.get(rel)
+        yield rel, st if st is not None else (root / rel).stat()
+
+
+def iter_assets(root: Path = ROOT):
+    """Yield (staged path, source path, os.stat_result) for each built asset that exists."""
+
+    for src, rel in GENERATED_ASSETS.items():
+        try:
+            yield rel, src, (root / src).stat()
+        except FileNotFoundError:
+            continue
+
+
+def _reflink(src: Path, dst: Path) -> None:
+    import fcntl
+
+    ficlone = 0x40049409  # Linux FICLONE ioctl
+    with src.open("rb") as s, dst.open("wb") as d:
+        fcntl.ioctl(d.fileno(), ficlone, s.fileno())
+    shutil.copystat(src, dst)
+
+
+def place_file(src: Path, dst: Path, link: str = "copy") -> None:
+    """Atomically put ``src`` at ``dst`` by copy, hardlink or reflink (falls back to copy)."""
+
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    tmp = dst.with_name(f".{dst.name}.staging")
+    if tmp.exists():
+        tmp.unlink()
+    try:
+        if link == "hardlink":
+            os.link(src, tmp)
+        elif link == "reflink":
+            _reflink(src, tmp)
+        else:
+            shutil.copy2(src, tmp)
+    except OSError:
+        if tmp.exists():
+            tmp.unlink()
+        shutil.copy2(src, tmp)
+    os.replace(tmp, dst)
+
+
+@dataclass
+class StageResult:
+    copied: list[str] = field(default_factory=list)
+    removed: list[str] = field(default_factory=list)
+    unchanged: int = 0
+    rehashed: int = 0
+
+
+def _load_manifest(path: Path) -> dict[str, list]:
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def stage(
+    root: Path = ROOT,
+    dest: Path = SITE_DOCS,
+    manifest_path: Path = MANIFEST_PATH,
+    link: str = "copy",
+    jobs: int = 8,
+    full: bool = False,
+    sources=None,
+) -> StageResult:
+    """Sync sources under ``root`` into ``dest``; ``full`` ignores the manifest.
+
+    ``sources`` may supply pre-collected (relative path, stat) pairs; by
+    default the tree is walked with `iter_sources`.
+    """
+
+    # rel -> [src_size, src_mtime_ns, sha256, dst_mtime_ns]
+    old = {} if full else _load_manifest(manifest_path)
+    new: dict[str, list] = {}
+    result = StageResult()
+    # (staged path, source path, stat, known sha256)
+    pending: list[tuple[str, str, os.stat_result, str | None]] = []
+    staged = [(rel, rel, st) for rel, st in (sources if sources is not None else iter_sources(root))]
+
+    for rel, src, st in [*staged, *iter_assets(root)]:
+        entry = old.get(rel)
+        dst = dest / rel
+        try:
+            dst_st = dst.stat()
+        except FileNotFoundError:
+            dst_st = None
+        dst_ok = entry is not None and dst_st is not None and dst_st.st_mtime_ns == entry[3]
+        if dst_ok and entry[0] == st.st_size and entry[1] == st.st_mtime_ns:
+            new[rel] = entry
+            result.unchanged += 1
+            continue
+        digest = None
+        if dst_ok:
+            digest = sha256_file(root / src)
+            result.rehashed += 1
+            if digest == entry[2]:
+                new[rel] = [st.st_size, st.st_mtime_ns, digest, dst_st.st_mtime_ns]
+                result.unchanged += 1
+                continue
+        pending.append((rel, src, st, digest))
+
+    def copy_one(item: tuple[str, str, os.stat_result, str | None]) -> tuple[str, list]:
+        rel, src, st, digest = item
+        place_file(root / src, dest / rel, link)
+        return rel, [st.st_size, st.st_mtime_ns, digest or sha256_file(root / src), (dest / rel).stat().st_mtime_ns]
+
+    if len(pending) >= PARALLEL_THRESHOLD and jobs > 1:
+        with ThreadPoolExecutor(max_workers=jobs) as pool:
+            placed = list(pool.map(copy_one, pending))
+    else:
+        placed = [copy_one(item) for item in pending]
+    for rel, entry in placed:
+        new[rel] = entry
+        result.copied.append(rel)
+
+    # Remove staged files that no longer have a source
+    if dest.exists():
+        for dirpath, _dirnames, filenames in os.walk(dest, topdown=False):
+            for name in filenames:
+                path = Path(dirpath) / name
+                rel = path.relative_to(dest).as_posix()
+                if rel not in new:
+                    path.unlink()
+                    result.removed.append(rel)
+            if Path(dirpath) != dest and not os.listdir(dirpath):
+                os.rmdir(dirpath)
+
+    manifest_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = manifest_path.with_name(manifest_path.name + ".tmp")
+    tmp.write_text(json.dumps(new, sort_keys=True), encoding="utf-8")
+    os.replace(tmp, manifest_path)
+    return result
 
 
 def main():
-    if SITE_DOCS.exists():
-        shutil.rmtree(SITE_DOCS)
-    SITE_DOCS.mkdir()
-
-    for dir_name in DIRS_TO_COPY:
-        src = ROOT / dir_name
-        dst = SITE_DOCS / dir_name
-        if src.exists():
-            shutil.copytree(src, dst)
-            print(f"Copied {dir_name}")
-
-    for file_name in FILES_TO_COPY:
-        src = ROOT / file_name
-        dst = SITE_DOCS / file_name
-        if src.exists():
-            shutil.copy(src, dst)
-            print(f"Copied {file_name}")
+    parser = argparse.ArgumentParser(description="Incrementally stage docs into site_docs/.")
+    parser.add_argument("--link", choices=["copy", "hardlink", "reflink"], default="copy")
+    parser.add_argument("--jobs", type=int, default=8, help="Parallel copies on cold runs")
+    parser.add_argument("--full", action="store_true", help="Ignore the manifest and recopy every file")
+    args = parser.parse_args()
+
+    result = stage(link=args.link, jobs=args.jobs, full=args.full)
+    print(
+        f"Staged site_docs/: {len(result.copied)} copied, {len(result.removed)} removed, {result.unchanged} unchanged"
+    )
 
     # Fix paths in mkdocs.yml?
     # No, because mkdocs.yml now points to site_docs, so "docs/framework.md" in mkdocs.yml
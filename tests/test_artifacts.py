@@ -0,0 +1,39 @@
+"""Tests for artifacts.py content-stable writes."""
+
+import json
+import os
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from scripts.artifacts import GeneratedFiles, write_if_changed
+
+
+def test_write_if_changed_keeps_mtime_for_same_bytes(tmp_path):
+    """Identical bytes are not rewritten, so the file keeps its mtime."""
+    path = tmp_path / "out.csv"
+    assert write_if_changed(path, b"a,b\n")
+    os.utime(path, (1_000_000, 1_000_000))
+    assert not write_if_changed(path, b"a,b\n")
+    assert path.stat().st_mtime == 1_000_000
+    assert write_if_changed(path, b"a,c\n")
+    assert path.read_bytes() == b"a,c\n"
+
+
+def test_generated_date_only_moves_when_content_changes(tmp_path):
+    """Re-running on another day with the same content leaves files and sidecar untouched."""
+    files = GeneratedFiles(tmp_path, "test", today="2026-01-01")
+    files.write("matrix.csv", b"x\n")
+    assert files.save()
+
+    files = GeneratedFiles(tmp_path, "test", today="2026-02-01")
+    assert not files.write("matrix.csv", b"x\n")
+    assert not files.save()
+    assert files.generated("matrix.csv", b"x\n") == "2026-01-01"
+
+    files.write("matrix.csv", b"y\n")
+    files.save()
+    sidecar = json.loads((tmp_path / "generated.json").read_text(encoding="utf-8"))
+    assert sidecar["files"]["matrix.csv"]["generated"] == "2026-02-01"
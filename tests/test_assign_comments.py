@@ -0,0 +1,49 @@
+"""Tests for assign_comments.py class-wide template assignment."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from scripts.assign_comments import assign_class, synthetic_class
+from scripts.catalog import load_catalog
+from scripts.recommend import TemplateRecommender
+
+
+@pytest.fixture(scope="module")
+def recommender():
+    return TemplateRecommender(load_catalog())
+
+
+def test_every_child_gets_one_template_per_frame_and_section(recommender):
+    """Each child should receive one template for every frame x section slot."""
+    roster = synthetic_class(recommender.catalog, "class.test", children=5)
+    result = assign_class(recommender, roster, "class.test")
+    expected_slots = len(recommender.catalog.frames) * len(recommender.catalog.section_keys)
+    assert len(result.assignments) == 5
+    for slots in result.assignments.values():
+        assert len(slots) == expected_slots
+        for (frame_id, section), tid in slots.items():
+            tmpl = recommender.catalog.templates[tid]
+            assert (tmpl["frame"], tmpl["section"]) == (frame_id, section)
+
+
+def test_reuse_penalty_spreads_templates(recommender):
+    """A reuse penalty should lower the maximum reuse compared to pure fit."""
+    roster = synthetic_class(recommender.catalog, "class.test", children=30)
+    greedy_fit = assign_class(recommender, roster, reuse_penalty=0.0)
+    balanced = assign_class(recommender, roster, reuse_penalty=2.0)
+    assert balanced.max_reuse <= greedy_fit.max_reuse
+    assert balanced.max_reuse <= 11  # 30 children over 3 templates per slot
+
+
+def test_zero_time_budget_still_returns_greedy_assignment(recommender):
+    """An exhausted budget should stop local search but keep a full result."""
+    roster = synthetic_class(recommender.catalog, "class.test", children=3)
+    result = assign_class(recommender, roster, time_budget=0.0)
+    assert result.timed_out
+    assert result.passes == 0
+    assert len(result.assignments) == 3
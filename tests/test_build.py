@@ -0,0 +1,77 @@
+"""Tests for build.py incremental target builds."""
+
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from scripts.build import ActionCache, Builder, Target, sha256_file
+
+GEN = """import sys
+from pathlib import Path
+src, dst = sys.argv[1:3]
+with open("runs.log", "a") as log:
+    log.write(dst + "\\n")
+Path(dst).write_text(Path(src).read_text().upper())
+"""
+
+
+def _builder(tmp_path):
+    if not (tmp_path / "gen.py").exists():
+        (tmp_path / "gen.py").write_text(GEN)
+        (tmp_path / "in.txt").write_text("hello")
+    targets = {
+        "upper": Target("upper", ("gen.py", "in.txt", "out.txt"), ("in.txt", "gen.py"), ("out.txt",)),
+        "copy": Target("copy", ("gen.py", "out.txt", "final.txt"), ("out.txt",), ("final.txt",), deps=("upper",)),
+    }
+    return Builder(root=tmp_path, targets=targets, cache_dir=tmp_path / "cache", jobs=2)
+
+
+def _runs(tmp_path):
+    return (tmp_path / "runs.log").read_text().split()
+
+
+def test_unchanged_tree_is_a_no_op(tmp_path):
+    """A second build of an unchanged tree runs nothing."""
+    assert [r.status for r in _builder(tmp_path).build()] == ["built", "built"]
+    assert (tmp_path / "final.txt").read_text() == "HELLO"
+
+    assert [r.status for r in _builder(tmp_path).build()] == ["cached", "cached"]
+    assert _runs(tmp_path) == ["out.txt", "final.txt"]
+
+
+def test_missing_outputs_are_restored_from_cache(tmp_path):
+    """A deleted output is restored from the content-addressed store without rerunning."""
+    _builder(tmp_path).build()
+    (tmp_path / "final.txt").unlink()
+    assert [r.status for r in _builder(tmp_path).build(["copy"])] == ["cached", "restored"]
+    assert (tmp_path / "final.txt").read_text() == "HELLO"
+    assert len(_runs(tmp_path)) == 2
+
+
+def test_changed_input_rebuilds_dependents(tmp_path):
+    """A changed input rebuilds its target and every target depending on it."""
+    _builder(tmp_path).build()
+    (tmp_path / "in.txt").write_text("changed")
+    assert [r.status for r in _builder(tmp_path).build()] == ["built", "built"]
+    assert (tmp_path / "final.txt").read_text() == "CHANGED"
+
+
+def test_restore_only_touches_files_the_target_produced(tmp_path):
+    """A restore deletes stale files the target produced and leaves hand-written neighbours alone."""
+    site = tmp_path / "site"
+    site.mkdir()
+    target = Target("pages", ("pages.py",), ("pages.txt",), ("site",))
+    cache = ActionCache(tmp_path / "cache")
+    (site / "a.html").write_text("new a")
+    cache.store("new", tmp_path, {"site/a.html": sha256_file(site / "a.html")})
+
+    (site / "a.html").write_text("old a")
+    (site / "b.html").write_text("old b")
+    (site / "README.md").write_text("hand-written")
+    cache.record_produced("pages", {"site/a.html": "", "site/b.html": ""})
+    cache.restore(tmp_path, target, cache.lookup("new"))
+
+    assert sorted(p.name for p in site.iterdir()) == ["README.md", "a.html"]
+    assert (site / "a.html").read_text() == "new a"
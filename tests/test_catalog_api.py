@@ -0,0 +1,131 @@
+"""Tests for catalog_api.py responses, conditional GET and the asyncio server."""
+
+import asyncio
+import gzip
+import json
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from scripts.catalog import load_catalog
+from scripts.catalog_api import ApiSnapshot, CatalogServer, choose_encoding, serve
+
+SNAPSHOT = ApiSnapshot(load_catalog(PROJECT_ROOT))
+
+
+def _json(response) -> dict:
+    body = response.body
+    if ("Content-Encoding", "gzip") in response.headers:
+        body = gzip.decompress(body)
+    return json.loads(body)
+
+
+def test_choose_encoding():
+    """Accept-Encoding picks the best available variant, honouring q-values."""
+    assert choose_encoding("gzip, deflate, br", {"gzip", "br"}) == "br"
+    assert choose_encoding("br;q=0, gzip;q=0.5", {"gzip", "br"}) == "gzip"
+    assert choose_encoding("*", {"gzip"}) == "gzip"
+    assert choose_encoding("", {"gzip"}) == "identity"
+
+
+def test_filters_details_and_errors():
+    """Filters, detail routes and error statuses match the catalog."""
+    app = CatalogServer(SNAPSHOT)
+    catalog_templates = load_catalog(PROJECT_ROOT).templates
+    everything = _json(app.respond("GET", "/templates", {}))
+    assert everything["count"] == len(catalog_templates)
+
+    query = "/templates?frame=frame.belonging&section=key_learning&section=next_steps"
+    sliced = _json(app.respond("GET", query, {"accept-encoding": "gzip"}))
+    expected = [
+        t["id"]
+        for t in catalog_templates.values()
+        if t["frame"] == "frame.belonging" and t["section"] in ("key_learning", "next_steps")
+    ]
+    assert [t["id"] for t in sliced["items"]] == expected and expected
+
+    pattern_id = SNAPSHOT.collections["evidence-patterns"].order[0]
+    detail = _json(app.respond("GET", f"/evidence-patterns/{pattern_id}", {}))
+    assert "behaviors" in detail and "prompts" in detail
+
+    assert app.respond("GET", "/templates?colour=red", {}).status == 400
+    assert app.respond("GET", "/templates/template.missing", {}).status == 404
+    # A query on a single resource is ignored rather than turning it into a 404
+    template_id = SNAPSHOT.collections["templates"].order[0]
+    assert (
+        app.respond("GET", f"/templates/{template_id}?v=2", {}).body
+        == app.respond("GET", f"/templates/{template_id}", {}).body
+    )
+    assert app.respond("GET", "/coverage?x=1", {}).status == 200
+    assert app.respond("GET", "/?cb", {}).status == 200
+    assert app.respond("GET", "//templates", {}).status == 404
+    assert app.respond("POST", "/templates", {}).status == 405
+
+
+def test_etags_and_conditional_get():
+    """Each encoding has its own strong ETag, and only the negotiated one returns 304."""
+    app = CatalogServer(SNAPSHOT)
+    plain = app.respond("GET", "/templates", {})
+    zipped = app.respond("GET", "/templates", {"accept-encoding": "gzip"})
+    plain_tag, zipped_tag = dict(plain.headers)["ETag"], dict(zipped.headers)["ETag"]
+    assert plain_tag != zipped_tag and dict(zipped.headers)["Vary"] == "Accept-Encoding"
+    assert gzip.decompress(zipped.body) == plain.body
+
+    conditional = {"accept-encoding": "gzip", "if-none-match": f'W/{zipped_tag}, "other"'}
+    not_modified = app.respond("GET", "/templates", conditional)
+    assert not_modified.status == 304 and not_modified.body == b""
+    # The gzip tag does not validate the identity representation
+    assert app.respond("GET", "/templates", {"if-none-match": zipped_tag}).status == 200
+    assert app.respond("GET", "/templates", {"if-none-match": '"stale"'}).status == 200
+
+
+def test_server_keep_alive_and_head():
+    """The asyncio server answers keep-alive requests and sends no body for HEAD."""
+
+    async def scenario():
+        server = await serve(CatalogServer(SNAPSHOT), "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(b"HEAD /coverage HTTP/1.1\r\nHost: x\r\n\r\nGET / HTTP/1.1\r\nConnection: close\r\n\r\n")
+        data = await reader.read()
+        writer.close()
+        server.close()
+        await server.wait_closed()
+        return data
+
+    data = asyncio.run(scenario())
+    head, _, rest = data.partition(b"\r\n\r\n")
+    assert head.startswith(b"HTTP/1.1 200 OK") and b"Content-Length" in head
+    # HEAD sends no body, so the next response follows the blank line directly
+    second_head, _, body = rest.partition(b"\r\n\r\n")
+    assert second_head.startswith(b"HTTP/1.1 200 OK") and b"Connection: close" in second_head
+    assert "/coverage" in json.loads(body)["endpoints"]
+
+
+def test_oversized_requests_and_idle_connections_are_closed():
+    """Over-limit request lines and headers get 414/431, and idle keep-alive sockets time out."""
+
+    async def exchange(server, payload: bytes) -> bytes:
+        port = server.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(payload)
+        data = await asyncio.wait_for(reader.read(), 5)
+        writer.close()
+        return data
+
+    async def scenario():
+        server = await serve(CatalogServer(SNAPSHOT, idle_timeout=0.2), "127.0.0.1", 0)
+        long_line = await exchange(server, b"GET /" + b"a" * 70_000 + b" HTTP/1.1\r\n\r\n")
+        long_header = await exchange(server, b"GET / HTTP/1.1\r\nX-Big: " + b"b" * 70_000 + b"\r\n\r\n")
+        # A keep-alive client that never sends its next request
+        idle = await exchange(server, b"GET /frames HTTP/1.1\r\n\r\n")
+        server.close()
+        await server.wait_closed()
+        return long_line, long_header, idle
+
+    long_line, long_header, idle = asyncio.run(scenario())
+    assert long_line.startswith(b"HTTP/1.1 414 ") and b"Connection: close" in long_line
+    assert long_header.startswith(b"HTTP/1.1 431 ") and b"Connection: close" in long_header
+    assert idle.startswith(b"HTTP/1.1 200 OK") and b"Connection: close" not in idle
@@ -0,0 +1,141 @@
+"""Tests for catalog_reload.py copy-on-write snapshots and atomic swaps."""
+
+import os
+import shutil
+import sys
+import threading
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from scripts.artifacts import write_if_changed
+from scripts.catalog_reload import LiveCatalog
+
+EXTRA_TEMPLATE = """
+  - id: template.comment.belonging.key_learning.extra
+    type: comment_template
+    frame: frame.belonging
+    section: key_learning
+    tone: parent_friendly
+    slots: [child]
+    text: "{child} is learning."
+    indicators: [indicator.belonging.extra]
+    refs: [ref.ontario.kindergarten.program.2016]
+    status: draft
+    version: 0.1.0
+"""
+EXTRA_INDICATOR = """
+  - id: indicator.belonging.extra
+    frame: frame.belonging
+    name: Extra
+    description: Added by the hot reload test.
+"""
+
+
+def _insert(text: str, items: str) -> str:
+    """Add list items before the trailing ``_meta`` block."""
+
+    return text.replace("\n_meta:", items + "\n_meta:", 1)
+
+
+def _copy_repo(root: Path) -> None:
+    for name in ("taxonomy", "templates", "evidence"):
+        shutil.copytree(PROJECT_ROOT / name, root / name)
+    (root / "references").mkdir()
+    shutil.copy(PROJECT_ROOT / "references" / "bibliography.yaml", root / "references")
+
+
+def test_reload_shares_unchanged_items_and_keeps_old_snapshot_on_errors(tmp_path):
+    """Reloads share unchanged items, leave held snapshots intact and keep the old snapshot on errors."""
+    _copy_repo(tmp_path)
+    live = LiveCatalog(tmp_path)
+    first = live.snapshot
+    assert live.reload().changed == []
+
+    pattern = sorted((tmp_path / "evidence").glob("evidence.pattern.*.md"))[0]
+    pattern.write_text(pattern.read_text().replace("title: ", "title: Edited ", 1))
+    result = live.reload()
+    assert result.swapped and result.changed == [pattern.relative_to(tmp_path).as_posix()]
+    second = live.snapshot
+    assert second.generation == 2 and 0.9 < result.overlap < 1
+    tid = next(iter(first.catalog.templates))
+    assert second.catalog.templates[tid] is first.catalog.templates[tid]
+    # A reader still holding the first snapshot sees the old data
+    pid = next(p for p in first.catalog.evidence_patterns if pattern.name.startswith(p))
+    assert not first.catalog.evidence_patterns[pid]["title"].startswith("Edited")
+    assert second.catalog.evidence_patterns[pid]["title"].startswith("Edited")
+
+    templates = tmp_path / "templates" / "comment_templates.yaml"
+    templates.write_text(_insert(templates.read_text(), EXTRA_TEMPLATE))
+    result = live.reload()
+    assert not result.swapped and result.errors == [
+        "template.comment.belonging.key_learning.extra: unknown indicator indicator.belonging.extra"
+    ]
+    assert live.snapshot is second
+
+    templates.write_text(templates.read_text().replace(EXTRA_TEMPLATE, ""))
+    # Back to the live content: only the stat moved, so no rebuild and no new generation
+    assert live.reload().changed == [] and live.snapshot.catalog is second.catalog
+    stat = templates.stat()
+    os.utime(templates, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+    assert live.reload().changed == [] and live.snapshot.generation == 2
+    metrics = live.metrics.as_dict()
+    assert metrics["swaps"] == 1 and metrics["failures"] == 1 and metrics["generation"] == 2
+
+
+def test_readers_never_see_a_half_built_catalog(tmp_path):
+    """Concurrent readers only ever see complete, consistent snapshots while files change."""
+    _copy_repo(tmp_path)
+    templates = tmp_path / "templates" / "comment_templates.yaml"
+    indicators = tmp_path / "taxonomy" / "indicators.yaml"
+    base_templates, base_indicators = templates.read_text(), indicators.read_text()
+    live = LiveCatalog(tmp_path)
+    count = len(live.snapshot.catalog.templates)
+    problems: list[str] = []
+    generations: list[int] = []
+    done = threading.Event()
+
+    def reader() -> None:
+        last = 0
+        while not done.is_set():
+            snapshot = live.snapshot
+            catalog = snapshot.catalog
+            if snapshot.generation < last:
+                problems.append(f"generation went back from {last} to {snapshot.generation}")
+            last = snapshot.generation
+            generations.append(last)
+            if len(catalog.templates) not in (count, count + 1):
+                problems.append(f"generation {last}: {len(catalog.templates)} templates")
+            for tid, tmpl in catalog.templates.items():
+                missing = [i for i in tmpl["indicators"] if i not in catalog.indicators]
+                if missing:
+                    problems.append(f"generation {last}: {tid} -> {missing}")
+            # The snapshot a reader holds never changes under it
+            if len(snapshot.catalog.templates) != len(catalog.templates) or snapshot.catalog is not catalog:
+                problems.append(f"generation {last} changed while held")
+
+    readers = [threading.Thread(target=reader) for _ in range(3)]
+    for thread in readers:
+        thread.start()
+    live.start(interval=0.001)
+    try:
+        for _ in range(15):
+            # Saves land one file at a time, so the tree is briefly inconsistent in both directions
+            write_if_changed(templates, _insert(base_templates, EXTRA_TEMPLATE).encode())
+            time.sleep(0.02)
+            write_if_changed(indicators, _insert(base_indicators, EXTRA_INDICATOR).encode())
+            time.sleep(0.05)
+            write_if_changed(indicators, base_indicators.encode())
+            time.sleep(0.02)
+            write_if_changed(templates, base_templates.encode())
+            time.sleep(0.05)
+    finally:
+        live.stop()
+        done.set()
+        for thread in readers:
+            thread.join()
+
+    assert problems == []
+    assert live.metrics.swaps >= 2 and len(set(generations)) >= 2
@@ -0,0 +1,49 @@
+"""Tests for classify_notes.py observation-note tagging."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from scripts.catalog import load_catalog
+from scripts.classify_notes import AhoCorasick, NoteClassifier, evaluate, load_fixtures, normalize
+
+FIXTURES = PROJECT_ROOT / "tests" / "fixtures" / "observation_notes.yaml"
+
+
+@pytest.fixture(scope="module")
+def classifier():
+    return NoteClassifier(load_catalog())
+
+
+def test_normalize_stems_and_drops_stopwords():
+    """Inflected forms should share a stem and stopwords should be removed."""
+    assert normalize("Sharing the materials") == normalize("shares materials")
+    assert "the" not in normalize("the blocks")
+
+
+def test_automaton_reports_overlapping_matches():
+    """Aho–Corasick should report every pattern, including ones ending inside others."""
+    automaton = AhoCorasick()
+    automaton.add(("take", "turn"), "pair")
+    automaton.add(("turn",), "single")
+    automaton.build()
+    assert sorted(automaton.iter_matches(["we", "take", "turn", "now"])) == ["pair", "single"]
+
+
+def test_classify_tags_indicator_and_frame(classifier):
+    """A numeracy note should be tagged with the numeracy indicator and its frame."""
+    tags = classifier.classify("Jordan counted the cups and compared quantities at snack.")
+    assert "indicator.literacy_math.numeracy" in tags.indicators
+    assert "frame.literacy_math" in tags.frames
+
+
+def test_fixture_precision_and_recall(classifier):
+    """Labelled synthetic notes should meet minimum precision and recall."""
+    metrics = evaluate(classifier, load_fixtures(FIXTURES))
+    assert metrics["notes"] >= 30
+    assert metrics["precision"] >= 0.8
+    assert metrics["recall"] >= 0.9
@@ -26,3 +26,48 @@ def test_coverage_shows_100_percent(monkeypatch, capsys):
     captured = capsys.readouterr()
     assert "100%" in captured.out
     assert "Uncovered indicators: 0" in captured.out
+
+
+def _catalog():
+    from scripts.catalog import Catalog
+
+    return Catalog(
+        frames={"frame.a": {"id": "frame.a"}},
+        indicators={
+            "indicator.a.one": {"id": "indicator.a.one", "frame": "frame.a"},
+            "indicator.a.two": {"id": "indicator.a.two", "frame": "frame.a"},
+        },
+        templates={
+            "t1": {"id": "t1", "section": "key_learning", "indicators": ["indicator.a.one"], "refs": ["ref.x"]},
+            "t2": {"id": "t2", "section": "key_learning", "indicators": ["indicator.a.one"], "refs": []},
+            "t3": {"id": "t3", "section": "next_steps", "indicators": ["indicator.a.one", "indicator.a.two"]},
+        },
+        col_sections={"key_learning": {}, "growth": {}, "next_steps": {}},
+        refs={"ref.x": {"id": "ref.x"}},
+    )
+
+
+def test_sparse_coverage_metrics():
+    """Section gaps, missing refs and redundant templates come from the incidence matrices."""
+    from scripts.coverage import CoverageMatrices, compute_coverage, render_gaps_md
+
+    report = compute_coverage(CoverageMatrices.from_catalog(_catalog()))
+    assert report.templates_per_indicator.tolist() == [3, 1]
+    assert report.by_frame == {"frame.a": (2, 2)}
+    assert report.section_gaps("key_learning") == ["indicator.a.two"]
+    assert report.section_gaps("next_steps") == []
+    assert report.templates_without_refs == ["t2", "t3"]
+    assert report.redundant_groups == [["t1", "t2"]]
+    assert "## Indicators without a `growth` template" in render_gaps_md(report)
+
+
+def test_write_reports_skips_unchanged_files(tmp_path):
+    """Rewriting identical reports leaves the files and their mtimes untouched."""
+    from scripts.coverage import CoverageMatrices, compute_coverage, write_reports
+
+    report = compute_coverage(CoverageMatrices.from_catalog(_catalog()))
+    first = write_reports(report, tmp_path / "reports")
+    assert [changed for _, changed in first] == [True, True]
+    mtimes = [path.stat().st_mtime_ns for path, _ in first]
+    assert [changed for _, changed in write_reports(report, tmp_path / "reports")] == [False, False]
+    assert [path.stat().st_mtime_ns for path, _ in first] == mtimes
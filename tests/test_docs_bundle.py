@@ -0,0 +1,39 @@
+"""Tests for docs_bundle.py and the docs macros built on it."""
+
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from scripts import docs_macros
+from scripts.catalog import load_catalog
+from scripts.docs_bundle import build_bundle, load_bundle, write_bundle
+
+
+def test_bundle_round_trip_and_skip_unchanged(tmp_path):
+    """The bundle survives a write/load round trip, and an unchanged bundle is not rewritten."""
+    bundle = build_bundle(load_catalog())
+    out = tmp_path / "bundle.json"
+    assert write_bundle(bundle, out)
+    assert write_bundle(bundle, out) == []
+    loaded = load_bundle(out)
+    assert loaded["coverage"]["gaps"].keys() == set(bundle["sections"])
+    assert "frame.belonging" in loaded["templates_by_frame"]
+
+
+def test_backlinks_point_from_indicators_to_templates():
+    """Indicator backlinks list the templates that reference them."""
+    bundle = build_bundle(load_catalog())
+    links = bundle["backlinks"]["indicator.belonging.relationships"]
+    assert {"id": "template.comment.belonging.key_learning.01", "type": "template"} in links
+
+
+def test_macros_render_markdown_tables(monkeypatch):
+    """The docs macros render template and frame tables from the bundle."""
+    bundle = build_bundle(load_catalog())
+    monkeypatch.setattr(docs_macros, "get_bundle", lambda: bundle)
+    table = docs_macros.template_table("frame.belonging", "next_steps")
+    assert table.startswith("| Template | Section | Text | Indicators |")
+    assert "template.comment.belonging.next_steps.01" in table
+    assert "`frame.belonging`" in docs_macros.frame_table()
@@ -0,0 +1,62 @@
+"""Tests for evidence_body.py parsing and the catalog lookups built on it."""
+
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from scripts.catalog import load_catalog
+from scripts.evidence_body import check_body_indicators, parse_evidence_body, split_behaviors
+
+BODY = """
+## Context
+Children build together in the block area.
+
+## Observable Behaviors (Signals)
+| Indicator | Behaviors |
+|---|---|
+| `indicator.belonging.relationships` | Taking turns, sharing blocks (with prompting) |
+
+## Teacher Moves (Prompts)
+- "Who is building with you?"
+
+## Sample Observation Note (Template)
+> {child} shared blocks with a peer.
+"""
+
+
+def test_parse_extracts_records_with_line_numbers():
+    """Behaviors, prompts and sample note should be parsed with file line numbers."""
+    body = parse_evidence_body(BODY, "evidence.pattern.demo", first_line=10)
+    assert body.context == "Children build together in the block area."
+    assert body.table_indicators == ["indicator.belonging.relationships"]
+    assert body.behaviors[0].behaviors == ("Taking turns", "sharing blocks")
+    assert body.behaviors[0].line == 17
+    assert [p.prompt for p in body.prompts] == ["Who is building with you?"]
+    assert body.sample_note == "{child} shared blocks with a peer."
+
+
+def test_split_behaviors_drops_parentheticals():
+    """Behavior lists split on commas and semicolons, without parenthetical asides."""
+    assert split_behaviors("Counting (1-10), comparing; sorting.") == ["Counting", "comparing", "sorting"]
+
+
+def test_check_body_indicators_reports_both_directions():
+    """Mismatches between the table and front matter should be reported both ways."""
+    body = parse_evidence_body(BODY, "evidence.pattern.demo")
+    errors = check_body_indicators({"indicators": ["indicator.belonging.community"]}, body)
+    assert any("table lists indicator.belonging.relationships" in e for e in errors)
+    assert any("front matter lists indicator.belonging.community" in e for e in errors)
+    assert check_body_indicators({"indicators": ["indicator.belonging.relationships"]}, body) == []
+
+
+def test_catalog_indexes_behaviors_and_prompts_by_indicator():
+    """Every indicator in a behaviors table should be indexed in the catalog."""
+    catalog = load_catalog()
+    assert catalog.evidence_bodies
+    for body in catalog.evidence_bodies.values():
+        for record in body.behaviors:
+            assert record in catalog.behaviors_by_indicator[record.indicator_id]
+        if body.prompts:
+            assert body.prompts[0] in catalog.prompts_by_indicator[body.table_indicators[0]]
@@ -0,0 +1,47 @@
+"""Tests for front_matter.py bounded header reads."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from scripts import front_matter
+from scripts.front_matter import read_body, read_header
+
+
+def test_header_offset_and_body_resume(tmp_path):
+    """The header reports the body byte offset and line without decoding the body."""
+    path = tmp_path / "doc.md"
+    path.write_bytes("---\nid: doc.é\n---\n\n# Title\n".encode() + b"\xff" * 100_000)
+    header = read_header(path)
+    assert header.yaml == "id: doc.é"
+    # The trailing blank line belongs to the delimiter, as with the old regex
+    assert (header.offset, header.line) == (len("---\nid: doc.é\n---\n\n".encode()), 5)
+    with pytest.raises(UnicodeDecodeError):
+        read_body(path, header.offset)
+
+
+def test_delimiter_split_across_chunks(tmp_path, monkeypatch):
+    """A closing delimiter and its trailing blank lines are found across chunk boundaries."""
+    monkeypatch.setattr(front_matter, "FIRST_CHUNK", 8)
+    path = tmp_path / "doc.md"
+    path.write_text("---\nid: a\ntitle: b\n---   \n\n\nBody\n")
+    header = read_header(path)
+    assert header.yaml == "id: a\ntitle: b"
+    assert read_body(path, header.offset) == "Body\n"
+
+
+def test_missing_and_oversized_headers(tmp_path):
+    """Missing, unterminated and oversized headers are errors."""
+    (tmp_path / "none.md").write_text("# Title\n---\n")
+    (tmp_path / "open.md").write_text("---\nid: a\n")
+    (tmp_path / "big.md").write_text("---\n" + "x: 1\n" * 1000 + "---\n")
+    for name in ("none.md", "open.md"):
+        with pytest.raises(ValueError, match="Missing YAML front matter"):
+            read_header(tmp_path / name)
+    with pytest.raises(ValueError, match="larger than 1024 bytes"):
+        read_header(tmp_path / "big.md", max_bytes=1024)
+    assert read_header(tmp_path / "big.md").line == 1003
@@ -0,0 +1,92 @@
+"""Tests for impact.py reverse index, closure and git diff summary."""
+
+import subprocess
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from scripts.impact import COMMENT_MARKER, ImpactIndex, analyze, diff_changes, line_artifacts, render_summary
+from scripts.link_graph import LinkGraph
+
+TEMPLATES = """templates:
+  - id: template.a.1
+    indicators:
+      - indicator.a.x
+  - id: template.a.2
+    indicators: [indicator.a.y]
+"""
+
+
+def test_line_artifacts_and_index():
+    """Each indexed ID records its line and the artifact that encloses it."""
+    owners = line_artifacts("templates/t.yaml", TEMPLATES)
+    assert owners[1] == "templates/t.yaml" and owners[4] == "template.a.1" and owners[6] == "template.a.2"
+    assert line_artifacts("m.csv", "a,b\nx,y\n")[2] == "m.csv:2"
+
+    refs = ImpactIndex.index_file("templates/t.yaml", TEMPLATES)
+    assert refs == [["indicator.a.x", 4, "template.a.1"], ["indicator.a.y", 6, "template.a.2"]]
+    assert ImpactIndex.index_file("docs/x.md", "See evidence.pattern.play.md.\n") == [
+        ["evidence.pattern.play", 1, "docs/x.md"]
+    ]
+
+
+def test_refresh_is_incremental_and_closure_is_transitive(tmp_path):
+    """Refreshes only re-read changed files, and reports combine direct locations with graph dependents."""
+    (tmp_path / "templates").mkdir()
+    (tmp_path / "templates" / "t.yaml").write_text(TEMPLATES)
+    datasets = tmp_path / "datasets" / "traceability"
+    datasets.mkdir(parents=True)
+    (datasets / "matrix.csv").write_text("indicator_id,template_id\nindicator.a.x,template.a.1\n")
+    (datasets / "evidence_prompts.csv").write_text("indicator_id,prompt\nindicator.a.x,What next?\n")
+    index = ImpactIndex(tmp_path)
+    assert sorted(index.refresh()) == [
+        "datasets/traceability/evidence_prompts.csv",
+        "datasets/traceability/matrix.csv",
+        "templates/t.yaml",
+    ]
+    assert index.refresh() == []
+
+    graph = LinkGraph.from_edges(
+        {"indicator.a.x": ("artifact", ""), "template.a.1": ("artifact", "")},
+        {("template.a.1", "indicator.a.x", "indicator")},
+    )
+    report = analyze("indicator.a.x", index, graph)
+    assert report.dependents == ["template.a.1"]
+    assert [str(loc) for loc in report.direct] == [
+        "datasets/traceability/evidence_prompts.csv:2",
+        "datasets/traceability/matrix.csv:2",
+        "templates/t.yaml:4 (template.a.1)",
+    ]
+    counts = report.by_category()
+    assert counts["templates"] == {"template.a.1"}
+    assert counts["matrix rows"] == {"datasets/traceability/matrix.csv:2"}
+    assert counts["dataset rows"] == {"datasets/traceability/evidence_prompts.csv:2"}
+
+
+def test_diff_changes_reports_removed_and_modified(tmp_path):
+    """A git diff yields removed, added and modified IDs for the PR summary."""
+
+    def git(*args):
+        subprocess.run(["git", *args], cwd=tmp_path, check=True, capture_output=True)
+
+    (tmp_path / "taxonomy").mkdir()
+    path = tmp_path / "taxonomy" / "indicators.yaml"
+    path.write_text("indicators:\n  - id: indicator.a.x\n    name: X\n  - id: indicator.a.y\n    name: Y\n")
+    git("init", "-q")
+    git("add", ".")
+    git("-c", "user.name=t", "-c", "user.email=t@example.com", "commit", "-qm", "base")
+    path.write_text("indicators:\n  - id: indicator.a.z\n    name: X\n  - id: indicator.a.y\n    name: Why\n")
+
+    changes = diff_changes("HEAD", root=tmp_path)
+    assert changes.removed == ["indicator.a.x"] and changes.added == ["indicator.a.z"]
+    assert changes.modified == ["indicator.a.y"]
+
+    index = ImpactIndex(tmp_path)
+    index.refresh()
+    graph = LinkGraph.from_edges({}, set())
+    summary = render_summary(changes, {i: analyze(i, index, graph) for i in changes.removed + changes.modified})
+    assert summary.startswith(COMMENT_MARKER + "\n")
+    assert "| `indicator.a.x` | removed/renamed |" in summary
+    assert "**Added:** `indicator.a.z`" in summary
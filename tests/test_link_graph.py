@@ -0,0 +1,91 @@
+"""Tests for link_graph.py adjacency arrays and queries."""
+
+import shutil
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from scripts.link_graph import LinkGraph, build_graph, load_or_build
+
+
+def _graph():
+    nodes = {
+        "doc.index": ("document", "index.md"),
+        "doc.guide": ("document", "docs/guide.md"),
+        "doc.lost": ("document", "docs/lost.md"),
+        "taxonomy/frames.yaml": ("file", "taxonomy/frames.yaml"),
+        "frame.a": ("artifact", ""),
+        "indicator.a.x": ("artifact", ""),
+        "template.a.1": ("artifact", ""),
+    }
+    edges = {
+        ("doc.index", "doc.guide", "link"),
+        ("doc.index", "taxonomy/frames.yaml", "link"),
+        ("taxonomy/frames.yaml", "frame.a", "defines"),
+        ("indicator.a.x", "frame.a", "frame"),
+        ("template.a.1", "indicator.a.x", "indicator"),
+        ("doc.lost", "template.a.1", "link"),
+    }
+    return LinkGraph.from_edges(nodes, edges)
+
+
+def test_backlinks_orphans_and_impact():
+    """Backlinks, orphan documents and impact sets come from the adjacency arrays."""
+    graph = _graph()
+    assert graph.backlinks("frame.a") == [("indicator.a.x", "frame"), ("taxonomy/frames.yaml", "defines")]
+    assert graph.orphans() == ["docs/lost.md"]
+    # Neither the defining YAML file nor documents linking to dependents are impacted
+    assert graph.impact("frame.a") == ["indicator.a.x", "template.a.1"]
+    assert graph.impact("doc.guide") == ["doc.index"]
+
+
+def test_masked_queries_leave_adjacency_intact():
+    """Reachability over a subset of edge kinds does not change the graph's own arrays."""
+    graph = _graph()
+    before = graph.edges_from("doc.index")
+    assert graph.reachable(["template.a.1"], ("indicator", "frame")) == {"template.a.1", "indicator.a.x", "frame.a"}
+    assert graph.edges_from("doc.index") == before
+    assert graph.reachable(["doc.index"], ("link",)) == {"doc.index", "doc.guide", "taxonomy/frames.yaml"}
+
+
+def test_json_round_trip_and_networkx():
+    """The graph survives a JSON round trip and converts to networkx with edge kinds."""
+    graph = _graph()
+    loaded = LinkGraph.from_json(graph.to_json())
+    assert loaded.edges_from("doc.index") == graph.edges_from("doc.index")
+    assert loaded.orphans() == graph.orphans()
+
+    nx_graph = loaded.to_networkx()
+    assert nx_graph.number_of_edges() == graph.edge_count
+    assert nx_graph.edges["template.a.1", "indicator.a.x"]["kind"] == "indicator"
+
+
+def test_workspace_graph_covers_relation_kinds():
+    """The workspace graph has every edge kind and resolves guidance backlinks."""
+    graph = build_graph(PROJECT_ROOT)
+    kinds = {kind for name in graph.nodes for _target, kind in graph.edges_from(name)}
+    assert kinds == {"link", "defines", "ref", "indicator", "frame", "guidance_ref"}
+    assert ("col_section.key_learning", "guidance_ref") in graph.backlinks("doc.guidance.comment_style")
+    assert "index.md" not in graph.orphans()
+
+
+def test_persisted_graph_is_reused_until_the_workspace_changes(tmp_path):
+    """Queries load the saved graph while the workspace fingerprint matches and rebuild otherwise."""
+    for name in ("taxonomy", "templates"):
+        shutil.copytree(PROJECT_ROOT / name, tmp_path / name)
+    (tmp_path / "references").mkdir()
+    shutil.copy(PROJECT_ROOT / "references" / "bibliography.yaml", tmp_path / "references")
+    (tmp_path / "index.md").write_text("# Home\n")
+    saved = tmp_path / "build" / "link_graph.json"
+
+    graph, rebuilt = load_or_build(saved, tmp_path)
+    assert rebuilt and graph.node_for_path("index.md") == "index.md"
+    assert load_or_build(saved, tmp_path)[1] is False
+    assert load_or_build(saved, tmp_path, rebuild=True)[1] is True
+
+    (tmp_path / "guide.md").write_text("# Guide\n")
+    (tmp_path / "index.md").write_text("# Home\n\n[Guide](guide.md)\n")
+    graph, rebuilt = load_or_build(saved, tmp_path)
+    assert rebuilt and graph.edges_from("index.md") == [("guide.md", "link")]
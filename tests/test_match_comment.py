@@ -0,0 +1,60 @@
+"""Tests for match_comment.py reverse template matching."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from scripts.catalog import load_catalog
+from scripts.match_comment import TemplateMatcher
+from scripts.report_batch import render_template
+
+
+@pytest.fixture(scope="module")
+def catalog():
+    return load_catalog()
+
+
+@pytest.fixture(scope="module")
+def matcher(catalog):
+    return TemplateMatcher(catalog.templates)
+
+
+def test_every_rendered_template_round_trips(catalog, matcher):
+    """Rendering any template and matching it back should recover the template and slots."""
+    for tid, tmpl in catalog.templates.items():
+        values = {slot: f"value for {slot}" for slot in tmpl["slots"]}
+        values["child"] = "Avery"
+        rendered = render_template(tmpl["text"], values)
+        found = matcher.match_exact(rendered)
+        assert found is not None, tid
+        assert found.template_id == tid
+        assert found.slots["child"] == "Avery"
+        assert set(found.slots) == set(tmpl["slots"])
+
+
+def test_shared_prefixes_are_disambiguated():
+    """Templates sharing literal prefixes should each match their own text."""
+    matcher = TemplateMatcher(
+        {
+            "t.one": {"text": "{child} is building friendships by {evidence}."},
+            "t.two": {"text": "{child} is building confidence when {evidence}."},
+        }
+    )
+    found = matcher.match_exact("Sam is building confidence when sharing at circle.")
+    assert found.template_id == "t.two"
+    assert found.slots == {"child": "Sam", "evidence": "sharing at circle"}
+
+
+def test_edited_comment_falls_back_to_closest(matcher):
+    """A hand-edited comment should return the closest template with a distance."""
+    edited = "Avery contributes to our learning community. They do this by helping a classmate."
+    found = matcher.match(edited)
+    assert found is not None
+    assert not found.exact
+    assert found.template_id == "template.comment.belonging.key_learning.03"
+    assert found.distance > 0
+    assert matcher.match(edited, fuzzy=False) is None
@@ -0,0 +1,44 @@
+"""Tests for matrix_diff.py row-level matrix diffs."""
+
+import json
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+PROJECT_ROOT = Path(__file__).parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from scripts.matrix_diff import describe_change, diff_tables, load_matrix
+
+MATRIX_CSV = PROJECT_ROOT / "datasets" / "traceability" / "matrix.csv"
+
+
+def test_identical_matrix_has_no_diff_across_formats(tmp_path):
+    """CSV and Parquet versions of the same matrix compare equal; `generated` is ignored."""
+    df = pd.read_csv(MATRIX_CSV)
+    df["generated"] = "2099-01-01"
+    df["ref_ids"] = df["ref_ids"].apply(json.loads)
+    df.to_parquet(tmp_path / "matrix.parquet", index=False)
+
+    diff = diff_tables(load_matrix(str(MATRIX_CSV)), load_matrix(str(tmp_path / "matrix.parquet")))
+    assert diff.is_empty
+    assert diff.unchanged == len(df)
+
+
+def test_added_removed_and_ref_changes(tmp_path):
+    """Added and removed trace links are listed, and ref changes are described per row."""
+    header = "template_id,indicator_id,section,ref_ids,generated\n"
+    (tmp_path / "old.csv").write_text(
+        header + 't1,i1,growth,"[""ref.a""]",2026-01-01\nt2,i1,growth,[],2026-01-01\n', encoding="utf-8"
+    )
+    (tmp_path / "new.csv").write_text(
+        header + 't1,i1,growth,"[""ref.a"", ""ref.b""]",2026-02-01\nt3,i2,next_steps,[],2026-02-01\n',
+        encoding="utf-8",
+    )
+    diff = diff_tables(load_matrix(str(tmp_path / "old.csv")), load_matrix(str(tmp_path / "new.csv")))
+    assert diff.added.column("template_id").to_pylist() == ["t3"]
+    assert diff.removed.column("template_id").to_pylist() == ["t2"]
+    changed = diff.changed.to_pylist()
+    assert len(changed) == 1
+    assert describe_change(changed[0], diff.compared) == ["+ref ref.b"]
@@ -0,0 +1,68 @@
+"""Tests for migrate_ids.py bulk ID renames."""
+
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from scripts.migrate_ids import Renamer, apply, check_rename_map, load_rename_map, plan, plan_moves
+
+
+def test_rewrite_is_whole_token_and_simultaneous():
+    """Renames match whole ID tokens only and apply at the same time, so swaps work."""
+    renamer = Renamer(
+        {"indicator.a": "indicator.b", "indicator.b": "indicator.a", "evidence.pattern.x": "evidence.pattern.y"}
+    )
+    text = "indicator.a, indicator.b, indicator.a.sub, xindicator.a, [link](evidence.pattern.x.md#top)"
+    assert renamer.rewrite(text) == (
+        "indicator.b, indicator.a, indicator.a.sub, xindicator.a, [link](evidence.pattern.y.md#top)",
+        3,
+    )
+
+
+def test_check_rename_map():
+    """Bad conventions, colliding targets and existing IDs are reported before any rewrite."""
+    errors = check_rename_map(
+        {"frame.a": "Frame.B", "frame.c": "frame.d", "frame.e": "frame.d", "frame.f": "frame.g"},
+        existing={"frame.g"},
+    )
+    assert errors == [
+        "frame.a -> Frame.B: new ID does not follow the type.domain.name convention",
+        "frame.d: target of several renames (frame.c, frame.e)",
+        "frame.g: already exists and is not renamed away",
+    ]
+
+
+def test_plan_and_apply(tmp_path):
+    """Planned rewrites keep comments, move renamed files and leave generated folders alone."""
+    (tmp_path / "evidence").mkdir()
+    (tmp_path / "templates").mkdir()
+    (tmp_path / "evidence" / "evidence.pattern.x.md").write_text(
+        "---\nid: evidence.pattern.x\nindicators:\n  - indicator.a  # keep me\n---\n\nSee indicator.a.\n"
+    )
+    template = "templates:\n  - id: template.t  # comment\n    indicators: ['indicator.a', indicator.z]\n"
+    (tmp_path / "templates" / "t.yaml").write_text(template)
+    (tmp_path / "datasets").mkdir()
+    (tmp_path / "datasets" / "m.md").write_text("indicator.a\n")
+    renames = load_rename_map(_write(tmp_path / "map.csv", "old,new\nindicator.a,indicator.b\n"))
+    renames["evidence.pattern.x"] = "evidence.pattern.y"
+
+    changes = plan(tmp_path, renames, jobs=1)
+    assert sorted(c.path for c in changes) == ["evidence/evidence.pattern.x.md", "templates/t.yaml"]
+    assert all(c.error is None for c in changes)
+    moves = plan_moves(tmp_path, renames)
+    assert moves == [("evidence/evidence.pattern.x.md", "evidence/evidence.pattern.y.md")]
+
+    apply(tmp_path, changes, moves)
+    assert (tmp_path / "evidence" / "evidence.pattern.y.md").read_text() == (
+        "---\nid: evidence.pattern.y\nindicators:\n  - indicator.b  # keep me\n---\n\nSee indicator.b.\n"
+    )
+    assert (tmp_path / "templates" / "t.yaml").read_text() == template.replace("indicator.a", "indicator.b")
+    # Generated folders are left for the build to regenerate
+    assert (tmp_path / "datasets" / "m.md").read_text() == "indicator.a\n"
+
+
+def _write(path: Path, text: str) -> Path:
+    path.write_text(text)
+    return path
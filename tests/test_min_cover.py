@@ -0,0 +1,53 @@
+"""Tests for min_cover.py set-cover solvers."""
+
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from scripts.min_cover import exact_cover, greedy_cover, main, reduce_candidates, solve, synthetic_library
+
+
+def test_exact_beats_greedy_on_classic_trap():
+    """Greedy takes the big middle set; the exact solver finds the two-set cover."""
+    candidates = [("left", 0b000111), ("right", 0b111000), ("middle", 0b011110), ("a", 0b000001), ("b", 0b100000)]
+    assert len(greedy_cover(candidates, 0b111111)) == 3
+    assert sorted(exact_cover(candidates, 0b111111)) == ["left", "right"]
+
+
+def test_reduce_drops_duplicates_and_subsets():
+    """Candidates whose coverage duplicates or is contained in another candidate are dropped."""
+    assert reduce_candidates([("t1", 0b011), ("t2", 0b011), ("t3", 0b001), ("t4", 0b100)]) == [
+        ("t1", 0b011),
+        ("t4", 0b100),
+    ]
+
+
+def test_solve_reports_redundant_templates_and_gaps():
+    """Each (frame, section) group keeps a cover and lists the rest as redundant."""
+    indicators = {i: {"id": i, "frame": "frame.a"} for i in ("ind.a1", "ind.a2", "ind.a3")}
+    templates = [
+        {"id": "t1", "frame": "frame.a", "section": "growth", "indicators": ["ind.a1", "ind.a2"]},
+        {"id": "t2", "frame": "frame.a", "section": "growth", "indicators": ["ind.a1"]},
+        {"id": "t3", "frame": "frame.a", "section": "growth", "indicators": ["ind.a3"]},
+    ]
+    groups = solve(templates, indicators, sections=["growth", "next_steps"], exact=True)
+    growth, next_steps = groups
+    assert (growth.selected, growth.redundant, growth.method) == (["t1", "t3"], ["t2"], "exact")
+    assert next_steps.selected == [] and next_steps.uncoverable == ["ind.a1", "ind.a2", "ind.a3"]
+
+
+def test_synthetic_library_cover_is_complete():
+    """Every selected group covers its whole indicator universe on a large synthetic library."""
+    templates, indicators = synthetic_library(3000, indicators_per_frame=8)
+    by_id = {t["id"]: t for t in templates}
+    for group in solve(templates, indicators):
+        covered = {i for tid in group.selected for i in by_id[tid]["indicators"]}
+        assert covered == set(group.universe)
+
+
+def test_main_takes_argv(capsys):
+    """main() parses the given argv instead of sys.argv."""
+    assert main(["--synthetic", "200", "--boards", "2", "--quiet"]) == 0
+    assert "Selected " in capsys.readouterr().out
@@ -0,0 +1,56 @@
+"""Tests for recommend.py template ranking."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from scripts.catalog import load_catalog
+from scripts.recommend import TemplateRecommender, main
+
+
+@pytest.fixture(scope="module")
+def recommender():
+    return TemplateRecommender(load_catalog())
+
+
+def test_evidence_pattern_query_ranks_by_overlap(recommender):
+    """Templates covering more of the pattern's indicators should rank first."""
+    results = recommender.recommend(evidence_pattern="evidence.pattern.block_play", k=3)
+    assert results
+    assert results[0].template_id == "template.comment.belonging.key_learning.01"
+    assert results[0].score == 2
+    assert [r.score for r in results] == sorted((r.score for r in results), reverse=True)
+
+
+def test_section_and_frame_filters(recommender):
+    """Filters should restrict candidates to the requested section and frame."""
+    results = recommender.recommend(
+        indicators=["indicator.belonging.relationships"], section="next_steps", frame="frame.belonging", k=10
+    )
+    catalog = recommender.catalog
+    assert results
+    for rec in results:
+        tmpl = catalog.templates[rec.template_id]
+        assert tmpl["section"] == "next_steps"
+        assert tmpl["frame"] == "frame.belonging"
+        assert "indicator.belonging.relationships" in rec.matched
+
+
+def test_unknown_ids_raise(recommender):
+    """Unknown indicators and evidence patterns should raise ValueError."""
+    with pytest.raises(ValueError):
+        recommender.recommend(indicators=["indicator.does.not_exist"])
+    with pytest.raises(ValueError):
+        recommender.recommend(evidence_pattern="evidence.pattern.missing")
+
+
+def test_cli_prints_ranked_list(capsys):
+    """CLI should print a numbered ranking."""
+    exit_code = main(["evidence.pattern.block_play", "-k", "2"])
+    captured = capsys.readouterr()
+    assert exit_code == 0
+    assert captured.out.startswith("1. template.comment.")
@@ -0,0 +1,68 @@
+"""Tests for report_batch.py streaming pipeline."""
+
+import csv
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from scripts.catalog import load_catalog
+from scripts.report_batch import (
+    check_length,
+    check_pii,
+    iter_synthetic_rosters,
+    plural_verb,
+    render_template,
+    run_batch,
+)
+from scripts.sis_export import verify_manifest
+
+
+def test_render_capitalizes_sentence_starts():
+    """Slot values that start a sentence should be capitalized."""
+    text = "{child} shares ideas.\n{pronoun_subject} shows this by {evidence}.\n"
+    rendered = render_template(text, {"child": "Avery", "pronoun_subject": "they", "evidence": "helping peers"})
+    assert rendered == "Avery shares ideas. They show this by helping peers."
+
+
+def test_render_uses_plural_verbs_after_they():
+    """Singular "they" takes the plural verb, including one supplied by a later slot."""
+    text = "{child} now {change}.\n{pronoun_subject} now {change}, and {pronoun_subject} does this daily."
+    values = {"child": "Avery", "pronoun_subject": "they", "change": "initiates conversations"}
+    assert render_template(text, values) == (
+        "Avery now initiates conversations. They now initiate conversations, and they do this daily."
+    )
+    she = render_template("{pronoun_subject} does this.", {"pronoun_subject": "she"})
+    assert she == "She does this."
+    assert plural_verb("tries") == "try" and plural_verb("reaches") == "reach" and plural_verb("uses") == "use"
+    assert plural_verb("can") == "can" and plural_verb("focus") == "focus"
+
+
+def test_checks_flag_pii_and_placeholders():
+    """PII and unfilled placeholders should be rejected."""
+    assert check_pii("Contact teacher@school.ca today.") == "Email address detected"
+    assert check_pii("Avery shares ideas.") is None
+    assert check_length("Avery shows {evidence}.", 500) == "Unfilled placeholder"
+    assert check_length("Avery shares ideas.", 10).startswith("Too long")
+
+
+def test_run_batch_writes_every_comment(tmp_path):
+    """Every child x frame x section comment should be exported, with bounded in-flight classes."""
+    catalog = load_catalog()
+    rosters = iter_synthetic_rosters(catalog, classes=3, children=4)
+    report = run_batch(rosters, tmp_path, workers=2, in_flight=2, max_bytes=20_000)
+
+    expected = 3 * 4 * len(catalog.frames) * len(catalog.section_keys)
+    assert report.classes == 3
+    assert report.written + report.rejected == expected
+    assert report.max_in_flight <= 2
+    assert report.stages["render"].items == expected
+
+    rows = []
+    for chunk in sorted(tmp_path.glob("comments-*.csv")):
+        with chunk.open(encoding="utf-8", newline="") as handle:
+            rows.extend(csv.DictReader(handle))
+    assert len(rows) == report.written
+    assert all("{" not in row["text"] for row in rows)
+    assert verify_manifest(tmp_path) == []
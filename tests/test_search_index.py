@@ -0,0 +1,87 @@
+"""Tests for search_index.py full-text search, facets and export."""
+
+import json
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from scripts.search_index import SearchIndex, main, to_fts_query
+
+GUIDE = """---
+id: doc.guidance.play
+type: document
+status: draft
+tags: [guidance, play]
+refs: [ref.a]
+title: Play Guide
+---
+
+# Play Guide
+
+Children explore materials during play-based learning.
+"""
+
+
+def _corpus(root: Path) -> None:
+    (root / "guidance").mkdir()
+    (root / "sources").mkdir()
+    (root / "guidance" / "play.md").write_text(GUIDE)
+    (root / "sources" / "Research Notes.md").write_text("# **Research** Notes\n\nAnecdotal reporting and play.\n")
+    (root / "sources" / "data.csv").write_text("play\n")
+
+
+def test_to_fts_query():
+    """User queries become quoted FTS5 terms with a prefix match on the last word."""
+    assert to_fts_query('play "based') == '"play" "based"*'
+    assert to_fts_query("play ") == '"play"'
+    assert to_fts_query("  ?! ") == ""
+
+
+def test_search_facets_and_snippets(tmp_path):
+    """Searches rank title matches first, highlight snippets and narrow by facets."""
+    _corpus(tmp_path)
+    index = SearchIndex(tmp_path, db_path=None)
+    assert sorted(index.refresh()) == ["guidance/play.md", "sources/Research Notes.md"]
+
+    hits = index.search("play")
+    # Title matches weigh more
+    assert [h.path for h in hits] == ["guidance/play.md", "sources/Research Notes.md"]
+    assert hits[0].id == "doc.guidance.play" and hits[1].title == "Research Notes"
+    assert "**play**" in hits[0].snippet
+    assert [h.path for h in index.search("explor")] == ["guidance/play.md"]
+    assert [h.path for h in index.search("play", {"folder": "sources"})] == ["sources/Research Notes.md"]
+    assert [h.path for h in index.search("", {"tags": ["play", "other"]})] == ["guidance/play.md"]
+
+    counts = index.facet_counts("play")
+    assert counts["folder"] == {"guidance": 1, "sources": 1} and counts["refs"] == {"ref.a": 1}
+
+
+def test_refresh_is_incremental_and_export_is_static(tmp_path):
+    """Refreshes only re-index changed or deleted files, and the export is a static inverted index."""
+    _corpus(tmp_path)
+    db = tmp_path / "build" / "search.sqlite"
+    index = SearchIndex(tmp_path, db)
+    index.refresh()
+    index.close()
+
+    index = SearchIndex(tmp_path, db)
+    assert index.refresh() == []
+    (tmp_path / "sources" / "Research Notes.md").unlink()
+    (tmp_path / "guidance" / "play.md").write_text(GUIDE.replace("explore", "sort"))
+    assert sorted(index.refresh()) == ["guidance/play.md", "sources/Research Notes.md"]
+    assert index.search("explore") == [] and len(index.search("sort")) == 1
+
+    exported = index.export()
+    assert [d["path"] for d in exported["docs"]] == ["guidance/play.md"]
+    assert exported["docs"][0]["tags"] == ["guidance", "play"]
+    assert exported["terms"]["play"] == [0, 3]
+
+
+def test_export_outside_the_repo(tmp_path, capsys):
+    """The export can be written anywhere, and its path is reported as given."""
+    target = tmp_path / "out" / "index.json"
+    assert main(["--export", str(target), "--db", str(tmp_path / "search.db")]) == 0
+    assert json.loads(target.read_text())["docs"]
+    assert f"wrote {target} " in capsys.readouterr().out
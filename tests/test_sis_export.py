@@ -0,0 +1,74 @@
+"""Tests for sis_export.py chunked export writers."""
+
+import csv
+import json
+import sys
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from scripts.sis_export import CsvExportWriter, XmlExportWriter, synthetic_comments, verify_manifest
+
+
+def test_csv_chunks_respect_size_limit(tmp_path):
+    """CSV output should roll over into chunks that stay under max_bytes."""
+    with CsvExportWriter(tmp_path, max_bytes=4_000) as writer:
+        writer.write_many(synthetic_comments(100))
+
+    manifest = json.loads((tmp_path / "manifest.json").read_text(encoding="utf-8"))
+    assert manifest["rows"] == 100
+    assert len(manifest["chunks"]) > 1
+    assert all(chunk["bytes"] <= 4_000 for chunk in manifest["chunks"])
+
+    rows = []
+    for chunk in manifest["chunks"]:
+        with (tmp_path / chunk["file"]).open(encoding="utf-8", newline="") as handle:
+            rows.extend(csv.DictReader(handle))
+    assert len(rows) == 100
+    assert rows[0]["text"].startswith("Avery")
+
+
+def test_xml_chunks_are_well_formed(tmp_path):
+    """Each XML chunk should parse on its own and escape text."""
+    with XmlExportWriter(tmp_path, max_bytes=5_000) as writer:
+        writer.write_many(synthetic_comments(50))
+
+    total = 0
+    for chunk in writer.chunks:
+        root = ET.parse(tmp_path / chunk["file"]).getroot()
+        assert root.tag == "col_comments"
+        total += len(root)
+        assert "&" in root[0].text  # round-trips the escaped ampersand
+    assert total == 50
+
+
+def test_verify_detects_tampering(tmp_path):
+    """verify_manifest should flag a chunk modified after export."""
+    with CsvExportWriter(tmp_path, max_rows=10) as writer:
+        writer.write_many(synthetic_comments(25))
+    assert verify_manifest(tmp_path) == []
+
+    first = tmp_path / writer.chunks[0]["file"]
+    first.write_text(first.read_text(encoding="utf-8") + "extra\n", encoding="utf-8")
+    errors = verify_manifest(tmp_path)
+    assert any("checksum mismatch" in e for e in errors)
+
+
+def test_oversized_record_raises(tmp_path):
+    """A record that cannot fit in any chunk should raise ValueError."""
+    with pytest.raises(ValueError), CsvExportWriter(tmp_path, max_bytes=50) as writer:
+        writer.write(next(synthetic_comments(1)))
+    assert not list(tmp_path.glob("comments-*"))
+
+
+def test_new_export_removes_stale_chunks_of_any_format(tmp_path):
+    """Chunks left by an earlier export are removed, whatever their format."""
+    with XmlExportWriter(tmp_path, max_rows=5) as writer:
+        writer.write_many(synthetic_comments(12))
+    with CsvExportWriter(tmp_path) as writer:
+        writer.write_many(synthetic_comments(3))
+    assert sorted(p.name for p in tmp_path.glob("comments-*")) == ["comments-00001.csv"]
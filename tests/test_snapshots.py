@@ -0,0 +1,53 @@
+"""Tests for snapshots.py append-only snapshot store."""
+
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from scripts.snapshots import SnapshotStore, load_matrix_rows
+
+
+def _row(indicator, template):
+    return {"frame_id": "frame.a", "indicator_id": indicator, "template_id": template, "ref_ids": ["ref.x"]}
+
+
+def test_unchanged_rows_are_stored_once(tmp_path):
+    """Recording identical content reuses the snapshot and writes no new segment."""
+    store = SnapshotStore(tmp_path)
+    rows = [_row("ind.a1", "t1"), _row("ind.a2", "t2")]
+    first = store.record(rows, {"frame.a": {"covered": 2, "total": 2}}, "v1")
+    second = store.record(rows, {"frame.a": {"covered": 2, "total": 2}}, "v2")
+    assert first == second
+    assert len(list((tmp_path / "segments").glob("*.parquet"))) == 1
+
+    store.record(rows[:1] + [_row("ind.a2", "t3")], {"frame.a": {"covered": 2, "total": 2}}, "v3")
+    segments = sorted((tmp_path / "segments").glob("*.parquet"))
+    assert len(segments) == 2
+    assert [e["label"] for e in store.entries()] == ["v1", "v2", "v3"]
+
+
+def test_trend_queries(tmp_path):
+    """Coverage trend, template changes and row reads span recorded snapshots."""
+    store = SnapshotStore(tmp_path)
+    store.record([_row("ind.a1", "t1")], {"frame.a": {"covered": 1, "total": 2}}, "v1")
+    store.record([_row("ind.a1", "t2"), _row("ind.a2", "t3")], {"frame.a": {"covered": 2, "total": 2}}, "v2")
+
+    trend = store.coverage_trend()
+    assert trend["pct"].tolist() == [50.0, 100.0]
+
+    changes = store.template_changes()
+    assert set(map(tuple, changes[["indicator_id", "template_id", "change"]].values.tolist())) == {
+        ("ind.a1", "t2", "added"),
+        ("ind.a1", "t1", "removed"),
+        ("ind.a2", "t3", "added"),
+    }
+    assert store.rows(store.entries()[1]["snapshot"], ["template_id"])["template_id"].tolist() == ["t2", "t3"]
+
+
+def test_matrix_rows_drop_volatile_columns():
+    """Matrix rows are recorded without the generated date and with decoded ref lists."""
+    rows = load_matrix_rows()
+    assert rows and "generated" not in rows[0]
+    assert isinstance(rows[0]["ref_ids"], list)
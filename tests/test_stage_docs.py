@@ -0,0 +1,66 @@
+"""Tests for stage_docs.py incremental sync."""
+
+import os
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from scripts.stage_docs import stage
+
+
+def _tree(tmp_path):
+    root = tmp_path / "repo"
+    (root / "docs").mkdir(parents=True)
+    (root / "docs" / "a.md").write_text("# A\n")
+    (root / "docs" / "old").mkdir()
+    (root / "docs" / "old" / "b.md").write_text("# B\n")
+    (root / "index.md").write_text("# Home\n")
+    return root, tmp_path / "site_docs", tmp_path / "manifest.json"
+
+
+def test_second_run_copies_nothing(tmp_path):
+    """A second staging run with no source changes copies nothing."""
+    root, dest, manifest = _tree(tmp_path)
+    first = stage(root, dest, manifest)
+    assert sorted(first.copied) == ["docs/a.md", "docs/old/b.md", "index.md"]
+    second = stage(root, dest, manifest)
+    assert second.copied == [] and second.unchanged == 3
+
+
+def test_changes_deletions_and_touches(tmp_path):
+    """Edited files are copied, deleted ones removed, and touched-but-identical files skipped."""
+    root, dest, manifest = _tree(tmp_path)
+    stage(root, dest, manifest)
+
+    (root / "docs" / "a.md").write_text("# A, edited\n")
+    (root / "docs" / "old" / "b.md").unlink()
+    os.utime(root / "index.md", (2_000_000_000, 2_000_000_000))
+    result = stage(root, dest, manifest)
+
+    assert result.copied == ["docs/a.md"]
+    assert result.removed == ["docs/old/b.md"]
+    assert result.unchanged == 1
+    assert (dest / "docs" / "a.md").read_text() == "# A, edited\n"
+    assert not (dest / "docs" / "old").exists()
+
+
+def test_hardlink_mode_shares_inodes(tmp_path):
+    """Hardlink mode stages files as links to their sources."""
+    root, dest, manifest = _tree(tmp_path)
+    stage(root, dest, manifest, link="hardlink")
+    assert (dest / "index.md").stat().st_ino == (root / "index.md").stat().st_ino
+
+
+def test_built_search_index_is_staged_as_an_asset(tmp_path):
+    """The exported search index is staged under assets/ and removed when it is gone."""
+    root, dest, manifest = _tree(tmp_path)
+    (root / "build").mkdir()
+    (root / "build" / "search_index.json").write_text('{"docs": []}')
+    assert "assets/search_index.json" in stage(root, dest, manifest).copied
+    assert (dest / "assets" / "search_index.json").read_text() == '{"docs": []}'
+    assert stage(root, dest, manifest).copied == []
+
+    (root / "build" / "search_index.json").unlink()
+    assert stage(root, dest, manifest).removed == ["assets/search_index.json"]
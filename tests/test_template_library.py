@@ -0,0 +1,64 @@
+"""Tests for template_library.py sharded loading."""
+
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from scripts.template_library import load_library
+
+
+def _template(tid: str, frame: str = "belonging") -> str:
+    return f"""  - id: template.comment.{tid}
+    type: comment_template
+    frame: frame.{frame}
+    section: key_learning
+    tone: parent_friendly
+    slots: [child]
+    text: "{{child}} is learning."
+    indicators: [indicator.{frame}.relationships]
+    refs: [ref.ontario.kindergarten.program.2016]
+    status: draft
+    version: 0.1.0
+"""
+
+
+def _write(path: Path, *templates: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text("templates:\n" + "".join(templates))
+
+
+def test_single_file_without_manifest(tmp_path):
+    """Without a manifest, comment_templates.yaml is the whole library."""
+    _write(tmp_path / "templates" / "comment_templates.yaml", _template("a.01"), _template("a.02"))
+    library = load_library(tmp_path, cache_dir=None)
+    assert list(library.templates) == ["template.comment.a.01", "template.comment.a.02"]
+    assert library.errors == []
+
+
+def test_manifest_shards_duplicates_and_cache(tmp_path):
+    """Manifest shards merge with duplicate and schema errors reported, and only edited shards are parsed again."""
+    templates = tmp_path / "templates"
+    _write(templates / "comment_templates.yaml", _template("a.01"))
+    _write(templates / "boards" / "b1.yaml", _template("b.01"), _template("a.01"))
+    _write(templates / "boards" / "b2.yaml", _template("b.02", frame="Bad"))
+    (templates / "manifest.yaml").write_text("shards:\n  - comment_templates.yaml\n  - boards/**/*.yaml\n")
+    cache = tmp_path / "cache"
+
+    library = load_library(tmp_path, cache_dir=cache, jobs=1)
+    assert library.sources == {
+        "template.comment.a.01": "templates/comment_templates.yaml",
+        "template.comment.b.01": "templates/boards/b1.yaml",
+        "template.comment.b.02": "templates/boards/b2.yaml",
+    }
+    assert library.duplicates == {
+        "template.comment.a.01": ["templates/comment_templates.yaml", "templates/boards/b1.yaml"]
+    }
+    assert [e for e in library.errors if e.startswith("templates/boards/b2.yaml")]
+
+    # Only the edited shard is parsed again
+    _write(templates / "boards" / "b1.yaml", _template("b.01"))
+    library = load_library(tmp_path, cache_dir=cache, jobs=1)
+    assert [s.cached for s in library.shards] == [True, False, True]
+    assert library.duplicates == {}
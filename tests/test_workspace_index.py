@@ -0,0 +1,68 @@
+"""Tests for workspace_index.py and the link checks built on it."""
+
+import os
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from scripts.validate import check_anchor_fragments, check_markdown_links
+from scripts.workspace_index import WorkspaceIndex
+
+
+def _tree(tmp_path):
+    (tmp_path / "docs" / "sub").mkdir(parents=True)
+    (tmp_path / "docs" / "Guide.md").write_text("# Getting Started\n")
+    (tmp_path / "docs" / "sub" / "page.md").write_text(
+        "[ok](../Guide.md#getting-started) [dir](../sub/) [case](../guide.md) "
+        "[gone](missing.md) [out](../../../x.md) [bad](../Guide.md#nope) [self](#top)\n# Top\n"
+    )
+    (tmp_path / "__pycache__").mkdir()
+    (tmp_path / "__pycache__" / "x.pyc").write_text("")
+    return WorkspaceIndex.scan(tmp_path)
+
+
+def test_scan_normalizes_paths_and_skips_caches(tmp_path):
+    """A scan records normalized relative paths and skips cache folders."""
+    index = _tree(tmp_path)
+    assert index.files == {"docs/Guide.md", "docs/sub/page.md"}
+    assert index.dirs == {"docs", "docs/sub"}
+
+
+def test_resolve_link_is_lexical(tmp_path, monkeypatch):
+    """Links resolve against the index without filesystem calls, with case-mismatch hints."""
+    index = _tree(tmp_path)
+
+    def no_syscalls(*_args, **_kwargs):
+        raise AssertionError("filesystem call during resolution")
+
+    monkeypatch.setattr(os, "stat", no_syscalls)
+    monkeypatch.setattr(os, "scandir", no_syscalls)
+
+    assert index.resolve_link("docs/sub/page.md", "../Guide.md#x").exists
+    assert index.resolve_link("docs/sub/page.md", "./%2E%2E/sub/").path == "docs/sub"
+    assert index.resolve_link("docs/sub/page.md", "../../../x.md").path is None
+    assert index.resolve_link("docs/sub/page.md", "/etc/passwd").path is None
+    case = index.resolve_link("docs/sub/page.md", "../guide.md")
+    assert not case.exists and case.case_match == "docs/Guide.md"
+
+
+def test_link_checks_use_index(tmp_path):
+    """Link and anchor checks report broken, miscased and out-of-workspace targets from the index."""
+    index = _tree(tmp_path)
+    page = tmp_path / "docs" / "sub" / "page.md"
+    errors = check_markdown_links(page, index)
+    assert errors == [
+        "Broken link in docs/sub/page.md: (../guide.md) (case mismatch, did you mean docs/Guide.md?)",
+        "Broken link in docs/sub/page.md: (missing.md)",
+        "Invalid link target outside workspace: (../../../x.md)",
+    ]
+    assert check_anchor_fragments([(page, {})], index) == ["docs/sub/page.md: anchor #nope not found in Guide.md"]
+
+
+def test_with_stat_captures_stats(tmp_path):
+    """A scan with with_stat keeps a stat result for every file."""
+    index = WorkspaceIndex.scan(_tree(tmp_path).root, include=["docs"], with_stat=True)
+    assert set(index.stats) == index.files
+    assert list(index.iter_files(["docs"])) == ["docs/Guide.md", "docs/sub/page.md"]
@@ -0,0 +1,78 @@
+"""Tests for yaml_backend.py backend conformance and parse cache."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from scripts import yaml_backend
+from scripts.yaml_backend import available_backends, load, load_file, normalize_yaml_scalars
+
+BACKENDS = list(available_backends())
+
+# Scalars where YAML 1.1 (PyYAML's default) and YAML 1.2 (ruamel) disagree, plus common ones
+EDGE_CASES = """
+words: [yes, No, on, OFF, y, n]
+bools: [true, False, TRUE]
+nulls: [~, null, ""]
+ints: [017, 08, 0o17, 0x1F, 0b101, 1_000, -017, +12, -0x1F]
+floats: [1.5, 1e3, 1E3, .inf, -.inf, 1_0.5, 0., -.5]
+sexagesimal: 1:20
+dates: [2026-01-05, 2026-1-5, 2026-01-05 10:00:00, 2026-01-05T23:30:00-05:00]
+base: &base {x: 1, y: 2}
+merged:
+  <<: *base
+  y: 3
+text: |
+  line one
+  line two
+"""
+
+
+def _repo_yaml() -> list[Path]:
+    return sorted((PROJECT_ROOT / "taxonomy").glob("*.yaml")) + sorted((PROJECT_ROOT / "templates").glob("*.yaml"))
+
+
+@pytest.mark.parametrize("name", BACKENDS)
+def test_backends_match_the_pure_ruamel_reference(name):
+    """Every backend loads YAML 1.2 edge cases and the repo files exactly like pure ruamel."""
+    expected = normalize_yaml_scalars(load(EDGE_CASES, "ruamel"))
+    assert normalize_yaml_scalars(load(EDGE_CASES, name)) == expected
+    assert expected["words"] == ["yes", "No", "on", "OFF", "y", "n"]
+    assert expected["ints"][:3] == [17, 8, 15] and expected["sexagesimal"] == "1:20"
+    assert expected["merged"] == {"x": 1, "y": 3}
+    for path in _repo_yaml():
+        text = path.read_text(encoding="utf-8")
+        assert load(text, name) == load(text, "ruamel"), path
+
+
+@pytest.mark.parametrize("name", BACKENDS)
+def test_duplicate_keys_are_rejected(name):
+    """Every backend rejects duplicate mapping keys."""
+    with pytest.raises(Exception, match="duplicate key"):
+        load("a: 1\nb: 2\na: 3\n", name)
+
+
+def test_unknown_backend_is_an_error(monkeypatch):
+    """An unknown backend named in the environment is an error."""
+    monkeypatch.setenv(yaml_backend.ENV_VAR, "nope")
+    with pytest.raises(ValueError, match="unknown"):
+        load("a: 1\n")
+
+
+def test_large_files_are_cached(tmp_path, monkeypatch):
+    """Large files are served from the parse cache until their content changes."""
+    monkeypatch.setattr(yaml_backend, "CACHE_MIN_BYTES", 10)
+    path = tmp_path / "t.yaml"
+    path.write_text("templates:\n  - id: template.a\n    updated: 2026-01-05\n")
+    cache = tmp_path / "cache"
+    assert load_file(path, cache_dir=cache) == {"templates": [{"id": "template.a", "updated": "2026-01-05"}]}
+    [entry] = cache.iterdir()
+    entry.write_bytes(entry.read_bytes().replace(b"template.a", b"template.b"))
+    # A hit is served from the cache without parsing
+    assert load_file(path, cache_dir=cache)["templates"][0]["id"] == "template.b"
+    path.write_text("templates: []\n")
+    assert load_file(path, cache_dir=cache) == {"templates": []}